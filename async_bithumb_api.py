@@ -0,0 +1,299 @@
+"""
+빗썸 API asyncio 클라이언트
+BithumbAPI와 같은 메서드를 코루틴으로 제공하고,
+여러 코인의 시세/호가/잔고를 한 번에 동시 조회합니다.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from bithumb_signer import BithumbSigner
+from rate_limiter import PriorityRateLimiter
+
+
+class AsyncBithumbAPI:
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_key: str, secret_key: str, pool_size: int = 20,
+                 timeout: float = 10.0, max_retries: int = 3, backoff_factor: float = 0.3,
+                 rate_limiter: Optional[PriorityRateLimiter] = None,
+                 base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.base_url = (base_url or "https://api.bithumb.com").rstrip('/')
+        self.signer = BithumbSigner(secret_key)
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """keep-alive 세션 (이벤트 루프 안에서 지연 생성)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """세션 종료"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _public_get(self, path: str) -> Dict:
+        """공개 API GET 요청 (연결 오류/일시적 오류 재시도)"""
+        session = await self._get_session()
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(path)
+
+            try:
+                async with session.get(url) as response:
+                    if response.status in self.RETRY_STATUS and attempt < self.max_retries:
+                        await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                        continue
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def _private_post(self, endpoint: str, params: Dict) -> Dict:
+        """인증 API POST 요청 (주문 중복 방지를 위해 연결 실패만 재시도)"""
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+
+            signature, nonce = self.signer.sign(endpoint, params)
+
+            headers = {
+                "Accept": "application/json",
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Api-Key": self.api_key,
+                "Api-Sign": signature,
+                "Api-Nonce": nonce
+            }
+
+            try:
+                async with session.post(url, headers=headers, data=params) as response:
+                    return await response.json(content_type=None)
+            except aiohttp.ClientConnectorError:
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get_ticker(self, coin: str = "BTC", currency: str = "KRW") -> Optional[Dict]:
+        """현재가 정보 조회"""
+        try:
+            data = await self._public_get(f"/public/ticker/{coin}_{currency}")
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"Ticker 조회 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"Ticker 조회 오류: {str(e)}")
+            return None
+
+    async def get_orderbook(self, coin: str = "BTC", currency: str = "KRW") -> Optional[Dict]:
+        """호가 정보 조회"""
+        try:
+            data = await self._public_get(f"/public/orderbook/{coin}_{currency}")
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"Orderbook 조회 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"Orderbook 조회 오류: {str(e)}")
+            return None
+
+    async def get_balance(self, currency: str = "BTC") -> Optional[Dict]:
+        """잔고 조회"""
+        try:
+            endpoint = "/info/balance"
+            params = {
+                "order_currency": currency,
+                "payment_currency": "KRW"
+            }
+
+            data = await self._private_post(endpoint, params)
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"잔고 조회 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"잔고 조회 오류: {str(e)}")
+            return None
+
+    async def place_order(self, order_type: str, coin: str, amount: float, price: Optional[float] = None) -> Optional[Dict]:
+        """
+        주문 실행
+        order_type: 'bid' (매수) or 'ask' (매도)
+        coin: 코인 심볼 (예: 'BTC')
+        amount: 주문 수량
+        price: 주문 가격 (None이면 시장가)
+        """
+        try:
+            endpoint = "/trade/place"
+
+            params = {
+                "order_currency": coin,
+                "payment_currency": "KRW",
+                "units": str(amount),
+                "type": order_type
+            }
+
+            if price is not None:
+                params["price"] = str(price)
+
+            data = await self._private_post(endpoint, params)
+
+            if data['status'] == '0000':
+                print(f"주문 성공: {order_type} {amount} {coin}")
+                return data
+            else:
+                print(f"주문 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"주문 오류: {str(e)}")
+            return None
+
+    async def market_buy(self, coin: str, krw_amount: float) -> Optional[Dict]:
+        """시장가 매수 (KRW 금액 기준)"""
+        try:
+            endpoint = "/trade/market_buy"
+
+            params = {
+                "order_currency": coin,
+                "payment_currency": "KRW",
+                "units": str(krw_amount)
+            }
+
+            data = await self._private_post(endpoint, params)
+
+            if data['status'] == '0000':
+                print(f"시장가 매수 성공: {krw_amount} KRW -> {coin}")
+                return data
+            else:
+                print(f"시장가 매수 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"시장가 매수 오류: {str(e)}")
+            return None
+
+    async def market_sell(self, coin: str, amount: float) -> Optional[Dict]:
+        """시장가 매도 (코인 수량 기준)"""
+        try:
+            endpoint = "/trade/market_sell"
+
+            params = {
+                "order_currency": coin,
+                "payment_currency": "KRW",
+                "units": str(amount)
+            }
+
+            data = await self._private_post(endpoint, params)
+
+            if data['status'] == '0000':
+                print(f"시장가 매도 성공: {amount} {coin}")
+                return data
+            else:
+                print(f"시장가 매도 실패: {data['message']}")
+                return None
+        except Exception as e:
+            print(f"시장가 매도 오류: {str(e)}")
+            return None
+
+    async def gather_tickers(self, coins: List[str], currency: str = "KRW") -> Dict[str, Optional[Dict]]:
+        """여러 코인 현재가 동시 조회"""
+        results = await asyncio.gather(*(self.get_ticker(coin, currency) for coin in coins))
+        return dict(zip(coins, results))
+
+    async def gather_orderbooks(self, coins: List[str], currency: str = "KRW") -> Dict[str, Optional[Dict]]:
+        """여러 코인 호가 동시 조회"""
+        results = await asyncio.gather(*(self.get_orderbook(coin, currency) for coin in coins))
+        return dict(zip(coins, results))
+
+    async def gather_market_data(self, coins: List[str], currency: str = "KRW",
+                                 include_orderbook: bool = True,
+                                 include_balance: bool = True) -> Dict[str, Dict]:
+        """
+        여러 코인의 시세/호가/잔고를 한 번에 동시 조회
+
+        Returns:
+            {
+                "BTC": {"ticker": {...}, "orderbook": {...}, "balance": {...}},
+                ...
+            }
+            조회에 실패한 항목은 None
+        """
+        kinds = ['ticker']
+        if include_orderbook:
+            kinds.append('orderbook')
+        if include_balance:
+            kinds.append('balance')
+
+        tasks = []
+        for coin in coins:
+            tasks.append(self.get_ticker(coin, currency))
+            if include_orderbook:
+                tasks.append(self.get_orderbook(coin, currency))
+            if include_balance:
+                tasks.append(self.get_balance(coin))
+
+        results = await asyncio.gather(*tasks)
+
+        market_data = {}
+        step = len(kinds)
+        for i, coin in enumerate(coins):
+            chunk = results[i * step:(i + 1) * step]
+            market_data[coin] = dict(zip(kinds, chunk))
+
+        return market_data
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+
+    async def main():
+        coins = ['BTC', 'ETH', 'XRP', 'DOGE', 'SOL']
+
+        async with AsyncBithumbAPI('', '') as api:
+            start = time.perf_counter()
+            market_data = await api.gather_market_data(coins, include_balance=False)
+            elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"{len(coins)}개 코인 시세+호가 동시 조회: {elapsed:.0f}ms")
+        for coin, data in market_data.items():
+            ticker = data['ticker']
+            if ticker:
+                print(f"  {coin}: {float(ticker['closing_price']):,} KRW")
+
+    asyncio.run(main())
@@ -0,0 +1,333 @@
+"""
+틱 -> 봉 리샘플러
+시세 폴링(ALL_KRW 스냅샷) 또는 WebSocket 체결을 받아
+전체 코인의 1초/1분/5분봉을 동시에 만듭니다.
+봉은 타임프레임별로 미리 할당한 (봉 x 코인) 링버퍼에 쌓이며, 틱마다 배열을 새로 만들지 않습니다.
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from market_snapshot import TickerSnapshot
+
+
+def timeframe_label(seconds: int) -> str:
+    """타임프레임 이름 (1 -> '1s', 60 -> '1m', 300 -> '5m')"""
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60}m"
+    return f"{seconds}s"
+
+
+class _Timeframe:
+    """타임프레임 1개의 (봉 x 코인) 링버퍼"""
+
+    def __init__(self, seconds: int, horizon: int, width: int):
+        self.seconds = seconds
+        self.horizon = horizon
+        self.label = timeframe_label(seconds)
+
+        self.start = np.zeros(horizon, dtype=np.int64)   # 봉 시작 시각 (초)
+        self.open = np.full((horizon, width), np.nan)
+        self.high = np.full((horizon, width), np.nan)
+        self.low = np.full((horizon, width), np.nan)
+        self.close = np.full((horizon, width), np.nan)
+        self.volume = np.zeros((horizon, width))
+
+        self.head = -1        # 현재 봉 행
+        self.bucket = None    # 현재 봉 번호 (시각 // seconds)
+        self.filled = 0
+
+    def grow(self, width: int):
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            array = getattr(self, name)
+            grown = np.full((self.horizon, width), 0.0 if name == 'volume' else np.nan)
+            grown[:, :array.shape[1]] = array
+            setattr(self, name, grown)
+
+    def advance(self, ts: float) -> Optional[int]:
+        """ts가 속한 봉 행 (새 봉이면 비운 뒤 반환, 지난 봉이면 None)"""
+        bucket = int(ts // self.seconds)
+        if self.bucket is not None and bucket <= self.bucket:
+            return self.head if bucket == self.bucket else None
+
+        # 건너뛴 봉까지 포함해 최대 horizon개 행을 비움 (행 단위 제자리 대입)
+        steps = 1 if self.bucket is None else min(bucket - self.bucket, self.horizon)
+        for k in range(steps, 0, -1):
+            self.head = (self.head + 1) % self.horizon
+            self.start[self.head] = (bucket - k + 1) * self.seconds
+            self.open[self.head] = np.nan
+            self.high[self.head] = np.nan
+            self.low[self.head] = np.nan
+            self.close[self.head] = np.nan
+            self.volume[self.head] = 0.0
+
+        self.bucket = bucket
+        self.filled = min(self.filled + steps, self.horizon)
+        return self.head
+
+
+class BarResampler:
+    """
+    여러 타임프레임 봉 생성기
+
+    스냅샷 틱과 체결 틱을 같은 인스턴스에 함께 넣으면 거래량이 중복 집계되므로 한 가지만 사용합니다.
+    스레드 안전 (예: WebSocket 스레드에서 on_trade, 메인 스레드에서 bars/returns) - 열이 늘어날 때
+    배열을 바꿔 끼우므로 입력과 조회를 같은 잠금으로 묶습니다.
+
+    Args:
+        timeframes: {봉 길이(초): 보관할 봉 수}
+        initial_coins: 처음 할당할 코인 열 수 (부족하면 2배씩 늘림)
+    """
+
+    def __init__(self, timeframes: Optional[Dict[int, int]] = None, initial_coins: int = 512):
+        if timeframes is None:
+            timeframes = {1: 300, 60: 120, 300: 48}   # 1초봉 5분, 1분봉 2시간, 5분봉 4시간
+
+        self.timeframes = {seconds: _Timeframe(seconds, horizon, initial_coins)
+                           for seconds, horizon in sorted(timeframes.items())}
+        self.width = initial_coins
+
+        self._columns: Dict[str, int] = {}
+        self._last_volume_24h = np.full(initial_coins, np.nan)
+
+        self._snapshot_coins = None   # 마지막으로 매핑한 스냅샷 코인 순서
+        self._snapshot_columns = None
+        self._snapshot_slice = None   # 열 번호가 0..n-1이면 slice (복사 없는 뷰로 갱신)
+        self._tick_volume = np.zeros(initial_coins)
+
+        self.ticks = 0
+        self.trades = 0
+        self._lock = threading.RLock()
+
+    # ===== 코인 열 매핑 =====
+
+    def _column(self, coin: str) -> int:
+        column = self._columns.get(coin)
+        if column is None:
+            column = len(self._columns)
+            self._columns[coin] = column
+            if column >= self.width:
+                self._grow(self.width * 2)
+        return column
+
+    def _grow(self, width: int):
+        for timeframe in self.timeframes.values():
+            timeframe.grow(width)
+        grown = np.full(width, np.nan)
+        grown[:self.width] = self._last_volume_24h
+        self._last_volume_24h = grown
+        self._tick_volume = np.zeros(width)
+        self.width = width
+
+    def _columns_for(self, coins: Sequence[str]):
+        if coins is self._snapshot_coins:
+            return self._snapshot_columns, self._snapshot_slice
+
+        columns = np.array([self._column(coin) for coin in coins], dtype=np.intp)
+        contiguous = len(columns) > 0 and columns[0] == 0 and bool((np.diff(columns) == 1).all())
+
+        self._snapshot_coins = coins
+        self._snapshot_columns = columns
+        self._snapshot_slice = slice(0, len(columns)) if contiguous else None
+        return columns, self._snapshot_slice
+
+    # ===== 틱 입력 =====
+
+    def update_snapshot(self, snapshot: TickerSnapshot, ts: Optional[float] = None):
+        """
+        ALL_KRW 스냅샷 1개 반영 (전체 코인 1틱)
+
+        틱 거래량 = 24시간 누적 거래량의 직전 스냅샷 대비 증가분 (줄어들면 0)
+        """
+        if ts is None:
+            ts = snapshot.timestamp / 1000 if snapshot.timestamp else None
+        if ts is None:
+            return
+
+        with self._lock:
+            self._apply_snapshot(snapshot, ts)
+
+    def _apply_snapshot(self, snapshot: TickerSnapshot, ts: float):
+        columns, view = self._columns_for(snapshot.coin_list)
+        n = len(columns)
+        key = view if view is not None else columns
+
+        # 틱 거래량 (미리 할당한 버퍼에 계산)
+        volume = self._tick_volume[:n]
+        np.subtract(snapshot.volume, self._last_volume_24h[key], out=volume)
+        np.nan_to_num(volume, copy=False, nan=0.0)
+        np.maximum(volume, 0, out=volume)
+        self._last_volume_24h[key] = snapshot.volume
+
+        price = snapshot.price
+        for timeframe in self.timeframes.values():
+            row = timeframe.advance(ts)
+            if row is None:
+                continue
+
+            if view is not None:
+                # 현재 봉 행의 뷰에 제자리 갱신
+                o, h, l, c, v = (timeframe.open[row, view], timeframe.high[row, view], timeframe.low[row, view],
+                                 timeframe.close[row, view], timeframe.volume[row, view])
+                np.copyto(o, price, where=np.isnan(o))
+                np.fmax(h, price, out=h)
+                np.fmin(l, price, out=l)
+                np.copyto(c, price, where=~np.isnan(price))
+                np.add(v, volume, out=v)
+            else:
+                o = timeframe.open[row, columns]
+                timeframe.open[row, columns] = np.where(np.isnan(o), price, o)
+                timeframe.high[row, columns] = np.fmax(timeframe.high[row, columns], price)
+                timeframe.low[row, columns] = np.fmin(timeframe.low[row, columns], price)
+                timeframe.close[row, columns] = np.where(np.isnan(price), timeframe.close[row, columns], price)
+                timeframe.volume[row, columns] += volume
+
+        self.ticks += 1
+
+    def on_trade(self, coin: str, price: float, quantity: float, ts: float):
+        """체결 1건 반영 (스칼라 대입만 사용)"""
+        with self._lock:
+            column = self._column(coin)
+            for timeframe in self.timeframes.values():
+                row = timeframe.advance(ts)
+                if row is None:
+                    continue
+
+                if timeframe.open[row, column] != timeframe.open[row, column]:  # NaN
+                    timeframe.open[row, column] = price
+                    timeframe.high[row, column] = price
+                    timeframe.low[row, column] = price
+                else:
+                    if price > timeframe.high[row, column]:
+                        timeframe.high[row, column] = price
+                    if price < timeframe.low[row, column]:
+                        timeframe.low[row, column] = price
+                timeframe.close[row, column] = price
+                timeframe.volume[row, column] += quantity
+
+            self.trades += 1
+
+    # ===== 조회 =====
+
+    def bars(self, coins: Sequence[str], seconds: int = 60, n: int = 30,
+             include_current: bool = True) -> Dict[str, np.ndarray]:
+        """
+        최근 n개 봉 (과거 -> 최근 순)
+
+        Args:
+            coins: 조회할 코인
+            seconds: 타임프레임 (초)
+            include_current: False이면 진행 중인 봉 제외
+
+        Returns:
+            {'coins', 'start': (n,) 봉 시작 시각(초), 'open'/'high'/'low'/'close'/'volume': (C, n)}
+            체결이 없던 봉은 OHLC NaN, 거래량 0
+        """
+        timeframe = self.timeframes[seconds]
+        with self._lock:
+            columns = np.array([self._columns.get(coin, -1) for coin in coins], dtype=np.intp)
+            known = columns >= 0
+
+            available = timeframe.filled - (0 if include_current else 1)
+            n_rows = max(min(n, available), 0)
+            last = timeframe.head if include_current else timeframe.head - 1
+            rows = (last - np.arange(n_rows)[::-1]) % timeframe.horizon
+
+            # 팬시 인덱싱이라 결과는 복사본 (잠금 밖에서 써도 안전)
+            result = {'coins': list(coins), 'start': timeframe.start[rows]}
+            for name in ('open', 'high', 'low', 'close', 'volume'):
+                values = getattr(timeframe, name)[np.ix_(rows, np.where(known, columns, 0))].T
+                values[~known] = 0.0 if name == 'volume' else np.nan
+                result[name] = values
+        return result
+
+    def returns(self, coins: Sequence[str], seconds: int = 60, bars: int = 1) -> np.ndarray:
+        """
+        최근 bars개 완성봉 동안의 수익률 (%) - 진행 중인 봉의 현재 종가 기준
+
+        체결이 없던 봉은 직전 종가로 간주
+        """
+        data = self.bars(coins, seconds, n=bars + 1)
+        close = _ffill(data['close'])
+        if close.shape[1] < bars + 1:
+            return np.full(len(coins), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (close[:, -1] / close[:, 0] - 1) * 100
+
+    def summary(self, coins: Sequence[str]) -> List[Dict[str, Optional[float]]]:
+        """
+        코인별 타임프레임 요약 (후보 dict에 붙일 필드)
+
+        bar_return_<tf>: 직전 봉 종가 대비 현재가 변화율 (%)
+        bar_volume_<tf>: 직전 완성봉 거래량
+        """
+        fields = [dict() for _ in coins]
+        for seconds, timeframe in self.timeframes.items():
+            # 수익률과 거래량이 같은 시점의 봉을 보도록 함께 조회
+            with self._lock:
+                returns = self.returns(coins, seconds, bars=1)
+                volume = self.bars(coins, seconds, n=1, include_current=False)['volume']
+            for i in range(len(coins)):
+                value = returns[i]
+                fields[i][f"bar_return_{timeframe.label}"] = None if np.isnan(value) else float(value)
+                fields[i][f"bar_volume_{timeframe.label}"] = float(volume[i, 0]) if volume.shape[1] else None
+        return fields
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(tf.open.nbytes * 5 + tf.start.nbytes for tf in self.timeframes.values())
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """행마다 NaN을 왼쪽 값으로 채움"""
+    mask = np.isnan(values)
+    if not mask.any():
+        return values
+    index = np.where(~mask, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return values[np.arange(values.shape[0])[:, None], index]
+
+
+# 벤치마크
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    rng = np.random.default_rng(0)
+    coins = [f"C{i}" for i in range(400)]
+    price = rng.uniform(10, 1000, len(coins))
+    volume = rng.uniform(1e5, 1e7, len(coins))
+
+    resampler = BarResampler()
+    start_ts = 1_700_000_000.0
+    snapshots = []
+    for step in range(600):
+        price = price * np.exp(rng.normal(0, 0.001, len(coins)))
+        volume = volume + rng.uniform(0, 100, len(coins))
+        snapshots.append(TickerSnapshot(coins, price.copy(), volume.copy(), price * volume,
+                                        np.zeros(len(coins)), timestamp=int((start_ts + step * 0.5) * 1000)))
+
+    resampler.update_snapshot(snapshots[0])
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for snapshot in snapshots[1:]:
+        resampler.update_snapshot(snapshot)
+    elapsed = (time.perf_counter() - t0) / (len(snapshots) - 1) * 1e6
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"스냅샷 틱 (코인 {len(coins)}개 x 타임프레임 3개): {elapsed:.0f}µs/틱, 추가 메모리 최대 {peak / 1024:.1f}KB")
+
+    t0 = time.perf_counter()
+    ts = start_ts + 300
+    for i in range(20000):
+        resampler.on_trade(coins[i % 50], float(price[i % 50]), 1.0, ts + i * 0.01)
+    print(f"체결 틱: {(time.perf_counter() - t0) / 20000 * 1e6:.1f}µs/건")
+
+    bars = resampler.bars(['C0', 'C1'], 60, n=5)
+    print(f"1분봉 C0 종가: {bars['close'][0]}")
+    print(resampler.summary(['C0'])[0])
+    print(f"버퍼 메모리: {resampler.memory_bytes() / 1024 / 1024:.1f}MB")
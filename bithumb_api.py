@@ -1,55 +1,87 @@
-import requests
-import time
-import hmac
-import hashlib
-import urllib.parse
-import base64
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
+from http_session import PooledSession
+from bithumb_signer import BithumbSigner
+from rate_limiter import PriorityRateLimiter
+from market_data_cache import MarketDataCache
 
 
 class BithumbAPI:
-    def __init__(self, api_key: str, secret_key: str):
+    def __init__(self, api_key: str, secret_key: str, pool_size: int = 10,
+                 timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 max_retries: int = 3, rate_limiter: Optional[PriorityRateLimiter] = None,
+                 base_url: Optional[str] = None, cache: Optional[MarketDataCache] = None):
         self.api_key = api_key
         self.secret_key = secret_key
-        self.base_url = "https://api.bithumb.com"
+        # base_url을 지정하면 로컬 대역 서버(mock_bithumb_server.py) 등으로 연결
+        self.base_url = (base_url or "https://api.bithumb.com").rstrip('/')
+
+        # HMAC 키 상태를 미리 만들어 둔 서명기
+        self.signer = BithumbSigner(secret_key)
+
+        # 공개/인증 API가 공유하는 keep-alive 세션 풀
+        self.http = PooledSession(pool_size=pool_size, timeout=timeout, max_retries=max_retries)
+
+        # 요청 속도 제한 (여러 컴포넌트가 같은 인스턴스를 공유하면 한도를 함께 관리)
+        self.rate_limiter = rate_limiter
+
+        # 공개 시세 캐시 (TTL 안의 중복 조회/동시 조회를 요청 1회로 병합)
+        self.cache = cache
 
     def _usec_time(self):
-        """마이크로초 단위 타임스탬프 생성"""
-        mt = time.time()
-        mt_array = str(mt).split(".")
-        return mt_array[0] + mt_array[1][:3]
+        """밀리초 단위 nonce 생성 (항상 증가, 스레드 안전)"""
+        return self.signer.nonce.next()
 
     def _get_signature(self, endpoint: str, params: Dict) -> tuple:
         """API 요청 서명 생성"""
-        # endpoint를 params에 추가
-        endpoint_item_array = {"endpoint": endpoint}
-        uri_array = dict(endpoint_item_array, **params)
+        return self.signer.sign(endpoint, params)
+
+    def _public_get(self, path: str) -> Dict:
+        """공개 API GET 요청"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(path)
+
+        response = self.http.get(f"{self.base_url}{path}")
+        return response.json()
+
+    def _cached_get(self, path: str) -> Dict:
+        """공개 API GET 요청 (캐시가 있으면 성공 응답을 TTL 동안 재사용)"""
+        if self.cache is None:
+            return self._public_get(path)
 
-        params_str = urllib.parse.urlencode(uri_array)
-        nonce = self._usec_time()
+        return self.cache.get(path, lambda: self._public_get(path),
+                              should_cache=lambda data: data.get('status') == '0000')
 
-        # 서명 데이터 생성: endpoint + chr(0) + params + chr(0) + nonce
-        data = endpoint + chr(0) + params_str + chr(0) + nonce
-        utf8_data = data.encode('utf-8')
-        utf8_key = self.secret_key.encode('utf-8')
+    def _private_post(self, endpoint: str, params: Dict) -> Dict:
+        """인증 API POST 요청 (서명 헤더 포함)"""
+        # 대기 후에 서명해야 nonce 순서가 전송 순서와 일치
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(endpoint)
 
-        # HMAC-SHA512 해시 생성
-        h = hmac.new(bytes(utf8_key), utf8_data, hashlib.sha512)
-        hex_output = h.hexdigest()
-        utf8_hex_output = hex_output.encode('utf-8')
+        signature, nonce = self._get_signature(endpoint, params)
 
-        # Base64 인코딩 (중요!)
-        api_sign = base64.b64encode(utf8_hex_output)
-        signature = api_sign.decode('utf-8')
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Api-Key": self.api_key,
+            "Api-Sign": signature,
+            "Api-Nonce": nonce
+        }
 
-        return signature, nonce
+        response = self.http.post(f"{self.base_url}{endpoint}", headers=headers, data=params)
+        return response.json()
+
+    def get_connection_stats(self) -> Dict:
+        """연결 재사용 통계 조회 (핸드셰이크 발생 여부 확인용)"""
+        return self.http.get_connection_stats()
+
+    def close(self):
+        """세션 풀 종료"""
+        self.http.close()
 
     def get_ticker(self, coin: str = "BTC", currency: str = "KRW") -> Optional[Dict]:
         """현재가 정보 조회"""
         try:
-            url = f"{self.base_url}/public/ticker/{coin}_{currency}"
-            response = requests.get(url)
-            data = response.json()
+            data = self._cached_get(f"/public/ticker/{coin}_{currency}")
 
             if data['status'] == '0000':
                 return data['data']
@@ -60,12 +92,24 @@ class BithumbAPI:
             print(f"Ticker 조회 오류: {str(e)}")
             return None
 
+    def get_all_tickers(self, currency: str = "KRW") -> Optional[Dict]:
+        """전체 코인 현재가 정보 조회"""
+        try:
+            data = self._cached_get(f"/public/ticker/ALL_{currency}")
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"전체 시세 조회 실패: {data.get('message', 'Unknown error')}")
+                return None
+        except Exception as e:
+            print(f"전체 시세 조회 오류: {str(e)}")
+            return None
+
     def get_orderbook(self, coin: str = "BTC", currency: str = "KRW") -> Optional[Dict]:
         """호가 정보 조회"""
         try:
-            url = f"{self.base_url}/public/orderbook/{coin}_{currency}"
-            response = requests.get(url)
-            data = response.json()
+            data = self._cached_get(f"/public/orderbook/{coin}_{currency}")
 
             if data['status'] == '0000':
                 return data['data']
@@ -76,6 +120,40 @@ class BithumbAPI:
             print(f"Orderbook 조회 오류: {str(e)}")
             return None
 
+    def get_all_orderbooks(self, currency: str = "KRW", count: int = 5) -> Optional[Dict]:
+        """전체 코인 호가 정보 조회 (요청 1회)"""
+        try:
+            data = self._cached_get(f"/public/orderbook/ALL_{currency}?count={count}")
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"전체 호가 조회 실패: {data.get('message', 'Unknown error')}")
+                return None
+        except Exception as e:
+            print(f"전체 호가 조회 오류: {str(e)}")
+            return None
+
+    def get_candlestick(self, coin: str = "BTC", interval: str = "1m", currency: str = "KRW") -> Optional[list]:
+        """
+        캔들 조회
+        interval: '1m', '3m', '5m', '10m', '30m', '1h', '6h', '12h', '24h'
+
+        Returns:
+            [[시각(ms), 시가, 종가, 고가, 저가, 거래량], ...] (과거 -> 최근)
+        """
+        try:
+            data = self._public_get(f"/public/candlestick/{coin}_{currency}/{interval}")
+
+            if data['status'] == '0000':
+                return data['data']
+            else:
+                print(f"캔들 조회 실패: {data.get('message', 'Unknown error')}")
+                return None
+        except Exception as e:
+            print(f"캔들 조회 오류: {str(e)}")
+            return None
+
     def get_balance(self, currency: str = "BTC") -> Optional[Dict]:
         """잔고 조회"""
         try:
@@ -85,19 +163,7 @@ class BithumbAPI:
                 "payment_currency": "KRW"
             }
 
-            signature, nonce = self._get_signature(endpoint, params)
-
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Api-Key": self.api_key,
-                "Api-Sign": signature,
-                "Api-Nonce": nonce
-            }
-
-            url = f"{self.base_url}{endpoint}"
-            response = requests.post(url, headers=headers, data=params)
-            data = response.json()
+            data = self._private_post(endpoint, params)
 
             if data['status'] == '0000':
                 return data['data']
@@ -129,19 +195,7 @@ class BithumbAPI:
             if price is not None:
                 params["price"] = str(price)
 
-            signature, nonce = self._get_signature(endpoint, params)
-
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Api-Key": self.api_key,
-                "Api-Sign": signature,
-                "Api-Nonce": nonce
-            }
-
-            url = f"{self.base_url}{endpoint}"
-            response = requests.post(url, headers=headers, data=params)
-            data = response.json()
+            data = self._private_post(endpoint, params)
 
             if data['status'] == '0000':
                 print(f"주문 성공: {order_type} {amount} {coin}")
@@ -164,19 +218,7 @@ class BithumbAPI:
                 "units": str(krw_amount)
             }
 
-            signature, nonce = self._get_signature(endpoint, params)
-
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Api-Key": self.api_key,
-                "Api-Sign": signature,
-                "Api-Nonce": nonce
-            }
-
-            url = f"{self.base_url}{endpoint}"
-            response = requests.post(url, headers=headers, data=params)
-            data = response.json()
+            data = self._private_post(endpoint, params)
 
             if data['status'] == '0000':
                 print(f"시장가 매수 성공: {krw_amount} KRW -> {coin}")
@@ -199,19 +241,7 @@ class BithumbAPI:
                 "units": str(amount)
             }
 
-            signature, nonce = self._get_signature(endpoint, params)
-
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Api-Key": self.api_key,
-                "Api-Sign": signature,
-                "Api-Nonce": nonce
-            }
-
-            url = f"{self.base_url}{endpoint}"
-            response = requests.post(url, headers=headers, data=params)
-            data = response.json()
+            data = self._private_post(endpoint, params)
 
             if data['status'] == '0000':
                 print(f"시장가 매도 성공: {amount} {coin}")
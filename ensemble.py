@@ -0,0 +1,201 @@
+"""
+GPT 앙상블 결합
+같은 후보를 여러 모델/프롬프트 형식(멤버)에 동시에 보내고, 공동 기한 안에 도착한 응답을 결합합니다.
+
+결합 방식:
+- first_valid: 가장 먼저 도착한 올바른 응답 (지연 시간 최소)
+- quorum: 같은 코인을 고른 멤버가 정족수에 이르면 결정 (기본 과반)
+- weighted: 코인별 (가중치 x 확신도) 합이 가장 큰 코인 (남은 멤버가 결과를 바꿀 수 없으면 일찍 결정)
+"""
+
+import threading
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from latency_tracker import LatencyTracker
+
+STRATEGIES = ('first_valid', 'quorum', 'weighted')
+
+
+class EnsembleMember(NamedTuple):
+    name: str
+    model: str
+    prompt_style: str = 'compact'
+    weight: float = 1.0
+
+
+def parse_members(spec: str) -> List[EnsembleMember]:
+    """
+    'model[:style[:weight]],...' 형식의 멤버 목록 해석
+
+    예: 'gpt-4o-mini:compact,gpt-4o-mini:verbose,gpt-4.1-mini:compact:2'
+    """
+    members = []
+    for item in spec.split(','):
+        parts = [p.strip() for p in item.split(':')]
+        if not parts[0]:
+            continue
+        style = parts[1] if len(parts) > 1 and parts[1] else 'compact'
+        weight = float(parts[2]) if len(parts) > 2 and parts[2] else 1.0
+        members.append(EnsembleMember(f"{parts[0]}/{style}", parts[0], style, weight))
+
+    # 이름이 겹치면 순번을 붙임 (같은 설정을 여러 번 넣어 표본 수를 늘릴 때)
+    counts = Counter(m.name for m in members)
+    seen = Counter()
+    for i, m in enumerate(members):
+        if counts[m.name] > 1:
+            seen[m.name] += 1
+            members[i] = m._replace(name=f"{m.name}#{seen[m.name]}")
+    return members
+
+
+def _merge(coin: str, votes: List[Tuple[EnsembleMember, Dict]]) -> Dict:
+    """같은 코인을 고른 응답들을 1개 추천으로 (가중 평균 확신도, 가중 다수 진입 타이밍/리스크)"""
+    total = sum(m.weight for m, _ in votes)
+
+    def majority(key: str) -> str:
+        tally = Counter()
+        for m, r in votes:
+            tally[r[key]] += m.weight
+        return tally.most_common(1)[0][0]
+
+    # 이유는 가중치가 가장 큰 (같으면 먼저 도착한) 응답
+    lead = max(votes, key=lambda v: v[0].weight)[1]
+    return {
+        'selected_coin': coin,
+        'confidence': int(round(sum(m.weight * r['confidence'] for m, r in votes) / total)),
+        'reason': lead['reason'],
+        'entry_timing': majority('entry_timing'),
+        'risk_level': majority('risk_level')
+    }
+
+
+def combine(strategy: str, members: List[EnsembleMember], arrived: List[Tuple[EnsembleMember, Optional[Dict]]],
+            quorum: Optional[int] = None, final: bool = False) -> Optional[Dict]:
+    """
+    지금까지 도착한 응답으로 결정 (아직 결정할 수 없으면 None)
+
+    Args:
+        members: 전체 멤버 (아직 응답하지 않은 멤버 계산용)
+        arrived: 도착 순서대로 (멤버, 올바른 응답 또는 None)
+        quorum: quorum 방식의 정족수 (기본: 과반)
+        final: 모든 멤버가 응답했거나 기한이 지나 더 기다리지 않는 경우
+    """
+    valid = [(m, r) for m, r in arrived if r is not None]
+    if not valid:
+        return None
+
+    if strategy == 'first_valid':
+        return dict(valid[0][1])
+
+    by_coin: Dict[str, List[Tuple[EnsembleMember, Dict]]] = {}
+    for m, r in valid:
+        by_coin.setdefault(r['selected_coin'], []).append((m, r))
+
+    if strategy == 'quorum':
+        need = quorum or len(members) // 2 + 1
+        coin, votes = max(by_coin.items(), key=lambda item: len(item[1]))
+        return _merge(coin, votes) if len(votes) >= need else None
+
+    # weighted - 남은 멤버가 모두 2위 코인에 100점을 줘도 뒤집히지 않으면 결정
+    scores = {coin: sum(m.weight * r['confidence'] for m, r in votes) for coin, votes in by_coin.items()}
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    if not final:
+        answered = {m.name for m, _ in arrived}
+        remaining = sum(m.weight for m in members if m.name not in answered) * 100
+        runner_up = scores[ranked[1]] if len(ranked) > 1 else 0.0
+        if scores[ranked[0]] <= runner_up + remaining:
+            return None
+    return _merge(ranked[0], by_coin[ranked[0]])
+
+
+class EnsembleStats:
+    """
+    멤버별 지연 시간/응답 품질과 결정별 합의 정도 (스레드 안전)
+
+    멤버별: calls, valid, invalid (실패/형식 오류), late (결정 이후 도착),
+            agree (최종 결정과 같은 코인 - 결정 이후 도착한 응답도 포함)
+    결정별: decisions, unanimous (응답한 멤버가 모두 같은 코인), agreement (응답 중 최종 코인 비율 평균)
+    """
+
+    def __init__(self, window: int = 500):
+        self.latency = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self.members: Dict[str, Dict[str, int]] = {}
+        self.decisions = 0
+        self.unanimous = 0
+        self._agreement_sum = 0.0
+
+    def record_member(self, name: str, latency_ms: float, valid: bool, late: bool, agree: bool = False):
+        """멤버 응답 1개 (agree는 결정 이후 도착한 응답만 - 제때 온 응답은 record_decision에서)"""
+        self.latency.record(name, latency_ms)
+        with self._lock:
+            stats = self.members.setdefault(name, {'calls': 0, 'valid': 0, 'invalid': 0, 'late': 0, 'agree': 0})
+            stats['calls'] += 1
+            stats['valid' if valid else 'invalid'] += 1
+            if late:
+                stats['late'] += 1
+            if agree:
+                stats['agree'] += 1
+
+    def record_decision(self, result: Dict, arrived: List[Tuple[EnsembleMember, Optional[Dict]]]):
+        picks = [(m.name, r['selected_coin']) for m, r in arrived if r is not None]
+        if not picks:
+            return
+        agreeing = [name for name, coin in picks if coin == result['selected_coin']]
+        with self._lock:
+            self.decisions += 1
+            self._agreement_sum += len(agreeing) / len(picks)
+            if len(agreeing) == len(picks) and len(picks) > 1:
+                self.unanimous += 1
+            for name in agreeing:
+                self.members.setdefault(name, {'calls': 0, 'valid': 0, 'invalid': 0, 'late': 0, 'agree': 0})
+                self.members[name]['agree'] += 1
+
+    def summary(self) -> Dict:
+        latency = self.latency.summary()
+        with self._lock:
+            return {
+                'decisions': self.decisions,
+                'unanimous': self.unanimous,
+                'agreement': self._agreement_sum / self.decisions if self.decisions else 0.0,
+                'members': {name: dict(stats, **{k: latency[name][k] for k in ('p50_ms', 'p95_ms')}
+                                       if name in latency else {})
+                            for name, stats in self.members.items()}
+            }
+
+    def format(self) -> str:
+        """한 줄 요약 (예: '합의 83% 만장일치 4/6 | gpt-4o-mini/compact p50 900ms p95 2100ms 일치 5/6 ...')"""
+        s = self.summary()
+        parts = [f"합의 {s['agreement'] * 100:.0f}% 만장일치 {s['unanimous']}/{s['decisions']}"]
+        for name, m in s['members'].items():
+            timing = f" p50 {m['p50_ms']:.0f}ms p95 {m['p95_ms']:.0f}ms" if 'p50_ms' in m else ""
+            parts.append(f"{name}{timing} 일치 {m['agree']}/{m['valid']} 늦음 {m['late']}")
+        return " | ".join(parts)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    members = parse_members('gpt-4o-mini:compact,gpt-4o-mini:verbose,gpt-4.1-mini:compact:2')
+    print([m.name for m in members])
+
+    def rec(coin: str, confidence: int, timing: str = '즉시') -> Dict:
+        return {'selected_coin': coin, 'confidence': confidence, 'reason': f'{coin} 추천',
+                'entry_timing': timing, 'risk_level': '중간'}
+
+    responses = [(members[0], rec('XRP', 70)), (members[1], None), (members[2], rec('XRP', 60, '조정 대기'))]
+    for strategy in STRATEGIES:
+        for n in range(1, len(responses) + 1):
+            result = combine(strategy, members, responses[:n], final=n == len(responses))
+            if result:
+                print(f"{strategy:12s} 응답 {n}개에서 결정: {result['selected_coin']} "
+                      f"확신도 {result['confidence']} {result['entry_timing']}")
+                break
+        else:
+            print(f"{strategy:12s} 결정 못 함")
+
+    stats = EnsembleStats()
+    for m, r in responses:
+        stats.record_member(m.name, 800 if r else 3000, r is not None, late=False)
+    stats.record_decision(rec('XRP', 65), responses)
+    print(stats.format())
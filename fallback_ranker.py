@@ -0,0 +1,114 @@
+"""
+규칙 기반 종목 선택 (GPT 대체)
+GPT 응답이 기한 안에 오지 않거나 실패했을 때, GPT에 보낸 것과 같은 후보 지표
+(거래량 증가율, 거래대금, 가격 변동률)로 추천을 결정합니다.
+입력이 같으면 항상 같은 결과를 냅니다.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# 점수 가중치 (후보 안에서의 상대 순위 기준)
+WEIGHTS = {
+    'surge': 0.5,        # 거래량 증가율 (z-score가 있으면 z-score)
+    'value': 0.3,        # 24시간 거래대금 (유동성)
+    'price': 0.2         # 가격 변동률 (적당한 상승일수록 높음)
+}
+
+# 가격 변동률 구간 (%) - 이 구간 안이 가장 좋고, 과열 기준 이상은 0점
+PRICE_SWEET_SPOT = (2.0, 10.0)
+PRICE_OVERHEAT = 30.0
+
+MIN_CONFIDENCE = 40      # 규칙 기반 추천의 확신도 범위
+MAX_CONFIDENCE = 70
+
+
+def _rank01(values: np.ndarray) -> np.ndarray:
+    """후보 안에서의 순위를 0~1로 (NaN은 0, 후보 1개면 1)"""
+    score = np.zeros(len(values))
+    valid = ~np.isnan(values)
+    n = int(valid.sum())
+    if n == 1:
+        score[valid] = 1.0
+    elif n > 1:
+        # 같은 값은 같은 순위 (평균 순위)
+        v = values[valid]
+        below = (v[:, None] > v[None, :]).sum(axis=1)
+        ties = (v[:, None] == v[None, :]).sum(axis=1) - 1
+        score[valid] = (below + 0.5 * ties) / (n - 1)
+    return score
+
+
+def _price_score(change: np.ndarray) -> np.ndarray:
+    """가격 변동률 점수 (하락/과열 0점, 적정 구간 1점, 사이는 선형)"""
+    low, high = PRICE_SWEET_SPOT
+    change = np.nan_to_num(change, nan=0.0)
+    score = np.clip(change / low, 0, 1)
+    score = np.where(change > high, np.clip((PRICE_OVERHEAT - change) / (PRICE_OVERHEAT - high), 0, 1), score)
+    return score
+
+
+def score_candidates(candidates: List[Dict]) -> np.ndarray:
+    """후보별 점수 (0~1, 후보 순서)"""
+    def column(key: str) -> np.ndarray:
+        return np.array([np.nan if c.get(key) is None else float(c[key]) for c in candidates])
+
+    surge = column('surge_zscore')
+    if np.isnan(surge).all():
+        surge = column('volume_change')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = np.log(column('trade_value_24h'))
+
+    change = column('price_change_24h')
+    score = (WEIGHTS['surge'] * _rank01(surge)
+             + WEIGHTS['value'] * _rank01(value)
+             + WEIGHTS['price'] * _price_score(change))
+
+    # 이미 과열된 코인은 다른 후보가 없을 때만 선택되도록 절반으로
+    with np.errstate(invalid='ignore'):
+        score[change >= PRICE_OVERHEAT] *= 0.5
+    return score
+
+
+def recommend(candidates: List[Dict]) -> Optional[Dict]:
+    """
+    최고 점수 후보 추천 (ScalpingAnalyzer.recommend_coin과 같은 형식)
+
+    Returns:
+        {"selected_coin", "confidence", "reason", "entry_timing", "risk_level"}
+        후보가 없으면 None
+    """
+    if not candidates:
+        return None
+
+    scores = score_candidates(candidates)
+    # 동점이면 먼저 온 후보 (스캔 순위가 높은 쪽)
+    best = int(np.argmax(scores))
+    coin_info = candidates[best]
+    score = float(scores[best])
+
+    change = coin_info.get('price_change_24h') or 0.0
+    if change >= PRICE_SWEET_SPOT[1] * 2:
+        risk_level = '높음'
+    elif change > PRICE_SWEET_SPOT[1]:
+        risk_level = '중간'
+    else:
+        risk_level = '낮음'
+
+    confidence = int(round(MIN_CONFIDENCE + (MAX_CONFIDENCE - MIN_CONFIDENCE) * score))
+    entry_timing = '즉시' if score >= 0.6 and risk_level != '높음' else '조정 대기'
+
+    surge = coin_info.get('surge_zscore')
+    surge_text = f"거래량 z-score {surge:.1f}" if surge is not None else \
+        f"거래량 증가율 {coin_info.get('volume_change', 0):+.1f}%"
+    return {
+        'selected_coin': coin_info['coin'],
+        'confidence': confidence,
+        'reason': f"규칙 기반 선택: 후보 {len(candidates)}개 중 점수 {score:.2f} "
+                  f"({surge_text}, 24시간 {change:+.1f}%)",
+        'entry_timing': entry_timing,
+        'risk_level': risk_level
+    }
@@ -1,69 +1,148 @@
 from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Optional
 import json
+import time
+from latency_tracker import LatencyTracker
+from prompt_builder import MARKET_SYSTEM_PROMPT, PromptUsage, build_market_line, estimate_tokens
+from streaming_json import extract_json
+
+
+# 기존 서술형 프롬프트의 시스템 메시지 (prompt_style='verbose'에서 압축 전후 비교용)
+VERBOSE_SYSTEM_PROMPT = """당신은 비트코인 전문 트레이더입니다.
+주어진 시장 데이터를 분석하여 매수, 매도, 보유 결정을 내려야 합니다.
+반드시 다음 JSON 형식으로만 답변하세요:
+
+{
+    "decision": "buy" 또는 "sell" 또는 "hold",
+    "confidence": 0~100 사이의 숫자 (확신도),
+    "suggested_amount": 0~1 사이의 숫자 (투자 금액 비율, 1 = 100%),
+    "reason": "결정 이유를 한국어로 간단히 설명"
+}
+
+분석 시 고려사항:
+- 현재가 대비 24시간 변동률
+- 거래량 변화
+- 매수/매도 호가 차이
+- 전반적인 시장 심리
+- 리스크 관리 (과도한 투자 지양)"""
 
 
 class GPTAnalyzer:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, deadline: float = 20.0, request_timeout: float = 60.0,
+                 latency: Optional[LatencyTracker] = None, prompt_style: str = 'compact',
+                 usage: Optional[PromptUsage] = None, model: str = "gpt-4o-mini"):
+        """
+        Args:
+            deadline: GPT 응답 대기 한도 (초) - 넘으면 규칙 기반 결정 (get_simple_decision)
+            request_timeout: OpenAI 요청 자체의 타임아웃 (초)
+            latency: 경로별 지연 시간 기록기 (기본: 새로 생성)
+            prompt_style: 'compact' (key=value 한 줄 + 고정 시스템 프롬프트) 또는 'verbose' (기존 서술형)
+            usage: 호출별 토큰/시간 기록기 (기본: 새로 생성)
+        """
+        if prompt_style not in ('compact', 'verbose'):
+            raise ValueError(f"지원하지 않는 프롬프트 형식: {prompt_style}")
+
+        self.client = OpenAI(api_key=api_key, timeout=request_timeout)
+        self.model = model
+        self.prompt_style = prompt_style
+        self.usage = usage or PromptUsage()
+        self.deadline = deadline
+        self.latency = latency or LatencyTracker()
 
-    def analyze_market(self, market_data: Dict) -> Optional[Dict]:
+        # GPT 호출은 별도 스레드에서 (기한을 넘긴 호출은 백그라운드에서 끝남)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gpt')
+
+    def analyze_market(self, market_data: Dict, deadline: Optional[float] = None) -> Dict:
         """
         시장 데이터를 분석하여 매매 결정 반환
 
+        GPT가 deadline초 안에 답하지 않거나 실패하면 규칙 기반으로 결정합니다
+        (보유 중이면 수익률 기준 익절/손절, 아니면 보유).
+
         Returns:
             {
                 "decision": "buy" | "sell" | "hold",
                 "confidence": 0-100,
+                "suggested_amount": 투자 금액 비율 (0-1),
                 "reason": "분석 이유",
-                "suggested_amount": 투자 금액 비율 (0-1)
+                "source": "gpt" | "fallback",
+                "latency_ms": 결정까지 걸린 시간
             }
         """
+        started = time.perf_counter()
+        deadline = self.deadline if deadline is None else deadline
+
+        future = self._executor.submit(self._analyze_gpt, market_data)
+        try:
+            result = future.result(timeout=deadline)
+            fallback_reason = 'GPT 분석 실패'
+        except FutureTimeoutError:
+            result = None
+            fallback_reason = f'GPT 응답 {deadline:.1f}초 초과'
+
+        source = 'gpt'
+        if result is None:
+            source = 'fallback'
+            result = self._fallback_decision(market_data, fallback_reason)
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        result['source'] = source
+        result['latency_ms'] = latency_ms
+        self.latency.record(source, latency_ms)
+        return result
+
+    def _fallback_decision(self, market_data: Dict, reason: str) -> Dict:
+        """규칙 기반 결정 (GPT 없이 새로 매수하지 않음)"""
+        current_price = market_data.get('current_price', 0)
+        avg_buy_price = market_data.get('avg_buy_price', 0)
+        holding = market_data.get('balance', {}).get('btc_balance', 0) > 0
+
+        decision = 'hold'
+        profit_text = ''
+        if holding and avg_buy_price > 0 and current_price > 0:
+            profit_rate = (current_price - avg_buy_price) / avg_buy_price * 100
+            decision = self.get_simple_decision(current_price, avg_buy_price, profit_rate)
+            profit_text = f", 수익률 {profit_rate:+.2f}%"
+
+        return {
+            'decision': decision,
+            'confidence': 50,
+            'reason': f"규칙 기반 판단 ({reason}{profit_text})",
+            'suggested_amount': 0.0 if decision == 'hold' else 1.0,
+            'fallback_reason': reason
+        }
+
+    def _analyze_gpt(self, market_data: Dict) -> Optional[Dict]:
+        """GPT 분석 1회 (작업 스레드에서 실행)"""
+        result_text = ''
+        started = time.perf_counter()
         try:
             # 시장 데이터를 GPT가 분석하기 쉬운 형태로 변환
-            prompt = self._create_analysis_prompt(market_data)
+            if self.prompt_style == 'compact':
+                system_prompt = MARKET_SYSTEM_PROMPT
+                prompt = build_market_line(market_data) + "\n위 데이터를 기반으로 매매 결정을 내려주세요."
+            else:
+                system_prompt = VERBOSE_SYSTEM_PROMPT
+                prompt = self._create_analysis_prompt(market_data)
 
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # GPT-4o-mini 사용 (가성비 최고)
+                model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 비트코인 전문 트레이더입니다.
-주어진 시장 데이터를 분석하여 매수, 매도, 보유 결정을 내려야 합니다.
-반드시 다음 JSON 형식으로만 답변하세요:
-
-{
-    "decision": "buy" 또는 "sell" 또는 "hold",
-    "confidence": 0~100 사이의 숫자 (확신도),
-    "reason": "결정 이유를 한국어로 간단히 설명",
-    "suggested_amount": 0~1 사이의 숫자 (투자 금액 비율, 1 = 100%)
-}
-
-분석 시 고려사항:
-- 현재가 대비 24시간 변동률
-- 거래량 변화
-- 매수/매도 호가 차이
-- 전반적인 시장 심리
-- 리스크 관리 (과도한 투자 지양)"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
                 ],
                 max_completion_tokens=500
             )
+            self.usage.record(f"market/{self.prompt_style}", self.model, getattr(response, 'usage', None),
+                              (time.perf_counter() - started) * 1000,
+                              estimate_tokens(system_prompt) + estimate_tokens(prompt))
 
             # GPT 응답 파싱
             result_text = response.choices[0].message.content.strip()
 
-            # JSON 추출 (마크다운 코드 블록 제거)
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(result_text)
+            # JSON 추출 (마크다운 코드 블록/앞뒤 설명 무시)
+            result = extract_json(result_text)
 
             # 결과 검증
             if not self._validate_result(result):
@@ -79,6 +158,8 @@ class GPTAnalyzer:
         except Exception as e:
             print(f"GPT 분석 오류: {str(e)}")
             return None
+        finally:
+            self.latency.record('gpt_call', (time.perf_counter() - started) * 1000)
 
     def _create_analysis_prompt(self, market_data: Dict) -> str:
         """시장 데이터를 분석용 프롬프트로 변환"""
@@ -0,0 +1,150 @@
+"""
+빗썸 API용 keep-alive HTTP 세션 풀
+연결을 재사용하여 매 요청마다 TCP/TLS 핸드셰이크가 발생하지 않도록 하고,
+연결별 재사용 횟수를 추적합니다.
+"""
+
+import threading
+import weakref
+from typing import Dict, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+class ConnectionStats:
+    """연결 생성/재사용 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakKeyDictionary()  # conn -> {'id', 'uses', 'handshakes'}
+        self._next_id = 0
+        self.requests = 0
+        self.handshakes = 0
+        self.reused = 0
+
+    def on_checkout(self, pool, conn):
+        """풀에서 연결을 꺼낼 때 호출 - 소켓이 없으면 새 핸드셰이크가 발생함"""
+        new_handshake = getattr(conn, 'sock', None) is None
+
+        with self._lock:
+            info = self._connections.get(conn)
+            if info is None:
+                self._next_id += 1
+                info = {
+                    'id': f"{pool.host}:{pool.port}#{self._next_id}",
+                    'uses': 0,
+                    'handshakes': 0
+                }
+                self._connections[conn] = info
+
+            info['uses'] += 1
+            self.requests += 1
+
+            if new_handshake:
+                info['handshakes'] += 1
+                self.handshakes += 1
+            else:
+                self.reused += 1
+
+    def snapshot(self) -> Dict:
+        """현재 카운터 조회"""
+        with self._lock:
+            per_connection = [dict(info) for info in self._connections.values()]
+            return {
+                'requests': self.requests,
+                'handshakes': self.handshakes,
+                'reused': self.reused,
+                'reuse_rate': (self.reused / self.requests * 100) if self.requests else 0.0,
+                'open_connections': len(per_connection),
+                'per_connection': per_connection
+            }
+
+
+def _counting_pool_class(base, stats: ConnectionStats):
+    """연결 체크아웃 시 stats를 갱신하는 커넥션 풀 클래스 생성"""
+
+    class CountingConnectionPool(base):
+        def _get_conn(self, timeout=None):
+            conn = super()._get_conn(timeout=timeout)
+            stats.on_checkout(self, conn)
+            return conn
+
+    return CountingConnectionPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """연결 재사용 카운터가 달린 HTTPAdapter"""
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        # HTTPAdapter.__init__ 안에서 init_poolmanager가 호출되므로 먼저 설정
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats)
+        }
+
+
+class PooledSession:
+    """
+    공개/인증 API가 함께 사용하는 keep-alive 세션
+
+    Args:
+        pool_size: 호스트당 유지할 최대 연결 수
+        timeout: (연결, 읽기) 타임아웃 (초) 또는 단일 값
+        max_retries: 연결 실패/일시적 오류 재시도 횟수
+        backoff_factor: 재시도 간격 계수
+    """
+
+    def __init__(self, pool_size: int = 10,
+                 timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 max_retries: int = 3, backoff_factor: float = 0.3,
+                 status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504)):
+        self.timeout = timeout
+        self.stats = ConnectionStats()
+
+        # 상태 코드/읽기 오류 재시도는 GET에만 적용 (주문 POST 중복 전송 방지)
+        # 연결 단계 실패는 요청이 전송되지 않았으므로 POST도 재시도
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+
+        adapter = CountingHTTPAdapter(
+            self.stats,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive'})
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def get_connection_stats(self) -> Dict:
+        """연결 재사용 통계 조회"""
+        return self.stats.snapshot()
+
+    def close(self):
+        """풀에 남아있는 연결 종료"""
+        self.session.close()
@@ -0,0 +1,368 @@
+"""
+스트리밍 기술적 지표 엔진
+코인별 지표 상태를 열(column) 배열로 보관하고, 새 틱/봉이 들어오면
+전체 코인을 한 번에 O(1)로 갱신합니다 (EMA, RSI, VWAP, ATR, 볼린저 밴드, z-score).
+상태는 파일로 저장/복원하여 재시작 시 과거 데이터를 다시 계산하지 않습니다.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from market_snapshot import TickerSnapshot
+
+
+class IndicatorEngine:
+    """
+    코인 x 지표 상태 배열
+
+    모든 지표는 지수 평활(EMA/Wilder) 또는 고정 길이 링버퍼의 누적합으로 계산하므로
+    갱신 비용이 과거 길이와 무관합니다.
+
+    Args:
+        ema_fast / ema_slow: EMA 기간
+        rsi_period / atr_period: Wilder 평활 기간
+        vwap_period: 지수 가중 VWAP 기간
+        band_period: 볼린저 밴드/z-score 링버퍼 길이
+        band_k: 볼린저 밴드 표준편차 배수
+        initial_coins: 처음 할당할 코인 열 수 (부족하면 2배씩 늘림)
+    """
+
+    # 코인 열마다 하나씩 있는 상태 (링버퍼 제외)
+    STATE_FIELDS = ('count', 'last_close', 'ema_fast', 'ema_slow', 'avg_gain', 'avg_loss', 'atr',
+                    'vwap_pv', 'vwap_v', 'ring_pos', 'price_sum', 'price_sumsq', 'volume_sum', 'volume_sumsq',
+                    'ring_count', 'last_volume_24h')
+    # 0에서 시작하는 상태 (나머지는 NaN = 아직 값 없음)
+    ZERO_FIELDS = ('count', 'ring_pos', 'price_sum', 'price_sumsq', 'volume_sum', 'volume_sumsq', 'ring_count')
+
+    def __init__(self, ema_fast: int = 12, ema_slow: int = 26, rsi_period: int = 14, atr_period: int = 14,
+                 vwap_period: int = 30, band_period: int = 20, band_k: float = 2.0, initial_coins: int = 512):
+        self.config = {
+            'ema_fast': ema_fast, 'ema_slow': ema_slow, 'rsi_period': rsi_period, 'atr_period': atr_period,
+            'vwap_period': vwap_period, 'band_period': band_period, 'band_k': band_k
+        }
+        self.band_period = band_period
+        self.band_k = band_k
+
+        self._alpha_fast = 2 / (ema_fast + 1)
+        self._alpha_slow = 2 / (ema_slow + 1)
+        self._alpha_rsi = 1 / rsi_period
+        self._alpha_atr = 1 / atr_period
+        self._alpha_vwap = 2 / (vwap_period + 1)
+        self._warmup = max(ema_slow, rsi_period, atr_period, band_period)
+
+        self._columns: Dict[str, int] = {}
+        self._state = {name: np.full(initial_coins, 0.0 if name in self.ZERO_FIELDS else np.nan)
+                       for name in self.STATE_FIELDS}
+        self._ring_price = np.zeros((band_period, initial_coins))
+        self._ring_volume = np.zeros((band_period, initial_coins))
+
+        self._updates = 0
+        self._columns_key = None   # 마지막으로 매핑한 코인 순서
+        self._columns_cache = None
+
+    # ===== 코인 열 매핑 =====
+
+    def _columns_for(self, coins: Sequence[str]) -> np.ndarray:
+        if coins is self._columns_key or coins == self._columns_key:
+            return self._columns_cache
+
+        columns = []
+        for coin in coins:
+            column = self._columns.get(coin)
+            if column is None:
+                column = len(self._columns)
+                self._columns[coin] = column
+            columns.append(column)
+
+        width = len(self._state['count'])
+        if len(self._columns) > width:
+            self._grow(max(len(self._columns), width * 2))
+
+        self._columns_key = list(coins)
+        self._columns_cache = np.array(columns, dtype=np.intp)
+        return self._columns_cache
+
+    def _grow(self, width: int):
+        for name, array in self._state.items():
+            grown = np.full(width, 0.0 if name in self.ZERO_FIELDS else np.nan)
+            grown[:len(array)] = array
+            self._state[name] = grown
+
+        for attr in ('_ring_price', '_ring_volume'):
+            ring = getattr(self, attr)
+            grown = np.zeros((self.band_period, width))
+            grown[:, :ring.shape[1]] = ring
+            setattr(self, attr, grown)
+
+    # ===== 갱신 =====
+
+    def update(self, coins: Sequence[str], close: np.ndarray, volume: Optional[np.ndarray] = None,
+               high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None):
+        """
+        새 틱/봉 반영 (코인 수만큼 벡터 연산 1회)
+
+        Args:
+            coins: 코인 심볼 (close와 같은 순서)
+            close: 종가 (틱이면 현재가)
+            volume: 이번 틱/봉의 거래량 (없으면 VWAP/거래량 z-score 갱신 안 함)
+            high / low: 고가/저가 (없으면 종가로 간주)
+        """
+        columns = self._columns_for(coins)
+        close = np.asarray(close, dtype=np.float64)
+        valid = ~np.isnan(close) & (close > 0)
+        if not valid.all():
+            columns, close = columns[valid], close[valid]
+            volume = None if volume is None else np.asarray(volume, dtype=np.float64)[valid]
+            high = None if high is None else np.asarray(high, dtype=np.float64)[valid]
+            low = None if low is None else np.asarray(low, dtype=np.float64)[valid]
+
+        high = close if high is None else np.fmax(high, close)
+        low = close if low is None else np.fmin(low, close)
+
+        s = self._state
+        first = s['count'][columns] == 0
+        prev = np.where(first, close, s['last_close'][columns])
+
+        # EMA
+        for name, alpha in (('ema_fast', self._alpha_fast), ('ema_slow', self._alpha_slow)):
+            current = s[name][columns]
+            s[name][columns] = np.where(first, close, current + alpha * (close - current))
+
+        # RSI (Wilder)
+        change = close - prev
+        gain = np.where(first, 0.0, np.maximum(change, 0))
+        loss = np.where(first, 0.0, np.maximum(-change, 0))
+        for name, value in (('avg_gain', gain), ('avg_loss', loss)):
+            current = s[name][columns]
+            s[name][columns] = np.where(first, value, current + self._alpha_rsi * (value - current))
+
+        # ATR (Wilder, true range)
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+        current = s['atr'][columns]
+        s['atr'][columns] = np.where(first, true_range, current + self._alpha_atr * (true_range - current))
+
+        # VWAP (지수 가중)
+        if volume is not None:
+            volume = np.nan_to_num(np.maximum(volume, 0))
+            typical = (high + low + close) / 3
+            for name, value in (('vwap_pv', typical * volume), ('vwap_v', volume)):
+                current = s[name][columns]
+                s[name][columns] = np.where(np.isnan(current), value, current + self._alpha_vwap * (value - current))
+
+        # 링버퍼 누적합 (볼린저 밴드, z-score) - 가장 오래된 값을 빼고 새 값을 더함
+        pos = s['ring_pos'][columns].astype(np.intp)
+        self._roll(self._ring_price, 'price_sum', 'price_sumsq', columns, pos, close)
+        if volume is not None:
+            self._roll(self._ring_volume, 'volume_sum', 'volume_sumsq', columns, pos, volume)
+
+        s['ring_pos'][columns] = (pos + 1) % self.band_period
+        s['ring_count'][columns] = np.minimum(s['ring_count'][columns] + 1, self.band_period)
+        s['last_close'][columns] = close
+        s['count'][columns] += 1
+
+        # 누적합 부동소수점 오차 제거 (band_period x 50회 갱신마다 링버퍼로 다시 합산 - 평균 O(1))
+        self._updates += 1
+        if self._updates % (self.band_period * 50) == 0:
+            self._resum()
+
+    def _roll(self, ring: np.ndarray, sum_name: str, sumsq_name: str,
+              columns: np.ndarray, pos: np.ndarray, value: np.ndarray):
+        s = self._state
+        old = ring[pos, columns]
+        s[sum_name][columns] += value - old
+        s[sumsq_name][columns] += value * value - old * old
+        ring[pos, columns] = value
+
+    def _resum(self):
+        s = self._state
+        s['price_sum'][:] = self._ring_price.sum(axis=0)
+        s['price_sumsq'][:] = (self._ring_price ** 2).sum(axis=0)
+        s['volume_sum'][:] = self._ring_volume.sum(axis=0)
+        s['volume_sumsq'][:] = (self._ring_volume ** 2).sum(axis=0)
+
+    def update_snapshot(self, snapshot: TickerSnapshot):
+        """
+        전체 시세 스냅샷 반영 (틱 단위)
+
+        틱 거래량 = 24시간 누적 거래량의 직전 스냅샷 대비 증가분 (24시간 창이 밀려 줄어들면 0)
+        """
+        columns = self._columns_for(snapshot.coin_list)
+        previous = self._state['last_volume_24h'][columns]
+        with np.errstate(invalid='ignore'):
+            volume = np.where(np.isnan(previous), 0.0, np.maximum(snapshot.volume - previous, 0))
+
+        self.update(snapshot.coin_list, snapshot.price, volume=volume)
+        self._state['last_volume_24h'][columns] = snapshot.volume
+
+    def update_bars(self, bars: Dict[str, np.ndarray]):
+        """
+        캔들 배열로 상태 채우기 (CandleStore.load_bars 결과, 봉 수만큼 반복)
+
+        비어 있는 앞부분(NaN)은 건너뜀
+        """
+        coins = bars['coins']
+        for j in range(bars['close'].shape[1]):
+            self.update(coins, bars['close'][:, j], volume=bars['volume'][:, j],
+                        high=bars['high'][:, j], low=bars['low'][:, j])
+
+    # ===== 조회 =====
+
+    def values(self, coins: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        코인별 지표 (coins 순서의 배열, 준비 안 된 값은 NaN)
+
+        Returns:
+            ema_fast, ema_slow, ema_gap_pct, rsi, vwap, vwap_gap_pct, atr_pct,
+            bb_upper, bb_lower, bb_pct_b, price_zscore, volume_zscore, warm
+        """
+        columns = np.array([self._columns.get(coin, -1) for coin in coins], dtype=np.intp)
+        known = columns >= 0
+        columns = np.where(known, columns, 0)
+
+        s = {name: np.where(known, array[columns], np.nan) for name, array in self._state.items()}
+        close = s['last_close']
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = s['avg_gain'] / s['avg_loss']
+            rsi = np.where(s['avg_loss'] == 0, np.where(s['avg_gain'] > 0, 100.0, 50.0), 100 - 100 / (1 + rs))
+
+            n = s['ring_count']
+            price_mean = s['price_sum'] / n
+            price_std = np.sqrt(np.maximum(s['price_sumsq'] / n - price_mean ** 2, 0))
+            volume_mean = s['volume_sum'] / n
+            volume_std = np.sqrt(np.maximum(s['volume_sumsq'] / n - volume_mean ** 2, 0))
+
+            bb_upper = price_mean + self.band_k * price_std
+            bb_lower = price_mean - self.band_k * price_std
+            vwap = s['vwap_pv'] / s['vwap_v']
+            last_pos = (self._state['ring_pos'][columns].astype(np.intp) - 1) % self.band_period
+            last_volume = self._ring_volume[last_pos, columns]
+
+            result = {
+                'ema_fast': s['ema_fast'],
+                'ema_slow': s['ema_slow'],
+                'ema_gap_pct': (s['ema_fast'] / s['ema_slow'] - 1) * 100,
+                'rsi': rsi,
+                'vwap': vwap,
+                'vwap_gap_pct': (close / vwap - 1) * 100,
+                'atr_pct': s['atr'] / close * 100,
+                'bb_upper': bb_upper,
+                'bb_lower': bb_lower,
+                'bb_pct_b': (close - bb_lower) / (bb_upper - bb_lower),
+                'price_zscore': (close - price_mean) / price_std,
+                'volume_zscore': (last_volume - volume_mean) / volume_std
+            }
+
+        warm = s['count'] >= self._warmup
+        for name, array in result.items():
+            array[~warm | ~np.isfinite(array)] = np.nan
+        result['warm'] = warm
+        return result
+
+    def fields_for(self, coins: Sequence[str]) -> List[Dict[str, Optional[float]]]:
+        """후보 dict에 붙일 지표 필드 (워밍업 전이면 빈 dict)"""
+        values = self.values(coins)
+        fields = []
+        for i in range(len(coins)):
+            if not values['warm'][i]:
+                fields.append({})
+                continue
+            fields.append({
+                f"ind_{name}": (None if np.isnan(array[i]) else round(float(array[i]), 6))
+                for name, array in values.items() if name != 'warm'
+            })
+        return fields
+
+    # ===== 저장/복원 =====
+
+    def save(self, path: str):
+        """워밍업 상태 저장 (.npz)"""
+        coins = sorted(self._columns, key=self._columns.get)
+        width = len(coins)
+        arrays = {f"state_{name}": array[:width] for name, array in self._state.items()}
+        with open(path, 'wb') as f:  # 파일 객체로 넘겨야 확장자가 바뀌지 않음
+            np.savez_compressed(
+                f,
+                coins=np.array(coins, dtype=object).astype(str),
+                config=np.array([self.config[key] for key in sorted(self.config)], dtype=np.float64),
+                config_keys=np.array(sorted(self.config)),
+                ring_price=self._ring_price[:, :width],
+                ring_volume=self._ring_volume[:, :width],
+                updates=np.array([self._updates]),
+                **arrays
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'IndicatorEngine':
+        """save()로 저장한 상태 복원"""
+        with np.load(path, allow_pickle=False) as data:
+            config = dict(zip(data['config_keys'].tolist(), data['config'].tolist()))
+            engine = cls(**{key: (value if key == 'band_k' else int(value)) for key, value in config.items()})
+
+            coins = data['coins'].tolist()
+            engine._columns_for(coins)
+            width = len(coins)
+            for name in cls.STATE_FIELDS:
+                engine._state[name][:width] = data[f"state_{name}"]
+            engine._ring_price[:, :width] = data['ring_price']
+            engine._ring_volume[:, :width] = data['ring_volume']
+            engine._updates = int(data['updates'][0])
+
+        return engine
+
+    def get_stats(self) -> Dict:
+        count = self._state['count'][:len(self._columns)]
+        return {
+            'coins': len(self._columns),
+            'warm_coins': int((count >= self._warmup).sum()),
+            'updates': self._updates,
+            'memory_bytes': sum(a.nbytes for a in self._state.values())
+                            + self._ring_price.nbytes + self._ring_volume.nbytes
+        }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    rng = np.random.default_rng(0)
+    coins = [f"C{i}" for i in range(400)]
+    prices = rng.uniform(10, 1000, len(coins))
+
+    engine = IndicatorEngine()
+    start = time.perf_counter()
+    steps = 2000
+    for _ in range(steps):
+        prices *= np.exp(rng.normal(0, 0.002, len(coins)))
+        engine.update(coins, prices, volume=rng.uniform(0, 100, len(coins)))
+    elapsed = (time.perf_counter() - start) / steps * 1e6
+    print(f"코인 {len(coins)}개 갱신: {elapsed:.0f}µs/틱")
+
+    # RSI를 단순 반복 계산과 비교
+    series = []
+    check = IndicatorEngine()
+    p = 100.0
+    for _ in range(300):
+        p *= np.exp(rng.normal(0, 0.01))
+        series.append(p)
+        check.update(['X'], np.array([p]))
+    diff = np.diff(series)
+    gain = loss = 0.0
+    for i, d in enumerate(diff):
+        g, l = max(d, 0), max(-d, 0)
+        gain = g if i == 0 else gain + (g - gain) / 14
+        loss = l if i == 0 else loss + (l - loss) / 14
+    print(f"RSI 엔진 {check.values(['X'])['rsi'][0]:.4f} / 반복 계산 {100 - 100 / (1 + gain / loss):.4f}")
+    window = np.array(series[-20:])
+    print(f"z-score 엔진 {check.values(['X'])['price_zscore'][0]:.4f} / 직접 계산 "
+          f"{(window[-1] - window.mean()) / window.std():.4f}")
+
+    path = os.path.join(tempfile.mkdtemp(), 'indicators.npz')
+    engine.save(path)
+    restored = IndicatorEngine.load(path)
+    same = np.allclose(engine.values(coins)['rsi'], restored.values(coins)['rsi'], equal_nan=True)
+    print(f"저장/복원: {os.path.getsize(path) / 1024:.0f}KB, 값 일치 {same}")
+    print(engine.fields_for(['C0'])[0])
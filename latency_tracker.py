@@ -0,0 +1,62 @@
+"""
+지연 시간 기록기
+판단 경로(GPT/캐시/규칙 기반 대체)별 지연 시간을 최근 N개씩 보관하고 백분위를 계산합니다.
+"""
+
+import threading
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+
+class LatencyTracker:
+    """
+    경로별 지연 시간 (스레드 안전)
+
+    Args:
+        window: 경로별로 보관할 최근 기록 수
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, source: str, latency_ms: float):
+        with self._lock:
+            samples = self._samples.get(source)
+            if samples is None:
+                samples = self._samples[source] = deque(maxlen=self.window)
+                self._counts[source] = 0
+            samples.append(latency_ms)
+            self._counts[source] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        경로별 요약
+
+        Returns:
+            {경로: {'count': 누적 횟수, 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms' (최근 window개 기준)}}
+        """
+        with self._lock:
+            snapshot = {source: (self._counts[source], np.array(samples))
+                        for source, samples in self._samples.items()}
+
+        result = {}
+        for source, (count, samples) in snapshot.items():
+            p50, p95 = np.percentile(samples, [50, 95])
+            result[source] = {
+                'count': count,
+                'mean_ms': float(samples.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(samples.max())
+            }
+        return result
+
+    def format(self) -> str:
+        """한 줄 요약 (예: 'gpt 12회 p50 1830ms p95 4210ms | fallback 3회 ...')"""
+        return " | ".join(f"{source} {stats['count']}회 p50 {stats['p50_ms']:.0f}ms p95 {stats['p95_ms']:.0f}ms"
+                          for source, stats in self.summary().items())
@@ -0,0 +1,129 @@
+"""
+공개 시세 데이터 캐시
+엔드포인트별 TTL 동안 응답을 재사용하고,
+같은 데이터를 동시에 요청하면 하나의 요청 결과를 함께 사용합니다 (single-flight).
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class _Flight:
+    """진행 중인 요청 (결과를 기다리는 호출자들이 공유)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class MarketDataCache:
+    """
+    TTL + 요청 병합 캐시 (스레드 안전)
+
+    Args:
+        ttls: {키 prefix: TTL(초)} - 가장 긴 prefix부터 매칭
+        default_ttl: 매칭되는 prefix가 없을 때 TTL (초)
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 1.0):
+        if ttls is None:
+            ttls = {
+                '/public/ticker/ALL_': 1.0,     # 전체 시세 (스캔 1회 안에서 공유)
+                '/public/ticker/': 0.5,         # 단일 코인 시세
+                '/public/orderbook/': 0.3,      # 호가
+                'price/': 0.5                   # 현재가 (pybithumb 등)
+            }
+        self.ttls = dict(sorted(ttls.items(), key=lambda x: -len(x[0])))
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._entries = {}   # key -> (저장 시각, 값)
+        self._inflight = {}  # key -> _Flight
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl_for(self, key: str) -> float:
+        for prefix, ttl in self.ttls.items():
+            if key.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+            should_cache: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        캐시 조회 - 없거나 만료되면 loader 호출
+
+        Args:
+            key: 캐시 키 (예: '/public/ticker/ALL_KRW')
+            loader: 실제 요청 함수
+            ttl: 이 호출에만 적용할 TTL (초)
+            should_cache: 결과를 저장할지 판단하는 함수 (기본: None이 아니면 저장)
+        """
+        ttl = self.ttl_for(key) if ttl is None else ttl
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                self.hits += 1
+                return entry[1]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+            flight.value = value
+
+            cacheable = should_cache(value) if should_cache else value is not None
+            if cacheable:
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), value)
+
+            return value
+
+        except BaseException as e:
+            flight.error = e
+            raise
+
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def invalidate(self, key: Optional[str] = None):
+        """캐시 삭제 (key가 없으면 전체)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """hit/miss/병합 횟수"""
+        with self._lock:
+            total = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': (self.hits + self.coalesced) / total * 100 if total else 0.0,
+                'entries': len(self._entries)
+            }
@@ -0,0 +1,405 @@
+"""
+빗썸 WebSocket 실시간 시세 수신 모듈
+ticker/체결/호가 채널을 구독해 코인별 최신 가격 테이블을 메모리에 유지하고,
+연결이 끊기면 자동으로 재연결 후 다시 구독합니다.
+호가는 (재)연결할 때마다 비우고 REST 호가 스냅샷으로 다시 채운 뒤 orderbookdepth 변경분을 적용합니다.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import websockets
+
+
+class BithumbWebSocketFeed:
+    """
+    백그라운드 스레드에서 동작하는 WebSocket 시세 클라이언트
+
+    Args:
+        symbols: 구독할 코인 심볼 리스트 (예: ['XRP', 'BTC'])
+        channels: 구독할 채널 ('ticker', 'transaction', 'orderbookdepth')
+        url: WebSocket 주소 (로컬 대역 서버 연결 시 지정)
+        tick_type: ticker 채널 기준 시간 ('30M', '1H', '12H', '24H', 'MID')
+        reconnect_delay: 첫 재연결 대기 시간 (초, 실패할수록 2배씩 증가)
+        max_reconnect_delay: 최대 재연결 대기 시간 (초)
+        orderbook_snapshot: 코인별 REST 호가 조회 (예: BithumbAPI.get_orderbook, /public/orderbook 응답의 data)
+                            스냅샷을 받기 전에는 마지막 체결가와 교차하는 호가를 버리고,
+                            체결가도 없으면 매수/매도 호가를 발행하지 않음
+    """
+
+    WS_URL = "wss://pubwss.bithumb.com/pub/ws"
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None,
+                 channels: Iterable[str] = ('ticker', 'transaction', 'orderbookdepth'),
+                 url: Optional[str] = None, tick_type: str = '30M',
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 orderbook_snapshot: Optional[Callable[[str], Optional[Dict]]] = None):
+        self.url = url or self.WS_URL
+        self.channels = list(channels)
+        self.tick_type = tick_type
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.orderbook_snapshot = orderbook_snapshot
+
+        # 구독 목록은 호출 스레드(subscribe)와 이벤트 루프 스레드가 함께 쓰므로 잠금 안에서만 변경/복사
+        self._symbols = set(symbols or [])
+        self._symbols_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._quotes = {}    # coin -> {'price', 'bid', 'ask', 'volume', 'change_rate', 'updated', 'version'}
+        # 호가는 이벤트 루프 스레드에서만 변경
+        self._books = {}     # coin -> {'bid': {price: qty}, 'ask': {price: qty}}
+        self._seeded = set() # REST 스냅샷으로 채운 코인 (이번 연결 기준)
+        self._pending = {}   # 스냅샷 조회 중인 코인 -> 그동안 받은 변경분 [(datetime μs, side, price, qty)]
+        self._listeners: List[Callable[[str, Dict], None]] = []
+        self._trade_listeners: List[Callable[[str, float, float, float], None]] = []
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._running = False
+
+        self.stats = {'messages': 0, 'reconnects': 0, 'connected': False, 'last_message_at': None,
+                      'book_snapshots': 0, 'crossed_levels_dropped': 0}
+
+    # ===== 생명주기 =====
+
+    def start(self) -> 'BithumbWebSocketFeed':
+        """백그라운드 스레드에서 수신 시작"""
+        if self._running:
+            return self
+
+        self._running = True
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """수신 종료"""
+        self._running = False
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _thread_main(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        """연결 유지 루프 (끊기면 지수 백오프로 재연결)"""
+        delay = self.reconnect_delay
+
+        while self._running:
+            try:
+                async with websockets.connect(self.url, ping_interval=20, ping_timeout=20) as ws:
+                    # 끊긴 동안의 변경분은 알 수 없으므로 호가를 비우고 스냅샷부터 다시
+                    self._reset_books()
+                    self._ws = ws
+                    self.stats['connected'] = True
+                    symbols = await self._send_subscriptions(ws)
+                    seeding = asyncio.ensure_future(self._seed_books(symbols))
+                    delay = self.reconnect_delay
+
+                    try:
+                        async for raw in ws:
+                            self._handle_message(raw)
+                    finally:
+                        seeding.cancel()
+
+            except Exception as e:
+                if self._running:
+                    print(f"WebSocket 연결 끊김: {str(e)} - {delay:.0f}초 후 재연결")
+            finally:
+                self._ws = None
+                self.stats['connected'] = False
+
+            if not self._running:
+                break
+
+            self.stats['reconnects'] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    # ===== 구독 =====
+
+    def subscribe(self, symbols: Iterable[str]):
+        """구독 심볼 추가 (연결 중이면 즉시 구독 메시지 전송 후 새 코인 호가 스냅샷 조회)"""
+        with self._symbols_lock:
+            new_symbols = set(symbols) - self._symbols
+            if not new_symbols:
+                return
+            self._symbols = self._symbols | new_symbols
+
+        ws = self._ws
+        if self._loop is not None and ws is not None:
+            asyncio.run_coroutine_threadsafe(self._subscribe_more(ws, new_symbols), self._loop)
+
+    async def _subscribe_more(self, ws, new_symbols: set):
+        await self._send_subscriptions(ws)
+        await self._seed_books(new_symbols)
+
+    async def _send_subscriptions(self, ws) -> set:
+        """현재 구독 목록 전체를 채널별로 전송 (재연결 시 재구독) - 보낸 심볼 반환"""
+        with self._symbols_lock:
+            symbols = set(self._symbols)
+        if not symbols:
+            return symbols
+
+        pairs = sorted(f"{coin}_KRW" for coin in symbols)
+        for channel in self.channels:
+            message = {'type': channel, 'symbols': pairs}
+            if channel == 'ticker':
+                message['tickTypes'] = [self.tick_type]
+            await ws.send(json.dumps(message))
+        return symbols
+
+    # ===== 호가 =====
+
+    def _reset_books(self):
+        """호가 전체 초기화 (연결할 때마다, 발행한 매수/매도 호가도 지움)"""
+        self._books.clear()
+        self._seeded.clear()
+        self._pending.clear()
+        with self._cond:
+            for quote in self._quotes.values():
+                quote['bid'] = quote['ask'] = None
+
+    async def _seed_books(self, symbols: Iterable[str]):
+        """REST 호가 스냅샷으로 코인별 호가 채우기 (조회는 스레드 풀에서, 반영은 이벤트 루프에서)"""
+        if self.orderbook_snapshot is None or 'orderbookdepth' not in self.channels:
+            return
+
+        loop = asyncio.get_running_loop()
+        ws = self._ws
+        for coin in sorted(symbols):
+            self._pending[coin] = []
+            try:
+                snapshot = await loop.run_in_executor(None, self.orderbook_snapshot, coin)
+            except Exception as e:
+                print(f"호가 스냅샷 조회 오류 ({coin}): {str(e)}")
+                snapshot = None
+            # 조회하는 사이 재연결됐으면 새 연결에서 다시 채움
+            if ws is not self._ws:
+                return
+            pending = self._pending.pop(coin, [])
+            if not snapshot:
+                continue
+
+            try:
+                book = {side: {float(level['price']): float(level['quantity'])
+                               for level in snapshot.get(key, []) if float(level['quantity']) > 0}
+                        for side, key in (('bid', 'bids'), ('ask', 'asks'))}
+                snapshot_ms = int(snapshot.get('timestamp', 0))
+            except (KeyError, ValueError, TypeError):
+                continue
+            self._books[coin] = book
+            # 조회하는 동안 받은 변경분 중 스냅샷 이후 것만 다시 적용 (스냅샷 시각은 ms 단위라 같은 ms는 버림)
+            for received_us, side, price, quantity in pending:
+                if received_us // 1000 > snapshot_ms:
+                    self._update_book(coin, side, price, quantity)
+            self._seeded.add(coin)
+            self.stats['book_snapshots'] += 1
+            self._publish_book(coin, time.time())
+            with self._cond:
+                self._cond.notify_all()
+
+    def _publish_book(self, coin: str, now: float):
+        """호가 -> 최우선 매수/매도 호가"""
+        book = self._books[coin]
+        if coin not in self._seeded:
+            # 스냅샷 전에는 변경분만 있어 사라진 호가가 남아 있을 수 있음 - 마지막 체결가와 교차하는 호가는 버림
+            quote = self._quotes.get(coin)
+            last = quote['price'] if quote else None
+            if last is None:
+                return
+            stale = [p for p in book['bid'] if p > last], [p for p in book['ask'] if p < last]
+            for side, prices in zip(('bid', 'ask'), stale):
+                for price in prices:
+                    del book[side][price]
+                self.stats['crossed_levels_dropped'] += len(prices)
+
+        with self._cond:
+            quote = self._quotes.setdefault(coin, {'price': None, 'bid': None, 'ask': None,
+                                                   'volume': None, 'change_rate': None,
+                                                   'updated': None, 'version': 0})
+            quote['bid'] = max(book['bid']) if book['bid'] else None
+            quote['ask'] = min(book['ask']) if book['ask'] else None
+            quote['version'] += 1
+
+    # ===== 메시지 처리 =====
+
+    def _handle_message(self, raw):
+        try:
+            message = json.loads(raw)
+        except (ValueError, TypeError):
+            return
+
+        msg_type = message.get('type')
+        content = message.get('content') or {}
+        now = time.time()
+
+        self.stats['messages'] += 1
+        self.stats['last_message_at'] = now
+
+        updated = set()
+
+        try:
+            if msg_type == 'ticker':
+                coin = content['symbol'].split('_')[0]
+                self._update_quote(coin, now,
+                                   price=float(content['closePrice']),
+                                   volume=float(content.get('volume', 0)),
+                                   change_rate=float(content.get('chgRate', 0)))
+                updated.add(coin)
+
+            elif msg_type == 'transaction':
+                for trade in content.get('list', []):
+                    coin = trade['symbol'].split('_')[0]
+                    price = float(trade['contPrice'])
+                    self._update_quote(coin, now, price=price)
+                    updated.add(coin)
+                    for listener in self._trade_listeners:
+                        try:
+                            listener(coin, price, float(trade.get('contQty', 0)), now)
+                        except Exception as e:
+                            print(f"체결 리스너 오류: {str(e)}")
+
+            elif msg_type == 'orderbookdepth':
+                received_us = int(content.get('datetime') or 0)
+                for level in content.get('list', []):
+                    coin = level['symbol'].split('_')[0]
+                    side, price, quantity = level['orderType'], float(level['price']), float(level['quantity'])
+                    self._update_book(coin, side, price, quantity)
+                    if coin in self._pending:
+                        self._pending[coin].append((received_us, side, price, quantity))
+                    updated.add(coin)
+                for coin in updated:
+                    self._publish_book(coin, now)
+        except (KeyError, ValueError, TypeError):
+            return
+
+        if not updated:
+            return
+
+        with self._cond:
+            self._cond.notify_all()
+
+        for coin in updated:
+            quote = self.get_quote(coin)
+            for listener in list(self._listeners):
+                try:
+                    listener(coin, quote)
+                except Exception as e:
+                    print(f"시세 리스너 오류: {str(e)}")
+
+    def _update_quote(self, coin: str, now: float, **fields):
+        with self._cond:
+            quote = self._quotes.setdefault(coin, {'price': None, 'bid': None, 'ask': None,
+                                                   'volume': None, 'change_rate': None,
+                                                   'updated': None, 'version': 0})
+            for key, value in fields.items():
+                if value is not None:
+                    quote[key] = value
+            if fields.get('price') is not None:
+                quote['updated'] = now
+            quote['version'] += 1
+
+    def _update_book(self, coin: str, side: str, price: float, quantity: float):
+        book = self._books.setdefault(coin, {'bid': {}, 'ask': {}})
+        side = 'bid' if side == 'bid' else 'ask'
+        if quantity <= 0:
+            book[side].pop(price, None)
+            return
+
+        book[side][price] = quantity
+        # 새 호가와 교차하는 반대편 호가는 이미 체결/취소된 것 (제거 메시지를 놓친 경우)
+        opposite = book['ask' if side == 'bid' else 'bid']
+        crossed = [p for p in opposite if (p <= price if side == 'bid' else p >= price)]
+        for p in crossed:
+            del opposite[p]
+
+    # ===== 조회 =====
+
+    def add_listener(self, callback: Callable[[str, Dict], None]):
+        """틱마다 호출될 콜백 등록 - callback(coin, quote)"""
+        self._listeners.append(callback)
+
+    def add_trade_listener(self, callback: Callable[[str, float, float, float], None]):
+        """체결마다 호출될 콜백 등록 - callback(coin, price, quantity, 수신 시각)"""
+        self._trade_listeners.append(callback)
+
+    def get_quote(self, coin: str) -> Optional[Dict]:
+        with self._cond:
+            quote = self._quotes.get(coin)
+            return dict(quote) if quote else None
+
+    def get_price(self, coin: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        최신 체결가 조회
+
+        Args:
+            max_age: 이 시간(초)보다 오래된 가격이면 None 반환
+        """
+        quote = self.get_quote(coin)
+        if not quote or quote['price'] is None:
+            return None
+        if max_age is not None and time.time() - quote['updated'] > max_age:
+            return None
+        return quote['price']
+
+    def version(self, coin: str) -> int:
+        """코인별 갱신 횟수 (wait_for_update 기준값)"""
+        with self._cond:
+            quote = self._quotes.get(coin)
+            return quote['version'] if quote else 0
+
+    def wait_for_update(self, coin: str, since: int, timeout: float) -> int:
+        """
+        since 이후 새 틱이 올 때까지 대기
+
+        Returns:
+            현재 version (timeout이면 since와 같을 수 있음)
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                quote = self._quotes.get(coin)
+                current = quote['version'] if quote else 0
+                remaining = deadline - time.monotonic()
+                if current != since or remaining <= 0:
+                    return current
+                self._cond.wait(remaining)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import sys
+
+    from bithumb_api import BithumbAPI
+
+    # 사용법: python market_data_feed.py [WebSocket 주소] [REST 주소]
+    url = sys.argv[1] if len(sys.argv) > 1 else None
+    api = BithumbAPI('', '', base_url=sys.argv[2] if len(sys.argv) > 2 else None)
+    feed = BithumbWebSocketFeed(['BTC', 'XRP'], url=url, orderbook_snapshot=api.get_orderbook).start()
+
+    print("WebSocket 시세 수신 테스트 (Ctrl+C로 종료)\n")
+
+    try:
+        version = 0
+        while True:
+            version = feed.wait_for_update('XRP', version, timeout=5)
+            quote = feed.get_quote('XRP')
+            if quote and quote['price'] is not None:
+                print(f"\rXRP {quote['price']:,} KRW | 매수호가 {quote['bid']} | 매도호가 {quote['ask']} | "
+                      f"메시지 {feed.stats['messages']}개", end="", flush=True)
+    except KeyboardInterrupt:
+        feed.stop()
+        print("\n종료")
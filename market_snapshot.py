@@ -0,0 +1,208 @@
+"""
+전체 시세 컬럼형 스냅샷
+/public/ticker/ALL_KRW 응답을 한 번만 파싱하여
+코인 순서가 맞춰진 NumPy 배열(현재가/거래량/거래대금/변동률)로 보관합니다.
+"""
+
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class TickerSnapshot:
+    """
+    코인 N개의 시세 컬럼
+
+    coins: 코인 심볼 배열 (N,)
+    price, volume, value, change: float64 배열 (N,), 파싱 실패 값은 NaN
+    """
+
+    # 컬럼명 -> 빗썸 ticker 필드명
+    FIELDS = {
+        'price': 'closing_price',
+        'volume': 'units_traded_24H',
+        'value': 'acc_trade_value_24H',
+        'change': 'fluctate_rate_24H'
+    }
+
+    def __init__(self, coins: List[str], price: np.ndarray, volume: np.ndarray,
+                 value: np.ndarray, change: np.ndarray, timestamp: Optional[int] = None):
+        self.coin_list = coins
+        self.coins = np.array(coins, dtype=object)
+        self.price = price
+        self.volume = volume
+        self.value = value
+        self.change = change
+        self.timestamp = timestamp
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.coin_list)
+
+    @classmethod
+    def from_payload(cls, all_data: Dict) -> 'TickerSnapshot':
+        """ALL_KRW ticker 응답의 data 필드로 스냅샷 생성"""
+        coins = []
+        rows = []
+        for coin, coin_data in all_data.items():
+            if isinstance(coin_data, dict):
+                coins.append(coin)
+                rows.append(coin_data)
+
+        fields = list(cls.FIELDS.values())
+        getter = itemgetter(*fields)
+
+        try:
+            # 문자열 숫자를 한 번에 (N, 4) float64 배열로 변환
+            matrix = np.array([getter(row) for row in rows], dtype=np.float64)
+        except (KeyError, ValueError, TypeError):
+            # 필드 누락/잘못된 값이 있으면 해당 값만 NaN
+            matrix = np.array([[_to_float(row.get(field)) for field in fields] for row in rows],
+                              dtype=np.float64)
+
+        matrix = matrix.reshape(len(coins), len(fields))
+
+        timestamp = all_data.get('date')
+        try:
+            timestamp = int(timestamp) if timestamp else None
+        except (ValueError, TypeError):
+            timestamp = None
+
+        return cls(
+            coins,
+            matrix[:, 0].copy(), matrix[:, 1].copy(), matrix[:, 2].copy(), matrix[:, 3].copy(),
+            timestamp
+        )
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """코인 -> 행 번호"""
+        if self._index is None:
+            self._index = {coin: i for i, coin in enumerate(self.coin_list)}
+        return self._index
+
+    def mask_in(self, coins: Iterable[str]) -> np.ndarray:
+        """coins에 포함된 코인 마스크"""
+        return np.isin(self.coins, list(coins))
+
+    def row(self, i: int) -> Dict:
+        """i번째 코인을 스캐너 결과 dict 형식으로 변환"""
+        return {
+            'coin': self.coin_list[i],
+            'price': float(self.price[i]),
+            'volume_24h': float(self.volume[i]),
+            'price_change_24h': float(self.change[i]),
+            'trade_value_24h': float(self.value[i])
+        }
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+# 벤치마크
+if __name__ == "__main__":
+    import random
+    import time
+
+    from volume_scanner import VolumeScanner
+
+    class _PayloadSource:
+        """벤치마크용 시세 공급자 (VolumeScanner.api 자리에 사용)"""
+
+        def __init__(self, num_coins: int):
+            self.num_coins = num_coins
+            self.rng = random.Random(0)
+            self.base = [(f"C{i}", 10 ** self.rng.uniform(0, 5), self.rng.uniform(1e4, 1e8))
+                         for i in range(num_coins)]
+
+        def get_all_tickers(self, currency: str = "KRW") -> Dict:
+            data = {}
+            for coin, price, volume in self.base:
+                # 대부분은 소폭 변동, 약 1%만 거래량 급증
+                volume *= self.rng.uniform(0.99, 1.02) * (1.5 if self.rng.random() < 0.01 else 1.0)
+                data[coin] = {
+                    'closing_price': f"{price:.4f}",
+                    'units_traded_24H': f"{volume:.8f}",
+                    'acc_trade_value_24H': f"{volume * price:.4f}",
+                    'fluctate_rate_24H': f"{self.rng.uniform(-10, 10):.2f}"
+                }
+            data['date'] = str(int(time.time() * 1000))
+            return data
+
+    def legacy_scan(all_data: Dict, previous: Dict):
+        """기존 dict 순회 방식 (scan_altcoin_volume_surge + get_top_momentum_coins 각각 순회)"""
+        surge = []
+        for coin, coin_data in all_data.items():
+            if coin == 'date':
+                continue
+            try:
+                volume = float(coin_data.get('units_traded_24H', 0))
+                price = float(coin_data.get('closing_price', 0))
+                change = float(coin_data.get('fluctate_rate_24H', 0))
+                value = float(coin_data.get('acc_trade_value_24H', 0))
+                if value < 30000000 or volume < 100:
+                    continue
+                prev = previous.get(coin)
+                previous[coin] = volume
+                if prev and (volume - prev) / prev * 100 >= 20.0:
+                    surge.append({'coin': coin, 'price': price, 'volume_24h': volume,
+                                  'volume_change': (volume - prev) / prev * 100,
+                                  'price_change_24h': change, 'trade_value_24h': value})
+            except (ValueError, TypeError):
+                continue
+        surge.sort(key=lambda x: x['volume_change'], reverse=True)
+
+        momentum = []
+        for coin, coin_data in all_data.items():
+            if coin == 'date':
+                continue
+            try:
+                volume = float(coin_data.get('units_traded_24H', 0))
+                price = float(coin_data.get('closing_price', 0))
+                change = float(coin_data.get('fluctate_rate_24H', 0))
+                value = float(coin_data.get('acc_trade_value_24H', 0))
+                if value < 100000000:
+                    continue
+                momentum.append({'coin': coin, 'price': price, 'volume_24h': volume,
+                                 'price_change_24h': change, 'trade_value_24h': value,
+                                 'momentum_score': value / 1e9 * 0.4 + change * 0.6})
+            except (ValueError, TypeError):
+                continue
+        momentum.sort(key=lambda x: x['momentum_score'], reverse=True)
+        return surge, momentum[:5]
+
+    print("스캔 벤치마크 (스냅샷 1개당 평균: 급증 스캔 + 모멘텀 TOP5)")
+    print(f"{'코인 수':>8} | {'기존 방식':>10} | {'컬럼형 전체':>10} | {'파싱':>9} | {'벡터 스캔':>9} | {'배율':>5}")
+
+    for num_coins in (300, 3000, 30000):
+        source = _PayloadSource(num_coins)
+        payloads = [source.get_all_tickers() for _ in range(6)]
+        rounds = len(payloads)
+
+        previous = {}
+        start = time.perf_counter()
+        for payload in payloads:
+            legacy_scan(payload, previous)
+        legacy_ms = (time.perf_counter() - start) / rounds * 1000
+
+        start = time.perf_counter()
+        for payload in payloads:
+            TickerSnapshot.from_payload(payload)
+        parse_ms = (time.perf_counter() - start) / rounds * 1000
+
+        scanner = VolumeScanner(api=source)
+        scanner.excluded_coins = []
+        start = time.perf_counter()
+        for payload in payloads:
+            scanner.api.get_all_tickers = lambda currency="KRW", p=payload: p
+            scanner.scan_altcoin_volume_surge()
+            scanner.get_top_momentum_coins(top_n=5, altcoin_only=True)
+        columnar_ms = (time.perf_counter() - start) / rounds * 1000
+
+        print(f"{num_coins:>8,} | {legacy_ms:>8.2f}ms | {columnar_ms:>8.2f}ms | {parse_ms:>7.2f}ms | "
+              f"{columnar_ms - parse_ms:>7.2f}ms | {legacy_ms / columnar_ms:>4.1f}x")
@@ -0,0 +1,674 @@
+"""
+빗썸 REST API 로컬 대역 서버 (오프라인 벤치마크용)
+봇이 사용하는 공개/인증 엔드포인트를 흉내 내며,
+HMAC 서명 검증, 지연/오류 주입, 가상 호가창 체결을 지원합니다.
+
+실행:
+    python mock_bithumb_server.py --port 8765 --latency-ms 30 --error-rate 0.01
+
+봇 연결:
+    BITHUMB_BASE_URL=http://127.0.0.1:8765 python scalping_bot.py
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from bithumb_signer import BithumbSigner
+
+
+def _fmt(value: float) -> str:
+    """빗썸 응답처럼 숫자를 문자열로 변환"""
+    text = f"{value:.8f}".rstrip('0').rstrip('.')
+    return text if text else "0"
+
+
+def _tick_size(price: float) -> float:
+    """가격대별 호가 단위 (원화 마켓 기준 근사)"""
+    if price < 1:
+        return 0.0001
+    if price < 10:
+        return 0.001
+    if price < 100:
+        return 0.01
+    if price < 1000:
+        return 0.1
+    if price < 5000:
+        return 1
+    if price < 10000:
+        return 5
+    if price < 50000:
+        return 10
+    if price < 100000:
+        return 50
+    if price < 500000:
+        return 100
+    if price < 1000000:
+        return 500
+    return 1000
+
+
+class SyntheticMarket:
+    """
+    랜덤워크로 움직이는 가상 시장
+    일부 코인은 주기적으로 거래량 급증 구간에 들어갑니다.
+
+    Args:
+        num_coins: 생성할 코인 수 (실제 심볼 일부 + 가상 심볼)
+        volatility: 초당 가격 변동성 (표준편차 비율)
+        surge_probability: 초당 코인별 급증 구간 진입 확률
+        seed: 난수 시드
+        candle_history: 코인별로 보관할 1분봉 개수
+    """
+
+    BASE_COINS = {
+        'BTC': 95000000, 'ETH': 4500000, 'XRP': 3000, 'SOL': 250000, 'DOGE': 350,
+        'ADA': 1100, 'TRX': 300, 'LINK': 25000, 'SAND': 600, 'MANA': 700,
+        'AXS': 9000, 'CHZ': 120, 'ARB': 1200, 'SUI': 5000, 'SEI': 500
+    }
+
+    # 캔들 간격 (빗썸 chart_intervals -> 초)
+    CANDLE_INTERVALS = {'1m': 60, '3m': 180, '5m': 300, '10m': 600, '30m': 1800,
+                        '1h': 3600, '6h': 21600, '12h': 43200, '24h': 86400}
+
+    def __init__(self, num_coins: int = 200, volatility: float = 0.0008,
+                 surge_probability: float = 0.002, seed: Optional[int] = None,
+                 candle_history: int = 600):
+        self.rng = random.Random(seed)
+        self.volatility = volatility
+        self.surge_probability = surge_probability
+        self._lock = threading.RLock()
+
+        self.coins = {}
+        symbols = list(self.BASE_COINS.items())
+        i = 0
+        while len(symbols) < num_coins:
+            i += 1
+            symbols.append((f"MOCK{i}", 10 ** self.rng.uniform(0, 5)))
+
+        for symbol, price in symbols[:num_coins]:
+            units_24h = self.rng.uniform(1e4, 5e7) / max(price, 1) * 1000
+            self.coins[symbol] = {
+                'price': float(price),
+                'opening_price': float(price),
+                'prev_closing_price': float(price),
+                'min_price': float(price),
+                'max_price': float(price),
+                'units_traded_24H': units_24h,
+                'acc_trade_value_24H': units_24h * price,
+                'units_traded': units_24h / 2,
+                'acc_trade_value': units_24h * price / 2,
+                'surge_until': 0.0
+            }
+            self.coins[symbol]['bars'] = self._backfill_bars(float(price), units_24h, candle_history)
+
+        self.updated = time.time()
+
+    def _backfill_bars(self, price: float, units_24h: float, count: int) -> deque:
+        """현재가로 끝나는 과거 1분봉 생성 ([시각(ms), 시가, 종가, 고가, 저가, 거래량])"""
+        bars = deque(maxlen=count)
+        minute = int(time.time() // 60) * 60
+        sigma = self.volatility * math.sqrt(60)
+        close = price
+
+        history = []
+        for i in range(count):
+            open_ = close * math.exp(-self.rng.gauss(0, sigma))
+            high = max(open_, close) * (1 + abs(self.rng.gauss(0, sigma / 2)))
+            low = min(open_, close) * (1 - abs(self.rng.gauss(0, sigma / 2)))
+            volume = units_24h / 1440 * self.rng.uniform(0.5, 1.5)
+            history.append([(minute - i * 60) * 1000, open_, close, high, low, volume])
+            close = open_
+
+        # 마지막 봉은 현재 분 (step에서 이어서 갱신)
+        history[0][1:5] = [price, price, price, price]
+        history[0][5] = 0.0
+        bars.extend(reversed(history))
+        return bars
+
+    def step(self, now: Optional[float] = None):
+        """마지막 갱신 이후 경과 시간만큼 시장을 진행"""
+        now = now or time.time()
+
+        with self._lock:
+            dt = now - self.updated
+            if dt < 0.05:
+                return
+            dt = min(dt, 60.0)
+            self.updated = now
+
+            sigma = self.volatility * math.sqrt(dt)
+            for state in self.coins.values():
+                surging = state['surge_until'] > now
+                if not surging and self.rng.random() < self.surge_probability * dt:
+                    state['surge_until'] = now + self.rng.uniform(30, 180)
+                    surging = True
+
+                drift = 0.0005 * dt if surging else 0.0
+                shock = self.rng.gauss(drift, sigma * (3 if surging else 1))
+                price = max(state['price'] * math.exp(shock), 0.0001)
+                state['price'] = price
+                state['min_price'] = min(state['min_price'], price)
+                state['max_price'] = max(state['max_price'], price)
+
+                # 평소 24시간 거래량의 1/86400 수준, 급증 구간은 수십 배
+                base_rate = state['units_traded_24H'] / 86400
+                traded = base_rate * dt * self.rng.uniform(0.5, 1.5) * (40 if surging else 1)
+                state['units_traded_24H'] += traded
+                state['acc_trade_value_24H'] += traded * price
+                state['units_traded'] += traded
+                state['acc_trade_value'] += traded * price
+
+                # 1분봉 갱신
+                bars = state['bars']
+                minute_ms = int(now // 60) * 60000
+                if bars[-1][0] != minute_ms:
+                    bars.append([minute_ms, price, price, price, price, 0.0])
+                bar = bars[-1]
+                bar[2] = price
+                bar[3] = max(bar[3], price)
+                bar[4] = min(bar[4], price)
+                bar[5] += traded
+
+    def has_coin(self, coin: str) -> bool:
+        return coin in self.coins
+
+    def ticker(self, coin: str) -> Dict:
+        """단일 코인 시세 (빗썸 ticker 응답 형식)"""
+        with self._lock:
+            state = self.coins[coin]
+            change = state['price'] - state['prev_closing_price']
+            return {
+                'opening_price': _fmt(state['opening_price']),
+                'closing_price': _fmt(state['price']),
+                'min_price': _fmt(state['min_price']),
+                'max_price': _fmt(state['max_price']),
+                'units_traded': _fmt(state['units_traded']),
+                'acc_trade_value': _fmt(state['acc_trade_value']),
+                'prev_closing_price': _fmt(state['prev_closing_price']),
+                'units_traded_24H': _fmt(state['units_traded_24H']),
+                'acc_trade_value_24H': _fmt(state['acc_trade_value_24H']),
+                'fluctate_24H': _fmt(change),
+                'fluctate_rate_24H': f"{change / state['prev_closing_price'] * 100:.2f}"
+            }
+
+    def all_tickers(self) -> Dict:
+        with self._lock:
+            data = {coin: self.ticker(coin) for coin in self.coins}
+        data['date'] = str(int(time.time() * 1000))
+        return data
+
+    def _book_levels(self, coin: str, count: int) -> Tuple[List[Dict], List[Dict]]:
+        """현재가 주변의 가상 호가 (매 호출마다 수량이 약간씩 달라짐)"""
+        state = self.coins[coin]
+        price = state['price']
+        tick = _tick_size(price)
+        best_ask = math.floor(price / tick) * tick + tick
+        best_bid = best_ask - tick
+
+        # 호가당 평균 수량: 24시간 거래량의 약 0.05%
+        base_qty = max(state['units_traded_24H'] * 0.0005, 0.0001)
+        bids, asks = [], []
+        for i in range(count):
+            bids.append({'price': _fmt(best_bid - i * tick),
+                         'quantity': _fmt(base_qty * self.rng.uniform(0.3, 2.0) * (1 + i * 0.2))})
+            asks.append({'price': _fmt(best_ask + i * tick),
+                         'quantity': _fmt(base_qty * self.rng.uniform(0.3, 2.0) * (1 + i * 0.2))})
+        return bids, asks
+
+    def orderbook(self, coin: str, count: int = 30) -> Dict:
+        with self._lock:
+            bids, asks = self._book_levels(coin, count)
+            timestamp = str(int(time.time() * 1000))  # 호가를 읽은 시각 (시장 진행과 같은 잠금 안에서)
+        return {
+            'timestamp': timestamp,
+            'payment_currency': 'KRW',
+            'order_currency': coin,
+            'bids': bids,
+            'asks': asks
+        }
+
+    def all_orderbooks(self, count: int = 5) -> Dict:
+        data = {'timestamp': str(int(time.time() * 1000)), 'payment_currency': 'KRW'}
+        with self._lock:
+            for coin in self.coins:
+                bids, asks = self._book_levels(coin, count)
+                data[coin] = {'order_currency': coin, 'bids': bids, 'asks': asks}
+        return data
+
+    def candles(self, coin: str, interval: str = '1m') -> List[List]:
+        """캔들 (빗썸 candlestick 응답 형식 - 1분봉을 interval 단위로 합침)"""
+        bucket_ms = self.CANDLE_INTERVALS[interval] * 1000
+        with self._lock:
+            bars = [list(bar) for bar in self.coins[coin]['bars']]
+
+        merged = []
+        for ts, open_, close, high, low, volume in bars:
+            start = ts // bucket_ms * bucket_ms
+            if merged and merged[-1][0] == start:
+                last = merged[-1]
+                last[2] = close
+                last[3] = max(last[3], high)
+                last[4] = min(last[4], low)
+                last[5] += volume
+            else:
+                merged.append([start, open_, close, high, low, volume])
+
+        return [[ts] + [_fmt(value) for value in rest] for ts, *rest in merged]
+
+    def fill(self, coin: str, side: str, units: float, limit_price: Optional[float] = None) -> List[Dict]:
+        """
+        호가를 따라 내려가며 체결 수량 계산 (시장 상태는 apply_fills에서 반영)
+        시장가는 가상 호가가 부족하면 마지막 호가 가격으로 나머지를 체결하고,
+        지정가는 즉시 체결 가능한 수량만 체결합니다 (IOC).
+
+        Returns:
+            [{'units': 체결 수량, 'price': 체결가}, ...]
+        """
+        with self._lock:
+            bids, asks = self._book_levels(coin, 30)
+            levels = asks if side == 'bid' else bids
+
+            fills = []
+            remaining = units
+            for level in levels:
+                if remaining <= 0:
+                    break
+                price = float(level['price'])
+                if limit_price is not None:
+                    if side == 'bid' and price > limit_price:
+                        break
+                    if side == 'ask' and price < limit_price:
+                        break
+                qty = min(remaining, float(level['quantity']))
+                fills.append({'units': qty, 'price': price})
+                remaining -= qty
+
+            if remaining > 0 and limit_price is None:
+                fills.append({'units': remaining, 'price': float(levels[-1]['price'])})
+
+            return fills
+
+    def apply_fills(self, coin: str, fills: List[Dict]):
+        """체결 결과를 현재가/거래량에 반영"""
+        if not fills:
+            return
+
+        with self._lock:
+            state = self.coins[coin]
+            state['price'] = fills[-1]['price']
+            for f in fills:
+                state['units_traded_24H'] += f['units']
+                state['acc_trade_value_24H'] += f['units'] * f['price']
+
+
+class MockExchange:
+    """
+    계정/잔고/주문 처리와 서명 검증
+
+    Args:
+        market: 가상 시장
+        api_keys: {api_key: secret_key}
+        initial_krw: 계정별 초기 원화 잔고
+        fee_rate: 체결 수수료율
+        verify_signatures: False이면 서명 검증 생략
+    """
+
+    def __init__(self, market: SyntheticMarket, api_keys: Optional[Dict[str, str]] = None,
+                 initial_krw: float = 100000000, fee_rate: float = 0.0004,
+                 verify_signatures: bool = True):
+        self.market = market
+        self.api_keys = api_keys or {'mock-key': 'mock-secret'}
+        self.signers = {key: BithumbSigner(secret) for key, secret in self.api_keys.items()}
+        self.fee_rate = fee_rate
+        self.verify_signatures = verify_signatures
+
+        self._lock = threading.Lock()
+        self.balances = {key: {'KRW': float(initial_krw)} for key in self.api_keys}
+        self.last_nonce = {}
+        self.order_seq = 0
+
+    def authenticate(self, endpoint: str, headers, raw_body: str) -> Optional[Tuple[str, str]]:
+        """
+        서명 검증
+
+        Returns:
+            실패 시 (status, message), 성공 시 None
+        """
+        api_key = headers.get('Api-Key', '')
+        signature = headers.get('Api-Sign', '')
+        nonce = headers.get('Api-Nonce', '')
+
+        if api_key not in self.signers:
+            return '5300', 'Invalid Apikey'
+
+        if not self.verify_signatures:
+            return None
+
+        # BithumbAPI는 endpoint를 서명에만 넣고, pybithumb은 본문에도 넣어서 전송
+        form = urllib.parse.parse_qs(raw_body, keep_blank_values=True)
+        if 'endpoint' in form:
+            params_str = raw_body
+        else:
+            prefix = urllib.parse.urlencode({'endpoint': endpoint})
+            params_str = prefix + '&' + raw_body if raw_body else prefix
+
+        expected = self.signers[api_key].sign_string(endpoint, params_str, nonce)
+        if signature != expected:
+            return '5300', 'Invalid Signature'
+
+        with self._lock:
+            try:
+                nonce_value = int(nonce)
+            except ValueError:
+                return '5100', 'Bad Request.(Nonce)'
+            if nonce_value <= self.last_nonce.get(api_key, 0):
+                return '5100', 'Bad Request.(Nonce)'
+            self.last_nonce[api_key] = nonce_value
+
+        return None
+
+    def balance(self, api_key: str, currency: str) -> Dict:
+        with self._lock:
+            wallet = self.balances[api_key]
+            currencies = list(self.market.coins) if currency == 'ALL' else [currency]
+
+            data = {
+                'total_krw': _fmt(wallet.get('KRW', 0.0)),
+                'in_use_krw': '0',
+                'available_krw': _fmt(wallet.get('KRW', 0.0))
+            }
+            for coin in currencies:
+                key = coin.lower()
+                amount = wallet.get(coin, 0.0)
+                data[f'total_{key}'] = _fmt(amount)
+                data[f'in_use_{key}'] = '0'
+                data[f'available_{key}'] = _fmt(amount)
+                if self.market.has_coin(coin):
+                    data[f'xcoin_last_{key}'] = self.market.ticker(coin)['closing_price']
+            return data
+
+    def execute(self, api_key: str, coin: str, side: str, units: float,
+                limit_price: Optional[float] = None) -> Tuple[str, Dict]:
+        """
+        주문 체결 후 잔고 반영
+
+        Returns:
+            (status, 응답 본문)
+        """
+        if units <= 0:
+            return '5500', {'message': 'Invalid Parameter'}
+
+        with self._lock:
+            wallet = self.balances[api_key]
+            fills = self.market.fill(coin, side, units, limit_price)
+            total = sum(f['units'] * f['price'] for f in fills)
+            filled_units = sum(f['units'] for f in fills)
+            fee = total * self.fee_rate
+
+            if side == 'bid':
+                if wallet.get('KRW', 0.0) < total + fee:
+                    return '5600', {'message': '주문가능 금액이 부족합니다.'}
+                wallet['KRW'] = wallet.get('KRW', 0.0) - total - fee
+                wallet[coin] = wallet.get(coin, 0.0) + filled_units
+            else:
+                if wallet.get(coin, 0.0) + 1e-12 < units:
+                    return '5600', {'message': '주문량이 사용가능 수량을 초과하였습니다.'}
+                wallet[coin] = wallet.get(coin, 0.0) - filled_units
+                wallet['KRW'] = wallet.get('KRW', 0.0) + total - fee
+
+            self.market.apply_fills(coin, fills)
+
+            self.order_seq += 1
+            order_id = f"C0101000{int(time.time() * 1000)}{self.order_seq:04d}"
+
+        return '0000', {
+            'order_id': order_id,
+            'data': [
+                {
+                    'cont_id': f"{order_id}-{i}",
+                    'units': _fmt(f['units']),
+                    'price': _fmt(f['price']),
+                    'total': _fmt(f['units'] * f['price']),
+                    'fee': _fmt(f['units'] * f['price'] * self.fee_rate)
+                }
+                for i, f in enumerate(fills)
+            ]
+        }
+
+
+class MockBithumbServer:
+    """
+    로컬 HTTP 서버 (keep-alive 지원)
+
+    Args:
+        exchange: 주문/잔고 처리기
+        host, port: 바인딩 주소 (port=0이면 임의 포트)
+        latency_ms: 응답 지연 평균 (ms)
+        jitter_ms: 응답 지연 편차 (±ms, 균등분포)
+        error_rate: JSON 오류 응답(status 5900) 비율
+        http_error_rate: HTTP 503 응답 비율
+    """
+
+    def __init__(self, exchange: Optional[MockExchange] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, http_error_rate: float = 0.0):
+        self.exchange = exchange or MockExchange(SyntheticMarket())
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'injected_errors': 0, 'auth_failures': 0, 'by_path': {}}
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockBithumbServer':
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key: str, path: str = None):
+        with self._stats_lock:
+            self.stats[key] += 1
+            if path is not None:
+                group = '/'.join(path.split('/')[:3])
+                self.stats['by_path'][group] = self.stats['by_path'].get(group, 0) + 1
+
+    def _route_public(self, path: str, query: Dict) -> Tuple[int, Dict]:
+        market = self.exchange.market
+        market.step()
+        parts = path.strip('/').split('/')
+
+        if len(parts) >= 3 and parts[0] == 'public' and parts[1] in ('ticker', 'orderbook'):
+            pair = parts[2].upper()
+            coin = pair.split('_')[0]
+
+            if parts[1] == 'ticker':
+                if coin == 'ALL':
+                    return 200, {'status': '0000', 'data': market.all_tickers()}
+                if market.has_coin(coin):
+                    return 200, {'status': '0000', 'data': market.ticker(coin)}
+            else:
+                count = int(query.get('count', ['30'])[0])
+                if coin == 'ALL':
+                    return 200, {'status': '0000', 'data': market.all_orderbooks(min(count, 5))}
+                if market.has_coin(coin):
+                    return 200, {'status': '0000', 'data': market.orderbook(coin, count)}
+
+            return 200, {'status': '5500', 'message': 'Invalid Parameter'}
+
+        if len(parts) >= 3 and parts[0] == 'public' and parts[1] == 'candlestick':
+            coin = parts[2].upper().split('_')[0]
+            interval = parts[3] if len(parts) >= 4 else '24h'
+            if market.has_coin(coin) and interval in market.CANDLE_INTERVALS:
+                return 200, {'status': '0000', 'data': market.candles(coin, interval)}
+            return 200, {'status': '5500', 'message': 'Invalid Parameter'}
+
+        return 404, {'status': '5302', 'message': 'Method Not Allowed'}
+
+    def _route_private(self, path: str, headers, raw_body: str) -> Tuple[int, Dict]:
+        exchange = self.exchange
+        exchange.market.step()
+
+        auth_error = exchange.authenticate(path, headers, raw_body)
+        if auth_error:
+            self._count('auth_failures')
+            return 200, {'status': auth_error[0], 'message': auth_error[1]}
+
+        api_key = headers.get('Api-Key')
+        form = {k: v[0] for k, v in urllib.parse.parse_qs(raw_body, keep_blank_values=True).items()}
+        coin = form.get('order_currency', form.get('currency', 'BTC')).upper()
+
+        if path == '/info/balance':
+            return 200, {'status': '0000', 'data': exchange.balance(api_key, coin)}
+
+        if coin != 'ALL' and not exchange.market.has_coin(coin):
+            return 200, {'status': '5500', 'message': 'Invalid Parameter'}
+
+        try:
+            units = float(form.get('units', 0))
+            price = float(form['price']) if form.get('price') else None
+        except ValueError:
+            return 200, {'status': '5500', 'message': 'Invalid Parameter'}
+
+        if path == '/trade/market_buy':
+            status, body = exchange.execute(api_key, coin, 'bid', units)
+        elif path == '/trade/market_sell':
+            status, body = exchange.execute(api_key, coin, 'ask', units)
+        elif path == '/trade/place':
+            side = form.get('type', 'bid')
+            status, body = exchange.execute(api_key, coin, side, units, limit_price=price)
+        else:
+            return 404, {'status': '5302', 'message': 'Method Not Allowed'}
+
+        body['status'] = status
+        return 200, body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code: int, body: Dict):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _inject(self) -> bool:
+                """지연/오류 주입 - 오류 응답을 보냈으면 True"""
+                delay = server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+
+                roll = random.random()
+                if roll < server.http_error_rate:
+                    server._count('injected_errors')
+                    self._send(503, {'status': '5900', 'message': 'Service Unavailable'})
+                    return True
+                if roll < server.http_error_rate + server.error_rate:
+                    server._count('injected_errors')
+                    self._send(200, {'status': '5900', 'message': 'Unknown Error'})
+                    return True
+                return False
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                server._count('requests', parsed.path)
+
+                if parsed.path == '/mock/stats':
+                    with server._stats_lock:
+                        self._send(200, json.loads(json.dumps(server.stats)))
+                    return
+
+                if self._inject():
+                    return
+
+                code, body = server._route_public(parsed.path, urllib.parse.parse_qs(parsed.query))
+                self._send(code, body)
+
+            def do_POST(self):
+                parsed = urllib.parse.urlparse(self.path)
+                server._count('requests', parsed.path)
+
+                length = int(self.headers.get('Content-Length', 0))
+                raw_body = self.rfile.read(length).decode('utf-8') if length else ''
+
+                if self._inject():
+                    return
+
+                code, body = server._route_private(parsed.path, self.headers, raw_body)
+                self._send(code, body)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="빗썸 REST API 로컬 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--coins', type=int, default=200, help="가상 코인 수")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="평균 응답 지연 (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="응답 지연 편차 (±ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="JSON 오류 응답 비율")
+    parser.add_argument('--http-error-rate', type=float, default=0.0, help="HTTP 503 응답 비율")
+    parser.add_argument('--api-key', default='mock-key')
+    parser.add_argument('--secret-key', default='mock-secret')
+    parser.add_argument('--initial-krw', type=float, default=100000000)
+    parser.add_argument('--no-verify', action='store_true', help="서명 검증 생략")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    market = SyntheticMarket(num_coins=args.coins, seed=args.seed)
+    exchange = MockExchange(
+        market,
+        api_keys={args.api_key: args.secret_key},
+        initial_krw=args.initial_krw,
+        verify_signatures=not args.no_verify
+    )
+    server = MockBithumbServer(
+        exchange, host=args.host, port=args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, http_error_rate=args.http_error_rate
+    )
+
+    print("=" * 60)
+    print(f"빗썸 대역 서버 실행: {server.url}")
+    print(f"코인 {args.coins}개 | 지연 {args.latency_ms}±{args.jitter_ms}ms | "
+          f"오류 {args.error_rate:.1%} / HTTP 오류 {args.http_error_rate:.1%}")
+    print(f"API 키: {args.api_key} / {args.secret_key}")
+    print("=" * 60)
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+        server.httpd.server_close()
@@ -0,0 +1,189 @@
+"""
+빗썸 WebSocket 로컬 대역 서버 (오프라인 테스트용)
+mock_bithumb_server.py의 가상 시장을 공유하여
+ticker/transaction/orderbookdepth 메시지를 빗썸과 같은 형식으로 전송합니다.
+
+실행:
+    python mock_bithumb_ws.py --port 8766 --rest-port 8765 --interval-ms 100
+
+봇 연결:
+    BITHUMB_BASE_URL=http://127.0.0.1:8765 BITHUMB_WS_URL=ws://127.0.0.1:8766 python scalping_bot_v2.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Optional
+
+import websockets
+
+from mock_bithumb_server import MockBithumbServer, MockExchange, SyntheticMarket, _fmt
+
+
+class MockBithumbWebSocket:
+    """
+    가상 시장 시세를 WebSocket으로 방송
+
+    Args:
+        market: 가상 시장 (REST 대역 서버와 공유 가능)
+        interval_ms: 메시지 전송 주기 (ms)
+        disconnect_every: 이 시간(초)마다 연결을 강제로 끊음 (재연결 테스트용, 0이면 사용 안 함)
+    """
+
+    def __init__(self, market: SyntheticMarket, host: str = '127.0.0.1', port: int = 8766,
+                 interval_ms: float = 100.0, disconnect_every: float = 0.0):
+        self.market = market
+        self.host = host
+        self.port = port
+        self.interval = interval_ms / 1000
+        self.disconnect_every = disconnect_every
+        self.rng = random.Random()
+
+    def _ticker_message(self, pair: str, tick_type: str) -> dict:
+        coin = pair.split('_')[0]
+        ticker = self.market.ticker(coin)
+        now = datetime.now()
+        return {
+            'type': 'ticker',
+            'content': {
+                'symbol': pair,
+                'tickType': tick_type,
+                'date': now.strftime('%Y%m%d'),
+                'time': now.strftime('%H%M%S'),
+                'openPrice': ticker['opening_price'],
+                'closePrice': ticker['closing_price'],
+                'lowPrice': ticker['min_price'],
+                'highPrice': ticker['max_price'],
+                'value': ticker['acc_trade_value'],
+                'volume': ticker['units_traded'],
+                'prevClosePrice': ticker['prev_closing_price'],
+                'chgRate': ticker['fluctate_rate_24H'],
+                'chgAmt': ticker['fluctate_24H']
+            }
+        }
+
+    def _transaction_message(self, pairs) -> dict:
+        trades = []
+        for pair in pairs:
+            coin = pair.split('_')[0]
+            price = float(self.market.ticker(coin)['closing_price'])
+            qty = self.rng.uniform(0.1, 100)
+            trades.append({
+                'symbol': pair,
+                'buySellGb': self.rng.choice(['1', '2']),
+                'contPrice': _fmt(price),
+                'contQty': _fmt(qty),
+                'contAmt': _fmt(price * qty),
+                'contDtm': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'),
+                'updn': self.rng.choice(['up', 'dn'])
+            })
+        return {'type': 'transaction', 'content': {'list': trades}}
+
+    def _orderbook_message(self, pair: str, sent: dict) -> dict:
+        """
+        호가 변경분 (REST 호가와 같은 깊이, 빗썸처럼 바뀐 호가만 보내고 사라진 호가는 수량 0으로 전송)
+        datetime은 호가를 읽은 시각 (REST 스냅샷 timestamp와 비교해 스냅샷 이후 변경분만 적용할 수 있도록)
+
+        Args:
+            sent: 연결별로 지금까지 보낸 호가 (pair -> {(side, price): quantity}), 이번 전송분으로 갱신
+        """
+        book = self.market.orderbook(pair.split('_')[0])
+        current = {(side, level['price']): level['quantity']
+                   for side, key in (('bid', 'bids'), ('ask', 'asks')) for level in book[key]}
+        previous = sent.get(pair, {})
+
+        levels = []
+        for (side, price), quantity in current.items():
+            if previous.get((side, price)) != quantity:
+                levels.append({'symbol': pair, 'orderType': side, 'price': price,
+                               'quantity': quantity, 'total': '1'})
+        for side, price in sorted(previous.keys() - current.keys()):
+            levels.append({'symbol': pair, 'orderType': side, 'price': price, 'quantity': '0', 'total': '0'})
+        sent[pair] = current
+
+        return {'type': 'orderbookdepth',
+                'content': {'list': levels, 'datetime': str(int(book['timestamp']) * 1000)}}
+
+    async def _handler(self, websocket):
+        subscriptions = {}  # type -> {'symbols': [...], 'tickType': '30M'}
+        connected_at = time.monotonic()
+        book_sent = {}      # pair -> {(side, price): quantity} - 변경분/사라진 호가 제거 메시지용
+
+        await websocket.send(json.dumps({'status': '0000', 'resmsg': 'Connected Successfully'}))
+
+        async def receive():
+            async for raw in websocket:
+                try:
+                    request = json.loads(raw)
+                    subscriptions[request['type']] = {
+                        'symbols': [s for s in request['symbols'] if self.market.has_coin(s.split('_')[0])],
+                        'tickType': (request.get('tickTypes') or ['30M'])[0]
+                    }
+                    await websocket.send(json.dumps({'status': '0000', 'resmsg': 'Filter Registered Successfully'}))
+                except (ValueError, KeyError, TypeError):
+                    await websocket.send(json.dumps({'status': '5100', 'resmsg': 'Invalid Filter Syntax'}))
+
+        receiver = asyncio.ensure_future(receive())
+
+        try:
+            while not receiver.done():
+                await asyncio.sleep(self.interval)
+                self.market.step()
+
+                if self.disconnect_every and time.monotonic() - connected_at > self.disconnect_every:
+                    await websocket.close()
+                    break
+
+                for msg_type, sub in list(subscriptions.items()):
+                    if not sub['symbols']:
+                        continue
+                    if msg_type == 'ticker':
+                        for pair in sub['symbols']:
+                            await websocket.send(json.dumps(self._ticker_message(pair, sub['tickType'])))
+                    elif msg_type == 'transaction':
+                        await websocket.send(json.dumps(self._transaction_message(sub['symbols'])))
+                    elif msg_type == 'orderbookdepth':
+                        for pair in sub['symbols']:
+                            await websocket.send(json.dumps(self._orderbook_message(pair, book_sent)))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            receiver.cancel()
+
+    async def serve_forever(self):
+        async with websockets.serve(self._handler, self.host, self.port):
+            await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="빗썸 WebSocket 로컬 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rest-port', type=int, default=0, help="같은 가상 시장으로 REST 대역 서버도 실행 (0이면 생략)")
+    parser.add_argument('--coins', type=int, default=200)
+    parser.add_argument('--interval-ms', type=float, default=100.0, help="메시지 전송 주기 (ms)")
+    parser.add_argument('--disconnect-every', type=float, default=0.0, help="강제 연결 종료 주기 (초)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    market = SyntheticMarket(num_coins=args.coins, seed=args.seed)
+
+    rest_server: Optional[MockBithumbServer] = None
+    if args.rest_port:
+        rest_server = MockBithumbServer(MockExchange(market), host=args.host, port=args.rest_port).start()
+
+    print("=" * 60)
+    print(f"빗썸 WebSocket 대역 서버 실행: ws://{args.host}:{args.port}")
+    if rest_server:
+        print(f"REST 대역 서버 실행: {rest_server.url}")
+    print("=" * 60)
+
+    ws_server = MockBithumbWebSocket(market, host=args.host, port=args.port,
+                                     interval_ms=args.interval_ms, disconnect_every=args.disconnect_every)
+    try:
+        asyncio.run(ws_server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n서버 종료")
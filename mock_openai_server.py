@@ -0,0 +1,447 @@
+"""
+OpenAI Chat Completions 로컬 대역 서버 (판단 경로 오프라인 벤치마크/부하 테스트용)
+ScalpingAnalyzer / GPTAnalyzer가 기대하는 JSON을 규칙 기반(또는 스크립트)으로 만들어 응답하며,
+응답 지연 분포, 형식 오류/타임아웃/HTTP 오류 비율, 스트리밍(SSE)을 지원합니다.
+
+실행:
+    python mock_openai_server.py --port 8766 --latency lognormal:900,0.5 --malformed-rate 0.05 --timeout-rate 0.02
+
+봇 연결 (openai 패키지가 OPENAI_BASE_URL을 그대로 사용, 키는 아무 값):
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=mock \\
+    BITHUMB_BASE_URL=http://127.0.0.1:8765 python scalping_bot_v2.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import fallback_ranker
+from prompt_builder import COLUMNS, estimate_tokens
+
+# 후보 표 열 중 단위를 바꿔 넣은 열 (억원, 만원)
+_COLUMN_SCALE = {'val': 100000000, 'bid': 10000, 'ask': 10000}
+_COLUMN_KEYS = {name: key for name, key, _ in COLUMNS}
+
+MALFORMED_KINDS = ('truncated', 'prose', 'invalid')
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    응답 지연 분포 (ms) 해석
+
+    fixed:800 | uniform:300,1500 | normal:1200,300 (평균, 표준편차) | lognormal:900,0.5 (중앙값, 로그 표준편차)
+    """
+    kind, _, args = spec.partition(':')
+    values = [float(v) for v in args.split(',') if v.strip()] if args else []
+
+    if kind == 'fixed':
+        return lambda: values[0] if values else 0.0
+    if kind == 'uniform':
+        return lambda: random.uniform(values[0], values[1])
+    if kind == 'normal':
+        return lambda: max(random.gauss(values[0], values[1]), 0.0)
+    if kind == 'lognormal':
+        return lambda: random.lognormvariate(0.0, values[1]) * values[0]
+    raise ValueError(f"지원하지 않는 지연 분포: {spec}")
+
+
+# ===== 프롬프트 해석 =====
+
+def _number(text: str) -> Optional[float]:
+    try:
+        return float(text.replace(',', ''))
+    except ValueError:
+        return None
+
+
+def parse_candidate_table(text: str) -> List[Dict]:
+    """compact 후보 표 ('|' 구분, 첫 줄 열 이름) -> 후보 리스트"""
+    lines = [line for line in text.splitlines() if '|' in line]
+    if not lines or not lines[0].startswith('coin|'):
+        return []
+
+    names = lines[0].split('|')
+    candidates = []
+    for line in lines[1:]:
+        cells = line.split('|')
+        coin_info = {'coin': cells[0]}
+        for name, cell in zip(names[1:], cells[1:]):
+            value = None if cell == '-' else _number(cell)
+            if name in _COLUMN_KEYS and value is not None:
+                coin_info[_COLUMN_KEYS[name]] = value * _COLUMN_SCALE.get(name, 1)
+        candidates.append(coin_info)
+    return candidates
+
+
+_VERBOSE_PATTERNS = {
+    'price_change_24h': re.compile(r"24시간 가격 변동: ([+-]?[\d.,]+)%"),
+    'volume_change': re.compile(r"거래량 증가율: ([+-]?[\d.,]+)%"),
+    'surge_zscore': re.compile(r"평소 대비 거래량 급증: z-score ([+-]?[\d.]+)"),
+    'trade_value_24h': re.compile(r"24시간 거래대금: ([\d,]+)억원")
+}
+
+
+def parse_candidate_blocks(text: str) -> List[Dict]:
+    """verbose 후보 목록 ('[후보 N] 코인' 블록) -> 후보 리스트"""
+    candidates = []
+    for block in re.split(r"\[후보 \d+\] ", text)[1:]:
+        coin_info = {'coin': block.split()[0]}
+        for key, pattern in _VERBOSE_PATTERNS.items():
+            match = pattern.search(block)
+            if match:
+                coin_info[key] = _number(match.group(1))
+        if 'trade_value_24h' in coin_info:
+            coin_info['trade_value_24h'] *= 100000000
+        candidates.append(coin_info)
+    return candidates
+
+
+def parse_market(text: str) -> Dict[str, float]:
+    """GPTAnalyzer 시장 데이터 (compact 'key=value' 또는 verbose) -> {'chg24', 'hold'}"""
+    fields = {key: _number(value) for key, value in re.findall(r"(\w+)=([^\s]+)", text)}
+    if 'chg24' not in fields:
+        match = re.search(r"전일 대비: ([+-]?[\d.]+)%", text)
+        fields['chg24'] = _number(match.group(1)) if match else None
+        match = re.search(r"보유 BTC: ([\d.]+)", text)
+        fields['hold'] = _number(match.group(1)) if match else None
+    return fields
+
+
+# ===== 응답 생성 =====
+
+class Responder:
+    """
+    요청 메시지 -> 응답 내용
+
+    시스템 프롬프트의 JSON 형식으로 요청 종류를 구분합니다.
+    - scalping ("selected_coin"): 같은 후보로 fallback_ranker 추천 (필드 순서는 프롬프트 형식대로, reason 마지막)
+    - market ("decision"): 24시간 변동률/보유 여부로 buy/sell/hold
+    - other: 짧은 한국어 답변 (test_api.py 등)
+
+    Args:
+        script: 규칙 대신 순서대로 돌려 쓸 응답 (문자열은 그대로, dict는 JSON으로)
+    """
+
+    def __init__(self, script: Optional[List] = None):
+        self.script = script or []
+        self._script_index = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def kind(messages: List[Dict]) -> str:
+        system = " ".join(m.get('content') or '' for m in messages if m.get('role') == 'system')
+        if '"selected_coin"' in system:
+            return 'scalping'
+        if '"decision"' in system:
+            return 'market'
+        return 'other'
+
+    def respond(self, messages: List[Dict]) -> Tuple[str, str]:
+        """(요청 종류, 응답 내용)"""
+        kind = self.kind(messages)
+        if self.script:
+            with self._lock:
+                item = self.script[self._script_index % len(self.script)]
+                self._script_index += 1
+            return kind, item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+
+        user = "\n".join(m.get('content') or '' for m in messages if m.get('role') == 'user')
+        if kind == 'scalping':
+            return kind, self._scalping(user)
+        if kind == 'market':
+            return kind, self._market(user)
+        return kind, "안녕하세요! 로컬 대역 서버입니다."
+
+    @staticmethod
+    def _scalping(user: str) -> str:
+        candidates = parse_candidate_table(user) or parse_candidate_blocks(user)
+        result = fallback_ranker.recommend(candidates)
+        if result is None:
+            return "후보 코인 정보를 찾을 수 없습니다."
+        ordered = {key: result[key] for key in ('selected_coin', 'entry_timing', 'confidence', 'risk_level', 'reason')}
+        ordered['reason'] = ordered['reason'].replace('규칙 기반 선택', '대역 서버 선택')
+        return "```json\n" + json.dumps(ordered, ensure_ascii=False, indent=2) + "\n```"
+
+    @staticmethod
+    def _market(user: str) -> str:
+        fields = parse_market(user)
+        change = fields.get('chg24') or 0.0
+        holding = (fields.get('hold') or 0.0) > 0
+
+        if holding and change <= -2.0:
+            decision, amount = 'sell', 1.0
+        elif not holding and 1.0 <= change <= 5.0:
+            decision, amount = 'buy', 0.3
+        else:
+            decision, amount = 'hold', 0.0
+        confidence = int(min(50 + abs(change) * 5, 70))
+        return json.dumps({
+            'decision': decision,
+            'confidence': confidence,
+            'suggested_amount': amount,
+            'reason': f"대역 서버 판단: 전일 대비 {change:+.2f}%, {'보유 중' if holding else '미보유'}"
+        }, ensure_ascii=False)
+
+
+def malform(content: str, kind: str) -> str:
+    """형식 오류 응답 만들기"""
+    if kind == 'truncated':
+        return content[:max(len(content) // 2, 1)]
+    if kind == 'prose':
+        return "죄송합니다. 현재 데이터로는 판단하기 어렵습니다."
+    # invalid - JSON은 맞지만 확신도가 범위를 벗어남 (확신도가 없는 응답은 잘라서)
+    if '"confidence"' not in content:
+        return malform(content, 'truncated')
+    return re.sub(r'("confidence":\s*)[\d.]+', r'\g<1>150', content, count=1)
+
+
+class MockOpenAIServer:
+    """
+    로컬 HTTP 서버 (POST /v1/chat/completions, GET /v1/models, GET /mock/stats)
+
+    Args:
+        responder: 응답 생성기
+        host, port: 바인딩 주소 (port=0이면 임의 포트)
+        latency: 응답 전체 지연 분포 (ms, parse_latency)
+        first_token_share: 스트리밍 시 전체 지연 중 첫 조각까지의 비율 (나머지는 조각마다 나눠서)
+        chunk_chars: 스트리밍 조각 크기 (글자)
+        malformed_rate: 형식 오류 응답 비율 (잘림/설명문/값 범위 오류)
+        timeout_rate: 응답 없이 timeout_s초 동안 붙잡은 뒤 연결을 끊는 비율
+        error_rate: HTTP 500/429 비율 (openai 클라이언트는 기본 2회 재시도함)
+    """
+
+    def __init__(self, responder: Optional[Responder] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: Callable[[], float] = lambda: 0.0, first_token_share: float = 0.3,
+                 chunk_chars: int = 8, malformed_rate: float = 0.0, timeout_rate: float = 0.0,
+                 timeout_s: float = 120.0, error_rate: float = 0.0):
+        self.responder = responder or Responder()
+        self.latency = latency
+        self.first_token_share = first_token_share
+        self.chunk_chars = chunk_chars
+        self.malformed_rate = malformed_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_s = timeout_s
+        self.error_rate = error_rate
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'streamed': 0, 'by_kind': {}, 'malformed': 0, 'timeouts': 0, 'errors': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'MockOpenAIServer':
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key: str, kind: str = None):
+        with self._stats_lock:
+            self.stats[key] += 1
+            if kind is not None:
+                self.stats['by_kind'][kind] = self.stats['by_kind'].get(kind, 0) + 1
+
+    def _completion(self, request: Dict) -> Tuple[str, str, Dict, float]:
+        """(응답 내용, 요청 종류, 사용량, 지연 ms) - 형식 오류 주입 포함"""
+        messages = request.get('messages', [])
+        kind, content = self.responder.respond(messages)
+        if random.random() < self.malformed_rate:
+            self._count('malformed')
+            content = malform(content, random.choice(MALFORMED_KINDS))
+
+        prompt_tokens = sum(estimate_tokens(m.get('content') or '') + 4 for m in messages)
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': estimate_tokens(content),
+            'total_tokens': prompt_tokens + estimate_tokens(content),
+            'prompt_tokens_details': {'cached_tokens': 0}
+        }
+        return content, kind, usage, self.latency()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code: int, body: Dict):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _inject(self) -> bool:
+                """타임아웃/HTTP 오류 주입 - 정상 응답을 보내지 않았으면 True"""
+                roll = random.random()
+                if roll < server.timeout_rate:
+                    server._count('timeouts')
+                    time.sleep(server.timeout_s)
+                    self.close_connection = True
+                    return True
+                if roll < server.timeout_rate + server.error_rate:
+                    server._count('errors')
+                    code, error_type = random.choice([(500, 'server_error'), (429, 'rate_limit_exceeded')])
+                    self._send(code, {'error': {'message': 'Injected error', 'type': error_type, 'code': error_type}})
+                    return True
+                return False
+
+            def do_GET(self):
+                if self.path == '/mock/stats':
+                    with server._stats_lock:
+                        self._send(200, json.loads(json.dumps(server.stats)))
+                elif self.path.rstrip('/').endswith('/models'):
+                    self._send(200, {'object': 'list', 'data': [
+                        {'id': 'gpt-4o-mini', 'object': 'model', 'created': 0, 'owned_by': 'mock'}
+                    ]})
+                else:
+                    self._send(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw_body = self.rfile.read(length).decode('utf-8') if length else ''
+
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+                    return
+                try:
+                    request = json.loads(raw_body)
+                except ValueError:
+                    self._send(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+                    return
+
+                if self._inject():
+                    return
+
+                content, kind, usage, latency_ms = server._completion(request)
+                server._count('requests', kind)
+                model = request.get('model', 'gpt-4o-mini')
+                completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+                created = int(time.time())
+
+                if not request.get('stream'):
+                    time.sleep(latency_ms / 1000)
+                    self._send(200, {
+                        'id': completion_id, 'object': 'chat.completion', 'created': created, 'model': model,
+                        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                                     'finish_reason': 'stop'}],
+                        'usage': usage
+                    })
+                    return
+
+                server._count('streamed')
+                self._stream(content, usage, latency_ms, completion_id, created, model,
+                             include_usage=(request.get('stream_options') or {}).get('include_usage', False))
+
+            def _stream(self, content: str, usage: Dict, latency_ms: float, completion_id: str,
+                        created: int, model: str, include_usage: bool):
+                """SSE 응답 (본문 길이를 모르므로 보낸 뒤 연결 종료)"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+
+                def event(choices: List[Dict], extra: Optional[Dict] = None):
+                    chunk = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': created,
+                             'model': model, 'choices': choices}
+                    chunk.update(extra or {})
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+
+                pieces = [content[i:i + server.chunk_chars] for i in range(0, len(content), server.chunk_chars)]
+                first_ms = latency_ms * server.first_token_share
+                per_piece_ms = (latency_ms - first_ms) / max(len(pieces), 1)
+
+                try:
+                    time.sleep(first_ms / 1000)
+                    event([{'index': 0, 'delta': {'role': 'assistant', 'content': ''}, 'finish_reason': None}])
+                    for piece in pieces:
+                        event([{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}])
+                        time.sleep(per_piece_ms / 1000)
+                    event([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+                    if include_usage:
+                        event([], {'usage': usage})
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 먼저 끊음 (기한 초과 등)
+                    pass
+
+        return Handler
+
+
+def load_script(path: str) -> List:
+    """스크립트 파일 (한 줄에 응답 1개: JSON 객체/문자열, 또는 JSON이 아닌 줄은 그대로)"""
+    script = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            try:
+                script.append(json.loads(line))
+            except ValueError:
+                script.append(line)
+    return script
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI Chat Completions 로컬 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', default='fixed:0',
+                        help="응답 지연 분포 (ms): fixed:800, uniform:300,1500, normal:1200,300, lognormal:900,0.5")
+    parser.add_argument('--first-token-share', type=float, default=0.3, help="스트리밍 첫 조각까지의 지연 비율")
+    parser.add_argument('--chunk-chars', type=int, default=8, help="스트리밍 조각 크기 (글자)")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="형식 오류 응답 비율")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="응답 없이 붙잡는 비율")
+    parser.add_argument('--timeout-s', type=float, default=120.0, help="타임아웃 주입 시 붙잡는 시간 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="HTTP 500/429 비율")
+    parser.add_argument('--script', default=None, help="순서대로 돌려 쓸 응답 파일 (JSONL)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = MockOpenAIServer(
+        Responder(load_script(args.script) if args.script else None), host=args.host, port=args.port,
+        latency=parse_latency(args.latency), first_token_share=args.first_token_share,
+        chunk_chars=args.chunk_chars, malformed_rate=args.malformed_rate,
+        timeout_rate=args.timeout_rate, timeout_s=args.timeout_s, error_rate=args.error_rate
+    )
+
+    print("=" * 60)
+    print(f"OpenAI 대역 서버 실행: {server.url}")
+    print(f"지연 {args.latency} | 형식 오류 {args.malformed_rate:.1%} | 타임아웃 {args.timeout_rate:.1%} | "
+          f"HTTP 오류 {args.error_rate:.1%} | {'스크립트 ' + args.script if args.script else '규칙 기반 응답'}")
+    print(f"봇 연결: OPENAI_BASE_URL={server.url} OPENAI_API_KEY=mock")
+    print("=" * 60)
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+        server.httpd.server_close()
@@ -0,0 +1,201 @@
+"""
+다음 진입 후보 미리 준비
+포지션을 모니터링하는 동안 백그라운드 스캔 결과가 나올 때마다 보유 코인을 뺀 후보로
+추천을 미리 받아 둡니다. 매도 직후에는 새로 스캔/GPT 호출을 기다리지 않고,
+신선도 기한 안의 추천이면 바로 진입합니다.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from scalping_analyzer import ScalpingAnalyzer
+from scanner_worker import ScannerWorker
+from prescreen_model import PrescreenModel
+
+
+class NextEntryPlanner:
+    """
+    다음 진입 추천 생산자 (activate ~ deactivate 사이에만 동작)
+
+    준비된 추천: {'recommendation', 'candidates', 'prescreen', 'version', 'scanned_at', 'created_at'}
+    scanned_at은 스캔 시각(time.time()), created_at은 추천을 받은 시각(time.monotonic())입니다.
+    take()는 추천의 근거인 스캔 시각부터 잽니다 (GPT 응답을 기다린 시간도 포함) - max_age초보다 오래되면 버림.
+
+    Args:
+        worker: 백그라운드 스캐너 (스캔 결과를 그대로 사용, 직접 스캔하지 않음)
+        analyzer: 추천 요청 (캐시/기한/대체 추천 그대로 사용)
+        candidate_filter: 후보 필터 (예: VolumeScanner.filter_by_orderbook, 없으면 그대로)
+        prescreen: 사전 선별 모델 (점수가 낮으면 GPT를 호출하지 않고 추천 없음으로 둠)
+        max_age: 추천 신선도 기한 (초)
+        deadline: 백그라운드 추천의 GPT 응답 대기 한도 (초) - 매매 루프를 막지 않으므로 길게
+    """
+
+    def __init__(self, worker: ScannerWorker, analyzer: ScalpingAnalyzer,
+                 candidate_filter: Optional[Callable[[List[Dict]], List[Dict]]] = None,
+                 prescreen: Optional[PrescreenModel] = None, max_age: float = 15.0, deadline: float = 15.0):
+        self.worker = worker
+        self.analyzer = analyzer
+        self.candidate_filter = candidate_filter
+        self.prescreen = prescreen
+        self.max_age = max_age
+        self.deadline = deadline
+
+        self._lock = threading.Lock()
+        self._plan: Optional[Dict] = None
+        self._exclude: Optional[str] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._active = threading.Event()
+        self._running = False
+
+        self.stats = {'plans': 0, 'skipped': 0, 'errors': 0, 'used': 0, 'stale': 0, 'missing': 0}
+
+    # ===== 생명주기 =====
+
+    def start(self) -> 'NextEntryPlanner':
+        """백그라운드 스레드 시작 (activate() 전까지는 대기만 함)"""
+        if self._running:
+            return self
+
+        self._running = True
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def activate(self, exclude: str):
+        """포지션 보유 시작 - exclude(보유 코인)를 뺀 후보로 추천 준비"""
+        with self._lock:
+            self._exclude = exclude
+            self._plan = None
+        self._active.set()
+
+    def deactivate(self):
+        """추천 준비 중단 (준비된 추천은 take()까지 유지)"""
+        self._active.clear()
+
+    def _thread_main(self):
+        version = 0
+        while self._running:
+            self._active.wait()
+            if not self._running:
+                break
+
+            result = self.worker.wait_for_result(version, timeout=1.0)
+            if result is None or not self._active.is_set():
+                continue
+            version = result['version']
+            self.plan_once(result)
+
+    # ===== 생산 =====
+
+    def plan_once(self, result: Dict) -> Optional[Dict]:
+        """스캔 결과 1개로 추천 준비 (후보가 없거나 사전 선별에서 걸러지면 추천 없음)"""
+        with self._lock:
+            exclude = self._exclude
+
+        try:
+            candidates = [c for c in (result['surge_coins'] or result['momentum_coins'])
+                          if c['coin'] != exclude]
+            if candidates and self.candidate_filter:
+                candidates = self.candidate_filter(candidates)
+
+            prescreen = self.prescreen.evaluate(candidates) if self.prescreen and candidates else None
+            if not candidates or (prescreen is not None and not prescreen['call_gpt']):
+                self.stats['skipped'] += 1
+                recommendation = None
+            else:
+                recommendation = self.analyzer.recommend_coin(candidates, deadline=self.deadline)
+
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"다음 진입 준비 오류: {str(e)}")
+            return None
+
+        plan = {
+            'recommendation': recommendation,
+            'candidates': candidates,
+            'prescreen': prescreen,
+            'version': result['version'],
+            'scanned_at': result['scanned_at'],
+            'created_at': time.monotonic()
+        }
+        with self._lock:
+            # 준비하는 사이 다른 포지션으로 바뀌었으면 버림
+            if exclude != self._exclude:
+                return None
+            self._plan = plan
+        self.stats['plans'] += 1
+        return plan
+
+    # ===== 소비 =====
+
+    def peek(self) -> Optional[Dict]:
+        """현재 준비된 추천 (꺼내지 않음)"""
+        with self._lock:
+            return self._plan
+
+    def take(self, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        준비된 추천을 꺼냄 (한 번만 사용)
+
+        Returns:
+            신선도 기한(max_age초, 기본 self.max_age) 안의 추천, 없거나 오래됐으면 None
+            age: 스캔 이후 경과 시간, plan_age: 추천을 받은 이후 경과 시간 (초)
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            plan, self._plan = self._plan, None
+
+        if plan is None or plan['recommendation'] is None:
+            self.stats['missing'] += 1
+            return None
+
+        plan_age = time.monotonic() - plan['created_at']
+        # 스캔 시각은 벽시계 기준 - 시계가 뒤로 가도 추천을 받은 이후 시간보다 짧게 보지 않음
+        age = max(time.time() - plan['scanned_at'], plan_age)
+        if age > max_age:
+            self.stats['stale'] += 1
+            return None
+
+        self.stats['used'] += 1
+        return dict(plan, age=age, plan_age=plan_age)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, active=self._active.is_set())
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    # 스캔 결과/추천을 흉내 내는 대역
+    result = {
+        'version': 1, 'scanned_at': time.time(), 'momentum_coins': [],
+        'surge_coins': [{'coin': 'XRP', 'price': 800, 'volume_change': 40.0},
+                        {'coin': 'SOL', 'price': 250000, 'volume_change': 55.0}]
+    }
+    worker = SimpleNamespace(wait_for_result=lambda since, timeout=None: result if since < 1 else time.sleep(timeout))
+    analyzer = SimpleNamespace(recommend_coin=lambda candidates, deadline=None: {
+        'selected_coin': candidates[0]['coin'], 'confidence': 70, 'entry_timing': '즉시', 'source': 'gpt'})
+
+    planner = NextEntryPlanner(worker, analyzer, max_age=0.5).start()
+    planner.activate('XRP')
+    time.sleep(0.2)
+    planner.deactivate()
+
+    plan = planner.take()
+    print(f"보유 XRP 제외 추천: {plan['recommendation']['selected_coin']} ({plan['age'] * 1000:.0f}ms 전 준비)")
+
+    result = dict(result, scanned_at=time.time())
+    planner.plan_once(result)
+    time.sleep(0.6)
+    print(f"0.6초 뒤: {planner.take()}")
+    print(planner.get_stats())
+    planner.stop()
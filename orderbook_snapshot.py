@@ -0,0 +1,88 @@
+"""
+전체 코인 호가 스냅샷
+/public/orderbook/ALL_KRW 응답 하나를 코인별 최우선 호가와 호가 잔량 배열로 변환하여
+스프레드/유동성 필터를 전체 후보에 한 번에 적용합니다.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class OrderbookSnapshot:
+    """
+    코인 N개 x 호가 depth단계 배열
+
+    bid_prices/bid_quantities/ask_prices/ask_quantities: shape (N, depth), 빈 호가는 NaN/0
+    """
+
+    def __init__(self, coins: List[str], bid_prices: np.ndarray, bid_quantities: np.ndarray,
+                 ask_prices: np.ndarray, ask_quantities: np.ndarray, timestamp: Optional[int] = None):
+        self.coins = coins
+        self.index = {coin: i for i, coin in enumerate(coins)}
+        self.bid_prices = bid_prices
+        self.bid_quantities = bid_quantities
+        self.ask_prices = ask_prices
+        self.ask_quantities = ask_quantities
+        self.timestamp = timestamp
+
+        self.best_bid = bid_prices[:, 0]
+        self.best_ask = ask_prices[:, 0]
+        self.mid = (self.best_bid + self.best_ask) / 2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.spread_pct = (self.best_ask - self.best_bid) / self.mid * 100
+
+        # depth단계까지 누적 호가 잔량 (원화 환산)
+        self.bid_depth_krw = np.nansum(bid_prices * bid_quantities, axis=1)
+        self.ask_depth_krw = np.nansum(ask_prices * ask_quantities, axis=1)
+
+    @classmethod
+    def from_payload(cls, data: Dict, depth: int = 5) -> 'OrderbookSnapshot':
+        """ALL_KRW 호가 응답의 data 필드로 스냅샷 생성"""
+        coins = [key for key, value in data.items() if isinstance(value, dict)]
+        n = len(coins)
+
+        # 미리 할당한 (N, depth, 2) 배열에 칸마다 float로 변환해 넣음 (형식이 잘못된 칸/빈 단계는 NaN)
+        # 문자열 배열을 np.array(..., dtype=float)로 한 번에 바꾸는 것보다 float() 변환이 빠름
+        bids = np.full((n, depth, 2), np.nan)
+        asks = np.full((n, depth, 2), np.nan)
+
+        for i, coin in enumerate(coins):
+            book = data[coin]
+            for side, target in (('bids', bids), ('asks', asks)):
+                for j, level in enumerate(book.get(side, [])[:depth]):
+                    try:
+                        target[i, j, 0] = float(level['price'])
+                        target[i, j, 1] = float(level['quantity'])
+                    except (KeyError, ValueError, TypeError):
+                        continue
+
+        timestamp = data.get('timestamp')
+        return cls(
+            coins,
+            bids[:, :, 0], np.nan_to_num(bids[:, :, 1]),
+            asks[:, :, 0], np.nan_to_num(asks[:, :, 1]),
+            int(timestamp) if timestamp else None
+        )
+
+    def liquidity_mask(self, max_spread_pct: float, min_depth_krw: float) -> np.ndarray:
+        """스프레드/호가 잔량 조건을 만족하는 코인 마스크"""
+        with np.errstate(invalid='ignore'):
+            return ((self.spread_pct <= max_spread_pct)
+                    & (self.bid_depth_krw >= min_depth_krw)
+                    & (self.ask_depth_krw >= min_depth_krw))
+
+    def liquidity(self, coin: str) -> Optional[Dict]:
+        """코인 하나의 호가 요약"""
+        i = self.index.get(coin)
+        if i is None:
+            return None
+
+        return {
+            'best_bid': float(self.best_bid[i]),
+            'best_ask': float(self.best_ask[i]),
+            'spread_pct': float(self.spread_pct[i]),
+            'bid_depth_krw': float(self.bid_depth_krw[i]),
+            'ask_depth_krw': float(self.ask_depth_krw[i])
+        }
@@ -0,0 +1,367 @@
+"""
+GPT 호출 전 사전 선별 모델
+기록된 스캔 이력(scan_history.jsonl)에서 "GPT가 즉시 진입을 추천한 후보"를 맞히는
+로지스틱 회귀를 학습하고, 스캔마다 후보 점수가 낮으면 GPT 호출을 생략합니다.
+대부분의 스캔은 '조정 대기'나 확신도 50 미만으로 버려지므로 그런 스캔을 미리 거릅니다.
+
+학습/평가는 시간순으로 나눕니다: 앞쪽 스캔으로 학습하고, 뒤쪽 스캔(학습에 쓰지 않은 구간)으로 평가합니다.
+
+사용법:
+    python prescreen_model.py fit --history scan_history.jsonl --out prescreen_model.json --test-frac 0.25
+    python prescreen_model.py fit --history scan_history.jsonl --since "2026-10-01 00:00:00"
+    python prescreen_model.py report --history scan_history.jsonl --model prescreen_model.json
+"""
+
+import argparse
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from trading_logger import read_scan_history
+
+
+# 후보 1개의 입력 지표 (없는 값은 학습 평균으로 채움)
+FEATURES = (
+    'volume_change', 'surge_zscore', 'price_change_24h', 'log_trade_value',
+    'ind_rsi', 'ind_vwap_gap_pct', 'ind_bb_pct_b', 'bar_return_1m', 'spread_pct'
+)
+
+# GPT 추천을 실제 진입으로 보는 조건 (ScalpingBotV2.find_trading_opportunity와 같음)
+ENTRY_TIMING = '즉시'
+MIN_CONFIDENCE = 50
+
+
+def candidate_features(candidates: List[Dict]) -> np.ndarray:
+    """후보 리스트 -> (후보 수, 지표 수) 배열 (없는 값은 NaN)"""
+    rows = np.full((len(candidates), len(FEATURES)), np.nan)
+    for i, coin_info in enumerate(candidates):
+        for j, key in enumerate(FEATURES):
+            if key == 'log_trade_value':
+                value = coin_info.get('trade_value_24h')
+                value = math.log10(value) if value and value > 0 else None
+            else:
+                value = coin_info.get(key)
+            if value is not None:
+                rows[i, j] = value
+    return rows
+
+
+def is_entry(recommendation: Optional[Dict]) -> bool:
+    return bool(recommendation) and recommendation.get('entry_timing') == ENTRY_TIMING \
+        and recommendation.get('confidence', 0) >= MIN_CONFIDENCE
+
+
+def labeled_scans(history: Iterable[Dict]) -> List[Tuple[Dict, np.ndarray, np.ndarray]]:
+    """
+    GPT가 판단한 스캔만 골라 (스캔, 후보 지표, 후보 라벨) 목록으로
+    라벨: GPT가 그 후보를 선택했고 진입 조건(즉시, 확신도 50 이상)을 만족하면 1
+    """
+    scans = []
+    for scan in history:
+        recommendation = scan.get('gpt_recommendation')
+        candidates = scan.get('top_coins') or []
+        # 규칙 기반 대체/사전 선별로 생략된 스캔은 GPT 판단이 없음
+        if not candidates or not recommendation or recommendation.get('source') not in (None, 'gpt', 'cache'):
+            continue
+
+        labels = np.zeros(len(candidates))
+        if is_entry(recommendation):
+            labels = np.array([c['coin'] == recommendation['selected_coin'] for c in candidates], dtype=float)
+        scans.append((scan, candidate_features(candidates), labels))
+    return scans
+
+
+def split_scans(scans: List[Tuple[Dict, np.ndarray, np.ndarray]], test_frac: float = 0.25,
+                since: Optional[str] = None) -> Tuple[List, List, Optional[str]]:
+    """
+    스캔 시각 순으로 학습/평가 구간 나누기
+
+    Args:
+        test_frac: 뒤쪽에서 평가 구간으로 뗄 비율 (since가 없을 때)
+        since: 이 시각('%Y-%m-%d %H:%M:%S') 이후 스캔을 평가 구간으로
+
+    Returns:
+        (학습 스캔, 평가 스캔, 경계 시각 - 평가 구간 첫 스캔 시각)
+    """
+    ordered = sorted(scans, key=lambda item: item[0].get('timestamp') or '')
+    if since is not None:
+        cut = sum((scan.get('timestamp') or '') < since for scan, _, _ in ordered)
+    else:
+        cut = len(ordered) - int(math.ceil(len(ordered) * test_frac))
+    train, test = ordered[:cut], ordered[cut:]
+    boundary = since if since is not None else (test[0][0].get('timestamp') if test else None)
+    return train, test, boundary
+
+
+def holdout_scans(model: 'PrescreenModel', scans: List[Tuple[Dict, np.ndarray, np.ndarray]]) -> List:
+    """모델 학습 이후 구간의 스캔 (meta의 경계 시각 이후, 경계가 없으면 전체)"""
+    boundary = (model.meta.get('split') or {}).get('boundary')
+    if not boundary:
+        return scans
+    return [item for item in scans if (item[0].get('timestamp') or '') >= boundary]
+
+
+class PrescreenModel:
+    """
+    후보별 로지스틱 회귀 + 스캔 단위 관문
+
+    스캔 점수 = 후보 진입 확률의 최댓값.
+    점수가 threshold 미만이면 GPT 호출을 생략하고, 이상이면(유망하거나 애매하면) GPT에 맡깁니다.
+    threshold는 학습 이력에서 GPT 진입 스캔의 recall 이상을 유지하는 가장 높은 값으로 정합니다.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, mean: np.ndarray, std: np.ndarray,
+                 threshold: float, features: Tuple[str, ...] = FEATURES, meta: Optional[Dict] = None):
+        self.weights = np.asarray(weights, dtype=float)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=float)
+        self.std = np.asarray(std, dtype=float)
+        self.threshold = float(threshold)
+        self.features = tuple(features)
+        self.meta = meta or {}
+
+    # ===== 추론 =====
+
+    def _standardize(self, x: np.ndarray) -> np.ndarray:
+        z = (x - self.mean) / self.std
+        return np.nan_to_num(z, nan=0.0)
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """후보 지표 배열 -> 진입 확률"""
+        logits = self._standardize(x) @ self.weights + self.bias
+        return 1 / (1 + np.exp(-np.clip(logits, -30, 30)))
+
+    def evaluate(self, candidates: List[Dict]) -> Dict:
+        """
+        스캔 1개 판단
+
+        Returns:
+            {'call_gpt': bool, 'score': 스캔 점수, 'threshold', 'best_coin': 점수 최고 후보}
+        """
+        if not candidates:
+            return {'call_gpt': False, 'score': 0.0, 'threshold': self.threshold, 'best_coin': None}
+
+        proba = self.predict_proba(candidate_features(candidates))
+        best = int(np.argmax(proba))
+        score = float(proba[best])
+        return {
+            'call_gpt': score >= self.threshold,
+            'score': score,
+            'threshold': self.threshold,
+            'best_coin': candidates[best]['coin']
+        }
+
+    # ===== 학습 =====
+
+    @classmethod
+    def fit(cls, scans: List[Tuple[Dict, np.ndarray, np.ndarray]], target_recall: float = 0.95,
+            l2: float = 1.0, iterations: int = 50) -> 'PrescreenModel':
+        """
+        로지스틱 회귀 학습 (Newton-Raphson, L2 정규화)
+
+        Args:
+            scans: labeled_scans() 결과
+            target_recall: GPT 진입 스캔 중 관문을 통과해야 하는 비율
+        """
+        x = np.vstack([features for _, features, _ in scans])
+        y = np.concatenate([labels for _, _, labels in scans])
+        if y.sum() == 0 or y.sum() == len(y):
+            raise ValueError("학습 이력에 진입/비진입 후보가 모두 있어야 합니다")
+
+        # 기록에 없는 지표(전부 NaN)는 평균 0, 표준편차 1 -> 표준화 후 항상 0
+        observed = ~np.isnan(x)
+        count = np.maximum(observed.sum(axis=0), 1)
+        mean = np.where(observed, x, 0).sum(axis=0) / count
+        std = np.sqrt(np.where(observed, (x - mean) ** 2, 0).sum(axis=0) / count)
+        std = np.where(std > 1e-9, std, 1.0)
+        z = np.nan_to_num((x - mean) / std, nan=0.0)
+
+        # 절편 포함 뉴턴법 (지표 수가 적어 헤시안 역행렬이 저렴)
+        a = np.hstack([z, np.ones((len(z), 1))])
+        theta = np.zeros(a.shape[1])
+        penalty = np.full(a.shape[1], l2)
+        penalty[-1] = 0.0
+        for _ in range(iterations):
+            p = 1 / (1 + np.exp(-np.clip(a @ theta, -30, 30)))
+            gradient = a.T @ (p - y) + penalty * theta
+            hessian = (a * (p * (1 - p))[:, None]).T @ a + np.diag(penalty)
+            step = np.linalg.solve(hessian, gradient)
+            theta -= step
+            if np.abs(step).max() < 1e-8:
+                break
+
+        model = cls(theta[:-1], theta[-1], mean, std, threshold=0.0)
+
+        # 스캔 점수 기준 관문 - 진입 스캔을 target_recall 이상 통과시키는 가장 높은 threshold
+        scores = np.array([model.predict_proba(features).max() for _, features, _ in scans])
+        entries = np.array([labels.any() for _, _, labels in scans])
+        entry_scores = np.sort(scores[entries])
+        cut = int(math.floor((1 - target_recall) * len(entry_scores)))
+        model.threshold = float(entry_scores[min(cut, len(entry_scores) - 1)])
+
+        model.meta = {
+            'trained_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'scans': len(scans),
+            'entry_scans': int(entries.sum()),
+            'candidates': len(y),
+            'target_recall': target_recall,
+            'gpt_call_rate': float((scores >= model.threshold).mean())
+        }
+        return model
+
+    # ===== 저장 =====
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'features': list(self.features),
+                'weights': self.weights.tolist(),
+                'bias': self.bias,
+                'mean': self.mean.tolist(),
+                'std': self.std.tolist(),
+                'threshold': self.threshold,
+                'meta': self.meta
+            }, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'PrescreenModel':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if tuple(data['features']) != FEATURES:
+            raise ValueError(f"모델 지표 구성이 다릅니다: {data['features']}")
+        return cls(data['weights'], data['bias'], data['mean'], data['std'], data['threshold'],
+                   meta=data.get('meta'))
+
+
+def _parse_time(text: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(text, '%Y-%m-%d %H:%M:%S') if text else None
+    except ValueError:
+        return None
+
+
+def replay_report(model: PrescreenModel, scans: List[Tuple[Dict, np.ndarray, np.ndarray]],
+                  trades: List[Dict], match_seconds: float = 120) -> Dict:
+    """
+    기록된 스캔을 다시 돌려 GPT 전체 호출 vs 사전 선별 후 호출 비교
+
+    Args:
+        trades: TradingLogger 거래 기록 (GPT 진입 추천 직후 진입한 거래를 수익률로 연결)
+        match_seconds: 스캔 후 이 시간 안에 진입한 같은 코인 거래를 그 스캔의 진입으로 봄
+
+    Returns:
+        호출 수/감소 배율, 진입 스캔 유지율, 놓친 진입과 유지된 진입의 실현 수익률
+    """
+    trade_entries = [(t['coin'], _parse_time(t.get('entry_time')), t['profit_rate']) for t in trades]
+
+    calls = kept = missed = 0
+    kept_profits, missed_profits = [], []
+    for scan, features, labels in scans:
+        passed = model.predict_proba(features).max() >= model.threshold
+        calls += passed
+        if not labels.any():
+            continue
+
+        if passed:
+            kept += 1
+        else:
+            missed += 1
+
+        # 이 스캔의 추천으로 실제 진입한 거래
+        coin = scan['gpt_recommendation']['selected_coin']
+        scanned_at = _parse_time(scan.get('timestamp'))
+        for trade_coin, entry_time, profit_rate in trade_entries:
+            if trade_coin == coin and scanned_at and entry_time \
+                    and scanned_at <= entry_time <= scanned_at + timedelta(seconds=match_seconds):
+                (kept_profits if passed else missed_profits).append(profit_rate)
+                break
+
+    def mean(values: List[float]) -> Optional[float]:
+        return float(np.mean(values)) if values else None
+
+    total = len(scans)
+    return {
+        'scans': total,
+        'gpt_calls_baseline': total,
+        'gpt_calls_prescreen': int(calls),
+        'call_reduction': total / calls if calls else float('inf'),
+        'entry_scans': kept + missed,
+        'entry_recall': kept / (kept + missed) if kept + missed else None,
+        'kept_trades': len(kept_profits),
+        'kept_avg_profit': mean(kept_profits),
+        'missed_trades': len(missed_profits),
+        'missed_avg_profit': mean(missed_profits),
+        'baseline_avg_profit': mean(kept_profits + missed_profits)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPT 호출 전 사전 선별 모델")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = sub.add_parser('fit', help="스캔 이력으로 학습")
+    fit_parser.add_argument('--history', default='scan_history.jsonl')
+    fit_parser.add_argument('--out', default='prescreen_model.json')
+    fit_parser.add_argument('--recall', type=float, default=0.95, help="유지할 GPT 진입 스캔 비율")
+    fit_parser.add_argument('--l2', type=float, default=1.0)
+    fit_parser.add_argument('--test-frac', type=float, default=0.25, help="평가용으로 남길 최근 스캔 비율")
+    fit_parser.add_argument('--since', default=None, help="이 시각 이후 스캔을 평가용으로 (예: '2026-10-01 00:00:00')")
+
+    report_parser = sub.add_parser('report', help="기록된 스캔 재생 비교")
+    report_parser.add_argument('--history', default='scan_history.jsonl')
+    report_parser.add_argument('--model', default='prescreen_model.json')
+    report_parser.add_argument('--trades', default='trading_data.json', help="거래 기록 (TradingLogger)")
+    report_parser.add_argument('--all', action='store_true', help="학습 구간 포함 전체 스캔으로 평가")
+
+    args = parser.parse_args()
+    scans = labeled_scans(read_scan_history(args.history))
+    print(f"GPT 판단 스캔 {len(scans)}개")
+
+    if args.command == 'fit':
+        train, test, boundary = split_scans(scans, test_frac=args.test_frac, since=args.since)
+        model = PrescreenModel.fit(train, target_recall=args.recall, l2=args.l2)
+        model.meta['split'] = {'boundary': boundary, 'train_scans': len(train), 'test_scans': len(test)}
+        model.save(args.out)
+        print(f"저장: {args.out} (threshold {model.threshold:.3f}, "
+              f"학습 구간 GPT 호출 비율 {model.meta['gpt_call_rate'] * 100:.1f}%)")
+        for name, weight in sorted(zip(model.features, model.weights), key=lambda x: -abs(x[1])):
+            print(f"  {name:>18}: {weight:+.3f}")
+
+        print(f"학습 {len(train)}개 / 평가 {len(test)}개 (경계 {boundary or '-'})")
+        if test:
+            report = replay_report(model, test, [])
+            recall = f"{report['entry_recall'] * 100:.1f}%" if report['entry_recall'] is not None else "-"
+            print(f"평가 구간: GPT 호출 {report['gpt_calls_baseline']}회 -> {report['gpt_calls_prescreen']}회, "
+                  f"진입 스캔 유지 {recall} (목표 {args.recall * 100:.0f}%)")
+        return
+
+    model = PrescreenModel.load(args.model)
+    if not args.all:
+        # 학습에 쓴 스캔으로 평가하면 recall 목표를 그대로 돌려받을 뿐이므로 학습 이후 구간만
+        scans = holdout_scans(model, scans)
+        print(f"평가 구간 스캔 {len(scans)}개 (경계 {(model.meta.get('split') or {}).get('boundary') or '-'})")
+    try:
+        with open(args.trades, 'r', encoding='utf-8') as f:
+            trades = json.load(f).get('trades', [])
+    except (OSError, ValueError):
+        trades = []
+
+    report = replay_report(model, scans, trades)
+    print(f"GPT 호출: {report['gpt_calls_baseline']}회 -> {report['gpt_calls_prescreen']}회 "
+          f"({report['call_reduction']:.1f}배 감소)")
+    if report['entry_recall'] is not None:
+        print(f"GPT 진입 스캔 유지: {report['entry_recall'] * 100:.1f}% ({report['entry_scans']}개 중)")
+
+    def profit(value: Optional[float]) -> str:
+        return f"{value:+.2f}%" if value is not None else "-"
+
+    print(f"실현 수익률 (연결된 거래): 전체 {profit(report['baseline_avg_profit'])} / "
+          f"유지 {report['kept_trades']}건 {profit(report['kept_avg_profit'])} / "
+          f"놓침 {report['missed_trades']}건 {profit(report['missed_avg_profit'])}")
+
+
+if __name__ == "__main__":
+    main()
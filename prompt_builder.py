@@ -0,0 +1,335 @@
+"""
+GPT 프롬프트 생성기
+후보 코인을 한 줄에 1개씩 '|' 구분 표로 압축하여 토큰 예산 안에 맞추고,
+열 설명은 매 호출 같은 시스템 프롬프트에 고정하여 메시지 앞부분이 항상 같도록 합니다
+(OpenAI 프롬프트 캐시는 1024토큰 이상인 요청의 같은 앞부분에만 적용되므로,
+후보/지표가 늘어 프롬프트가 길어져도 고정 부분은 캐시 대상이 됨).
+호출마다 프롬프트/응답/캐시 토큰과 걸린 시간을 기록합니다.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+
+# ===== 고정 시스템 프롬프트 (내용이 바뀌면 캐시가 깨지므로 호출마다 달라지는 값을 넣지 말 것) =====
+
+SCALPING_SYSTEM_PROMPT = """당신은 암호화폐 단타 매매 전문가입니다.
+거래량이 급증한 코인들 중에서 단기 수익을 낼 가능성이 높은 코인을 선택해야 합니다.
+
+후보는 '|'로 구분한 표로 주어집니다 (첫 줄이 열 이름, '-'는 값 없음):
+coin=심볼, price=현재가(KRW), chg24=24시간 가격 변동(%), vol=거래량 증가율(%),
+z=평소 대비 거래량 z-score, val=24시간 거래대금(억원), mom=모멘텀 스코어,
+v1m/v5m=1분/5분 거래량 변화(%), c_ret=최근 캔들 수익률(%), c_vr=최근 캔들 거래량 배수,
+b1m/b5m=직전 1분/5분봉 대비(%), rsi=RSI, ema=EMA 단기-장기 괴리(%), vwap=VWAP 대비(%),
+pb=볼린저 %B, atr=ATR(%), vz=거래량 z-score(봉), spr=호가 스프레드(%), bid/ask=호가 잔량(만원)
+
+반드시 다음 JSON 형식으로만 답변하세요:
+
+{
+    "selected_coin": "코인 심볼 (예: XRP)",
+    "entry_timing": "즉시" 또는 "조정 대기",
+    "confidence": 0~100 사이의 숫자 (추천 확신도),
+    "risk_level": "낮음" 또는 "중간" 또는 "높음",
+    "reason": "추천 이유를 한국어로 간단히 설명 (2-3문장)"
+}
+
+필드는 위 순서 그대로 쓰고, reason은 반드시 마지막에 쓰세요.
+
+분석 기준:
+1. 거래량 증가율 (높을수록 좋음)
+2. 가격 변동률 (너무 과열되지 않은 것)
+3. 거래대금 (충분한 유동성)
+4. 단기 모멘텀 지속 가능성
+5. 리스크 수준 (과도한 급등은 위험)
+
+주의사항:
+- 이미 30% 이상 급등한 코인은 주의
+- 거래대금이 너무 적은 코인은 피하기
+- 여러 후보 중 가장 안정적이면서 모멘텀 있는 것 선택"""
+
+MARKET_SYSTEM_PROMPT = """당신은 비트코인 전문 트레이더입니다.
+주어진 시장 데이터를 분석하여 매수, 매도, 보유 결정을 내려야 합니다.
+
+시장 데이터는 'key=value' 한 줄로 주어집니다:
+price=현재가, open/high/low=시가/고가/저가, chg24=전일 대비(%), vol24=24시간 거래량,
+val24=24시간 거래금액(KRW), bid/ask=최고 매수/최저 매도 호가, hold=보유 수량,
+krw=보유 KRW, hold_val=보유 평가금액(KRW)
+
+반드시 다음 JSON 형식으로만 답변하세요:
+
+{
+    "decision": "buy" 또는 "sell" 또는 "hold",
+    "confidence": 0~100 사이의 숫자 (확신도),
+    "suggested_amount": 0~1 사이의 숫자 (투자 금액 비율, 1 = 100%),
+    "reason": "결정 이유를 한국어로 간단히 설명"
+}
+
+분석 시 고려사항:
+- 현재가 대비 24시간 변동률
+- 거래량 변화
+- 매수/매도 호가 차이
+- 전반적인 시장 심리
+- 리스크 관리 (과도한 투자 지양)"""
+
+
+# ===== 후보 표 =====
+
+def _num(digits: int) -> Callable[[float], str]:
+    return lambda value: f"{value:.{digits}f}"
+
+
+def _signed(digits: int) -> Callable[[float], str]:
+    return lambda value: f"{value:+.{digits}f}"
+
+
+def _price(value: float) -> str:
+    return f"{value:.0f}" if value >= 100 else f"{value:.4g}"
+
+
+# (열 이름, 후보 필드, 형식) - 앞쪽일수록 중요 (예산을 넘으면 뒤쪽 열부터 뺌)
+COLUMNS: List[Tuple[str, str, Callable[[float], str]]] = [
+    ('coin', 'coin', str),
+    ('price', 'price', _price),
+    ('chg24', 'price_change_24h', _signed(1)),
+    ('vol', 'volume_change', _signed(1)),
+    ('z', 'surge_zscore', _num(1)),
+    ('val', 'trade_value_24h', lambda value: f"{value / 100000000:.0f}"),
+    ('mom', 'momentum_score', _num(2)),
+    ('rsi', 'ind_rsi', _num(0)),
+    ('spr', 'spread_pct', _num(2)),
+    ('v1m', 'volume_change_1m', _signed(1)),
+    ('b1m', 'bar_return_1m', _signed(2)),
+    ('c_ret', 'candle_return_pct', _signed(2)),
+    ('c_vr', 'candle_volume_ratio', _num(1)),
+    ('vwap', 'ind_vwap_gap_pct', _signed(2)),
+    ('ema', 'ind_ema_gap_pct', _signed(2)),
+    ('pb', 'ind_bb_pct_b', _num(2)),
+    ('atr', 'ind_atr_pct', _num(2)),
+    ('vz', 'ind_volume_zscore', _signed(1)),
+    ('v5m', 'volume_change_5m', _signed(1)),
+    ('b5m', 'bar_return_5m', _signed(2)),
+    ('bid', 'bid_depth_krw', lambda value: f"{value / 10000:.0f}"),
+    ('ask', 'ask_depth_krw', lambda value: f"{value / 10000:.0f}"),
+]
+
+# 이 개수보다 열을 줄이지 않음 (coin/price/chg24/vol)
+MIN_COLUMNS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (tokenizer 없이)
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII는 글자당 약 1토큰으로 계산
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+class BuiltPrompt(NamedTuple):
+    text: str
+    estimated_tokens: int
+    columns: List[str]
+    dropped_columns: List[str]
+    dropped_candidates: int
+
+
+def _render(candidates: List[Dict], columns: List[Tuple[str, str, Callable]]) -> str:
+    lines = ["|".join(name for name, _, _ in columns)]
+    for coin_info in candidates:
+        cells = []
+        for _, key, fmt in columns:
+            value = coin_info.get(key)
+            cells.append('-' if value is None else fmt(value))
+        lines.append("|".join(cells))
+    return "\n".join(lines)
+
+
+def build_candidate_table(candidates: List[Dict], token_budget: int = 400) -> BuiltPrompt:
+    """
+    후보 코인 표 (사용자 메시지)
+
+    값이 있는 열만 넣고, 예산을 넘으면 중요도가 낮은 열부터 빼고
+    그래도 넘으면 뒤쪽(순위가 낮은) 후보를 뺍니다.
+
+    Args:
+        token_budget: 사용자 메시지 토큰 예산 (추정치 기준)
+    """
+    columns = [column for column in COLUMNS
+               if any(coin_info.get(column[1]) is not None for coin_info in candidates)]
+    dropped_columns = []
+    rows = list(candidates)
+
+    text = _render(rows, columns)
+    while estimate_tokens(text) > token_budget and len(columns) > MIN_COLUMNS:
+        dropped_columns.append(columns.pop()[0])
+        text = _render(rows, columns)
+    while estimate_tokens(text) > token_budget and len(rows) > 1:
+        rows.pop()
+        text = _render(rows, columns)
+
+    return BuiltPrompt(text, estimate_tokens(text), [name for name, _, _ in columns],
+                       dropped_columns, len(candidates) - len(rows))
+
+
+def build_market_line(market_data: Dict) -> str:
+    """GPTAnalyzer 시장 데이터 -> 'key=value' 한 줄"""
+    ticker = market_data.get('ticker', {})
+    orderbook = market_data.get('orderbook', {})
+    balance = market_data.get('balance', {})
+
+    fields = [
+        ('price', ticker.get('closing_price')),
+        ('open', ticker.get('opening_price')),
+        ('high', ticker.get('max_price')),
+        ('low', ticker.get('min_price')),
+        ('chg24', ticker.get('fluctate_rate_24H')),
+        ('vol24', ticker.get('units_traded_24H')),
+        ('val24', ticker.get('acc_trade_value_24H')),
+        ('bid', orderbook['bids'][0].get('price') if orderbook.get('bids') else None),
+        ('ask', orderbook['asks'][0].get('price') if orderbook.get('asks') else None),
+        ('hold', balance.get('btc_balance')),
+        ('krw', balance.get('krw_balance')),
+        ('hold_val', balance.get('btc_value'))
+    ]
+
+    def fmt(value) -> str:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return '-'
+        return f"{number:.8g}" if abs(number) < 1e8 else f"{number:.0f}"
+
+    return " ".join(f"{key}={fmt(value)}" for key, value in fields)
+
+
+# ===== 사용량 기록 =====
+
+# 모델별 100만 토큰당 가격 (USD): (입력, 캐시된 입력, 출력) - 캐시 할인이 없는 모델은 입력과 같음
+# 없는 모델은 비용을 'unknown'으로 표시
+PRICES_PER_MTOK = {
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+    'gpt-4o': (2.50, 1.25, 10.00),
+    'gpt-4.1-nano': (0.10, 0.025, 0.40),
+    'gpt-4.1-mini': (0.40, 0.10, 1.60),
+    'gpt-4.1': (2.00, 0.50, 8.00),
+    'gpt-4': (30.00, 30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 0.50, 1.50)
+}
+
+
+def _base_model(model: str) -> str:
+    """날짜 붙은 스냅샷 이름 -> 기본 이름 (예: gpt-4o-mini-2024-07-18 -> gpt-4o-mini)"""
+    return re.sub(r'-\d{4}-\d{2}-\d{2}$', '', model)
+
+
+class PromptUsage:
+    """
+    호출별 토큰/시간 기록 (스레드 안전)
+
+    kind별(예: 'recommend/compact', 'recommend/verbose')로 누적하여
+    압축 전후의 토큰 수/지연 시간/비용을 비교할 수 있게 합니다.
+
+    Args:
+        window: kind별로 보관할 최근 호출 수
+    """
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, deque] = {}
+        self._window = window
+
+    def record(self, kind: str, model: str, usage, wall_ms: float, estimated_prompt_tokens: int = 0):
+        """
+        Args:
+            usage: OpenAI 응답의 usage (없으면 추정치만 기록)
+        """
+        prompt_tokens = getattr(usage, 'prompt_tokens', None) or estimated_prompt_tokens
+        completion_tokens = getattr(usage, 'completion_tokens', None) or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) or 0
+
+        entry = {
+            'at': time.time(),
+            'model': model,
+            'prompt_tokens': prompt_tokens,
+            'cached_tokens': cached_tokens,
+            'completion_tokens': completion_tokens,
+            'estimated_prompt_tokens': estimated_prompt_tokens,
+            'wall_ms': wall_ms
+        }
+        with self._lock:
+            calls = self._calls.get(kind)
+            if calls is None:
+                calls = self._calls[kind] = deque(maxlen=self._window)
+            calls.append(entry)
+
+    @staticmethod
+    def _cost(entry: Dict) -> float:
+        prices = PRICES_PER_MTOK[_base_model(entry['model'])]
+        uncached = entry['prompt_tokens'] - entry['cached_tokens']
+        return (uncached * prices[0] + entry['cached_tokens'] * prices[1]
+                + entry['completion_tokens'] * prices[2]) / 1e6
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        kind별 평균 (최근 window개 기준)
+
+        Returns:
+            {kind: {'calls', 'prompt_tokens', 'cached_tokens', 'completion_tokens', 'wall_ms', 'cost_usd'}}
+            가격을 모르는 모델 호출이 섞여 있으면 cost_usd는 None
+        """
+        with self._lock:
+            snapshot = {kind: list(calls) for kind, calls in self._calls.items()}
+
+        result = {}
+        for kind, calls in snapshot.items():
+            n = len(calls)
+            result[kind] = {
+                'calls': n,
+                'prompt_tokens': sum(c['prompt_tokens'] for c in calls) / n,
+                'cached_tokens': sum(c['cached_tokens'] for c in calls) / n,
+                'completion_tokens': sum(c['completion_tokens'] for c in calls) / n,
+                'wall_ms': sum(c['wall_ms'] for c in calls) / n,
+                'cost_usd': (sum(self._cost(c) for c in calls) / n
+                             if all(_base_model(c['model']) in PRICES_PER_MTOK for c in calls) else None)
+            }
+        return result
+
+    def format(self) -> str:
+        """한 줄 요약 (호출당 평균)"""
+        def cost(value) -> str:
+            return f"${value * 1000:.3f}/1k회" if value is not None else "비용 unknown"
+
+        return " | ".join(
+            f"{kind} 입력 {s['prompt_tokens']:.0f}(캐시 {s['cached_tokens']:.0f}) 출력 {s['completion_tokens']:.0f}토큰 "
+            f"{s['wall_ms']:.0f}ms {cost(s['cost_usd'])}"
+            for kind, s in self.summary().items()
+        )
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    from scalping_analyzer import VERBOSE_SYSTEM_PROMPT, ScalpingAnalyzer
+
+    candidates = [
+        {'coin': f"C{i}", 'price': 1500.0 / (i + 1), 'price_change_24h': 5.2 + i, 'volume_change': 45.3 - i,
+         'volume_change_10s': 3.1, 'volume_change_1m': 12.4, 'volume_change_5m': 30.2, 'volume_change_15m': 41.0,
+         'trade_value_24h': 2.5e10 / (i + 1), 'momentum_score': 8.5 - i,
+         'bar_return_1s': 0.1, 'bar_return_1m': 0.8, 'bar_return_5m': 2.1,
+         'ind_rsi': 61.2, 'ind_ema_gap_pct': 0.8, 'ind_vwap_gap_pct': 1.1, 'ind_bb_pct_b': 0.83,
+         'ind_atr_pct': 1.4, 'ind_volume_zscore': 2.2,
+         'spread_pct': 0.12, 'bid_depth_krw': 8.2e6, 'ask_depth_krw': 6.1e6}
+        for i in range(5)
+    ]
+
+    verbose = ScalpingAnalyzer._create_recommendation_prompt(None, candidates)
+    print(f"기존 프롬프트: 시스템 {estimate_tokens(VERBOSE_SYSTEM_PROMPT)} + 사용자 {estimate_tokens(verbose)} 토큰 (추정)")
+    print(f"압축 프롬프트: 시스템 {estimate_tokens(SCALPING_SYSTEM_PROMPT)} (고정 - 프롬프트 캐시 대상) + 사용자 표")
+    for budget in (400, 100, 40):
+        built = build_candidate_table(candidates, token_budget=budget)
+        print(f"\n예산 {budget}: {built.estimated_tokens} 토큰, 뺀 열 {built.dropped_columns}, "
+              f"뺀 후보 {built.dropped_candidates}개")
+        print(built.text)
@@ -0,0 +1,238 @@
+"""
+빗썸 API 클라이언트 측 요청 속도 제한
+토큰 버킷으로 거래소 요청 한도를 나눠 쓰고,
+주문(order) 요청이 시세(public) 요청보다 먼저 처리되도록 우선순위 레인을 둡니다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+# 레인별 우선순위 (숫자가 작을수록 먼저 처리)
+LANE_PRIORITY = {
+    'order': 0,     # 주문/취소 (/trade/*)
+    'private': 1,   # 잔고 등 인증 조회 (/info/*)
+    'public': 2     # 시세/호가 (/public/*)
+}
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float, reserve: float = 0.0) -> float:
+        """reserve개를 남기고 토큰 1개를 꺼낼 수 있을 때까지 남은 시간 (초)"""
+        self.refill(now)
+        needed = 1.0 + reserve - self.tokens
+        if needed <= 0:
+            return 0.0
+        return needed / self.rate
+
+    def consume(self):
+        self.tokens -= 1.0
+
+
+class PriorityRateLimiter:
+    """
+    우선순위 레인이 있는 토큰 버킷 스케줄러
+
+    - 전체 요청은 하나의 global 버킷을 공유
+    - 레인(order/private/public)과 엔드포인트별로 추가 한도 적용
+    - 대기 중인 상위 레인 요청이 있으면 하위 레인은 양보
+    - global 버킷에 order_reserve개를 남겨두어 주문은 시세 폴링 뒤에 밀리지 않음
+
+    Args:
+        global_rate: 전체 초당 요청 수
+        global_burst: 전체 버킷 크기
+        lane_budgets: {lane: (초당 요청 수, 버킷 크기)}
+        endpoint_budgets: {엔드포인트 prefix: (초당 요청 수, 버킷 크기)}
+        order_reserve: 주문 레인 전용으로 남겨둘 global 토큰 수
+    """
+
+    def __init__(self, global_rate: float = 20.0, global_burst: Optional[float] = None,
+                 lane_budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 endpoint_budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 order_reserve: float = 3.0):
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []  # heap: (priority, seq, endpoint_key, lane)
+
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.order_reserve = order_reserve
+
+        if lane_budgets is None:
+            lane_budgets = {
+                'order': (10.0, 10.0),
+                'private': (10.0, 10.0),
+                'public': (15.0, 15.0)
+            }
+        self.lane_buckets = {lane: TokenBucket(rate, burst) for lane, (rate, burst) in lane_budgets.items()}
+
+        if endpoint_budgets is None:
+            endpoint_budgets = {
+                '/public/ticker/ALL_': (1.0, 2.0),      # 전체 시세 (스캐너)
+                '/public/orderbook/ALL_': (1.0, 2.0),   # 전체 호가
+                '/public/candlestick/': (5.0, 5.0)      # 캔들 적재 (스캔/시세 조회 몫을 남김)
+            }
+        # 긴 prefix부터 매칭
+        self.endpoint_buckets = {
+            prefix: TokenBucket(rate, burst)
+            for prefix, (rate, burst) in sorted(endpoint_budgets.items(), key=lambda x: -len(x[0]))
+        }
+
+        self._stats = {}
+
+    @staticmethod
+    def lane_for(endpoint: str) -> str:
+        """엔드포인트로 레인 결정"""
+        if endpoint.startswith('/trade/'):
+            return 'order'
+        if endpoint.startswith('/info/'):
+            return 'private'
+        return 'public'
+
+    def _endpoint_key(self, endpoint: str) -> Optional[str]:
+        for prefix in self.endpoint_buckets:
+            if endpoint.startswith(prefix):
+                return prefix
+        return None
+
+    def _own_wait(self, now: float, lane: str, endpoint_key: Optional[str]) -> float:
+        """레인/엔드포인트 한도 때문에 기다려야 하는 시간"""
+        wait = 0.0
+        lane_bucket = self.lane_buckets.get(lane)
+        if lane_bucket is not None:
+            wait = max(wait, lane_bucket.wait_time(now))
+        if endpoint_key is not None:
+            wait = max(wait, self.endpoint_buckets[endpoint_key].wait_time(now))
+        return wait
+
+    def _try_take(self, ticket: Tuple, now: float) -> float:
+        """
+        토큰 획득 시도 (락을 잡은 상태에서 호출)
+
+        Returns:
+            0이면 획득 성공, 아니면 다시 시도할 때까지 대기 시간 (초)
+        """
+        priority, seq, endpoint_key, lane = ticket
+
+        wait = self._own_wait(now, lane, endpoint_key)
+        if wait > 0:
+            return wait
+
+        # global 토큰을 기다리는 상위 레인 요청이나 같은 레인의 먼저 온 요청이 있으면 양보
+        for other in self._waiting:
+            if other[:2] < (priority, seq) and self._own_wait(now, other[3], other[2]) == 0:
+                return 0.002
+
+        reserve = 0.0 if lane == 'order' else self.order_reserve
+        wait = self.global_bucket.wait_time(now, reserve=reserve)
+        if wait > 0:
+            return wait
+
+        self.global_bucket.consume()
+        if lane in self.lane_buckets:
+            self.lane_buckets[lane].consume()
+        if endpoint_key is not None:
+            self.endpoint_buckets[endpoint_key].consume()
+        return 0.0
+
+    def _remove(self, ticket: Tuple):
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+
+    def _record(self, lane: str, endpoint: str, waited: float):
+        for key in (f"lane:{lane}", f"endpoint:{self._endpoint_key(endpoint) or endpoint}"):
+            stat = self._stats.setdefault(key, {'count': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            stat['count'] += 1
+            stat['total_wait'] += waited
+            stat['max_wait'] = max(stat['max_wait'], waited)
+
+    def _new_ticket(self, endpoint: str, lane: Optional[str]) -> Tuple:
+        lane = lane or self.lane_for(endpoint)
+        return (LANE_PRIORITY.get(lane, len(LANE_PRIORITY)), next(self._seq), self._endpoint_key(endpoint), lane)
+
+    def acquire(self, endpoint: str, lane: Optional[str] = None) -> float:
+        """
+        요청 전 토큰 획득 (필요하면 블로킹 대기)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        start = time.monotonic()
+
+        with self._cond:
+            ticket = self._new_ticket(endpoint, lane)
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait = self._try_take(ticket, time.monotonic())
+                    if wait == 0:
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._remove(ticket)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._record(ticket[3], endpoint, waited)
+
+        return waited
+
+    async def acquire_async(self, endpoint: str, lane: Optional[str] = None) -> float:
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+        start = time.monotonic()
+
+        with self._cond:
+            ticket = self._new_ticket(endpoint, lane)
+            heapq.heappush(self._waiting, ticket)
+
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(ticket, time.monotonic())
+                if wait == 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._remove(ticket)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._record(ticket[3], endpoint, waited)
+
+        return waited
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        레인/엔드포인트별 대기 시간 통계
+
+        Returns:
+            {"lane:order": {"count", "avg_wait_ms", "max_wait_ms"}, ...}
+        """
+        with self._cond:
+            return {
+                key: {
+                    'count': stat['count'],
+                    'avg_wait_ms': stat['total_wait'] / stat['count'] * 1000 if stat['count'] else 0.0,
+                    'max_wait_ms': stat['max_wait'] * 1000
+                }
+                for key, stat in self._stats.items()
+            }
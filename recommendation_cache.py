@@ -0,0 +1,234 @@
+"""
+GPT 추천 결과 캐시
+연속된 스캔은 후보 코인과 지표가 거의 같은 경우가 많으므로,
+후보 집합 + 구간화한 지표로 만든 지문(fingerprint)이 같거나 지표 차이가 허용 오차 안이면
+OpenAI 호출 없이 직전 추천을 재사용합니다.
+"""
+
+import copy
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+# 지문에 쓰는 지표와 허용 오차 (구간 폭) - 이 이내 차이는 같은 입력으로 봄
+FEATURE_TOLERANCES = {
+    'price': 0.5,              # 가격 (% - 로그 가격 차이)
+    'price_change_24h': 1.0,   # 24시간 가격 변동 (%p)
+    'volume_change': 10.0,     # 거래량 증가율 (%p)
+    'surge_zscore': 1.0,       # 평소 대비 거래량 z-score
+    'ind_rsi': 5.0,            # RSI
+    'spread_pct': 0.1          # 호가 스프레드 (%p)
+}
+
+
+def _feature_vector(candidates: List[Dict]) -> List[List[Optional[float]]]:
+    """후보별 지표 값 (코인 심볼 순서, 없는 값은 None)"""
+    vectors = []
+    for coin_info in sorted(candidates, key=lambda c: c['coin']):
+        vector = []
+        for key in FEATURE_TOLERANCES:
+            value = coin_info.get(key)
+            if value is None or not math.isfinite(value):
+                vector.append(None)
+            elif key == 'price':
+                vector.append(math.log(value) * 100 if value > 0 else None)
+            else:
+                vector.append(float(value))
+        vectors.append(vector)
+    return vectors
+
+
+def _fingerprint(coins: List[str], features: List[List[Optional[float]]]) -> str:
+    """후보 집합 + 구간 번호 해시"""
+    bins = [[None if value is None else math.floor(value / tolerance)
+             for value, tolerance in zip(vector, FEATURE_TOLERANCES.values())]
+            for vector in features]
+    raw = json.dumps([coins, bins], separators=(',', ':'))
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def _within_tolerance(a: List[List[Optional[float]]], b: List[List[Optional[float]]]) -> bool:
+    for vector_a, vector_b in zip(a, b):
+        for value_a, value_b, tolerance in zip(vector_a, vector_b, FEATURE_TOLERANCES.values()):
+            if value_a is None or value_b is None:
+                if value_a is not value_b:
+                    return False
+            elif abs(value_a - value_b) > tolerance:
+                return False
+    return True
+
+
+class RecommendationCache:
+    """
+    TTL + LRU 추천 캐시 (스레드 안전)
+
+    조회 순서:
+        1. 지문 일치 (후보 집합이 같고 모든 지표가 같은 구간)
+        2. 후보 집합이 같은 항목 중 모든 지표 차이가 허용 오차 이내 (구간 경계에 걸친 경우)
+
+    Args:
+        ttl: 추천 재사용 시간 (초)
+        max_entries: 최대 항목 수 (넘으면 가장 오래 안 쓴 항목 삭제)
+        path: 저장 파일 (JSON, 지정하면 추가될 때마다 저장하고 재시작 시 불러옴)
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 128, path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_latency_ms = 0.0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def get(self, candidates: List[Dict]) -> Optional[Dict]:
+        """
+        캐시된 추천 조회
+
+        Returns:
+            추천 결과 사본 (없거나 만료되면 None)
+        """
+        coins = sorted(c['coin'] for c in candidates)
+        features = _feature_vector(candidates)
+        key = _fingerprint(coins, features)
+        now = time.time()
+
+        with self._lock:
+            self._expire(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+            else:
+                entry = next((e for e in reversed(self._entries.values())
+                              if e['coins'] == coins and _within_tolerance(e['features'], features)), None)
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self.near_hits += 1
+
+            self._entries.move_to_end(entry['key'])
+            entry['hits'] += 1
+            self.saved_latency_ms += entry['latency_ms']
+            return copy.deepcopy(entry['result'])
+
+    def put(self, candidates: List[Dict], result: Dict, latency_ms: float = 0.0):
+        """
+        추천 결과 저장
+
+        Args:
+            latency_ms: 이 추천을 받는 데 걸린 시간 (재사용 시 절약 시간으로 집계)
+        """
+        coins = sorted(c['coin'] for c in candidates)
+        features = _feature_vector(candidates)
+        key = _fingerprint(coins, features)
+
+        with self._lock:
+            self._entries[key] = {
+                'key': key,
+                'coins': coins,
+                'features': features,
+                'result': copy.deepcopy(result),
+                'created': time.time(),
+                'latency_ms': latency_ms,
+                'hits': 0
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            if self.path:
+                self._save()
+
+    def _expire(self, now: float):
+        """만료 항목 삭제 (락 안에서 호출)"""
+        expired = [key for key, entry in self._entries.items() if now - entry['created'] >= self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def _save(self):
+        """파일 저장 (락 안에서 호출, 임시 파일 후 교체)"""
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.values()), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"추천 캐시 저장 오류: {str(e)}")
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"추천 캐시 불러오기 오류: {str(e)}")
+            return
+
+        # 저장 당시 LRU 순서 유지, 만료된 항목은 버림
+        for entry in entries[-self.max_entries:]:
+            self._entries[entry['key']] = entry
+        self._expire(time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                self._save()
+
+    def get_stats(self) -> Dict:
+        """재사용 횟수/비율, 절약한 GPT 대기 시간"""
+        with self._lock:
+            reused = self.hits + self.near_hits
+            total = reused + self.misses
+            return {
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': reused / total * 100 if total else 0.0,
+                'saved_latency_ms': self.saved_latency_ms,
+                'evictions': self.evictions,
+                'entries': len(self._entries)
+            }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(prefix='rec_cache_'), 'cache.json')
+    cache = RecommendationCache(ttl=30, path=path)
+
+    candidates = [
+        {'coin': 'XRP', 'price': 1500, 'price_change_24h': 5.2, 'volume_change': 45.3},
+        {'coin': 'ADA', 'price': 800, 'price_change_24h': 8.7, 'volume_change': 32.1}
+    ]
+    result = {'selected_coin': 'XRP', 'confidence': 80, 'reason': '테스트',
+              'entry_timing': '즉시', 'risk_level': '중간'}
+
+    print(f"첫 조회: {cache.get(candidates)}")
+    cache.put(candidates, result, latency_ms=1800)
+
+    # 가격 0.1% 변화 -> 같은 구간 / 거래량 증가율 구간 경계 넘음 -> 허용 오차로 재사용
+    nearby = [dict(candidates[0], price=1501.5), dict(candidates[1], volume_change=29.5)]
+    print(f"순서만 바뀐 후보: {cache.get(list(reversed(candidates)))['selected_coin']}")
+    print(f"거의 같은 후보: {cache.get(nearby)['selected_coin']}")
+    print(f"달라진 후보: {cache.get([dict(candidates[0], price_change_24h=9.0), candidates[1]])}")
+
+    restored = RecommendationCache(ttl=30, path=path)
+    print(f"재시작 후: {restored.get(candidates)['selected_coin']}")
+    print(cache.get_stats())
@@ -4,20 +4,120 @@
 """
 
 from openai import OpenAI
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Tuple
 import json
+import threading
+import time
+import fallback_ranker
+from ensemble import STRATEGIES, EnsembleMember, EnsembleStats, combine
+from latency_tracker import LatencyTracker
+from recommendation_cache import RecommendationCache
+from prompt_builder import SCALPING_SYSTEM_PROMPT, PromptUsage, build_candidate_table, estimate_tokens
+from streaming_json import StreamingJSONObject, extract_json
+
+
+# 기존 서술형 프롬프트의 시스템 메시지 (prompt_style='verbose'에서 압축 전후 비교용)
+VERBOSE_SYSTEM_PROMPT = """당신은 암호화폐 단타 매매 전문가입니다.
+거래량이 급증한 코인들 중에서 단기 수익을 낼 가능성이 높은 코인을 선택해야 합니다.
 
+반드시 다음 JSON 형식으로만 답변하세요:
 
-class ScalpingAnalyzer:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+{
+    "selected_coin": "코인 심볼 (예: XRP)",
+    "entry_timing": "즉시" 또는 "조정 대기",
+    "confidence": 0~100 사이의 숫자 (추천 확신도),
+    "risk_level": "낮음" 또는 "중간" 또는 "높음",
+    "reason": "추천 이유를 한국어로 간단히 설명 (2-3문장)"
+}
+
+필드는 위 순서 그대로 쓰고, reason은 반드시 마지막에 쓰세요.
+
+분석 기준:
+1. 거래량 증가율 (높을수록 좋음)
+2. 가격 변동률 (너무 과열되지 않은 것)
+3. 거래대금 (충분한 유동성)
+4. 단기 모멘텀 지속 가능성
+5. 리스크 수준 (과도한 급등은 위험)
+
+주의사항:
+- 이미 30% 이상 급등한 코인은 주의
+- 거래대금이 너무 적은 코인은 피하기
+- 여러 후보 중 가장 안정적이면서 모멘텀 있는 것 선택"""
+
+# 스트리밍 모드에서 이 필드들이 도착하면 reason/risk_level을 기다리지 않고 결정
+DECISION_FIELDS = ('selected_coin', 'entry_timing', 'confidence')
+
+# 기한을 넘긴 요청도 기한의 이 배수 안에는 끝냄 (작업 스레드를 오래 붙잡지 않도록)
+LATE_TIMEOUT_FACTOR = 3
 
-    def recommend_coin(self, candidates: List[Dict]) -> Optional[Dict]:
+
+class ScalpingAnalyzer:
+    def __init__(self, api_key: str, cache: Optional[RecommendationCache] = None,
+                 deadline: float = 5.0, request_timeout: float = 30.0,
+                 latency: Optional[LatencyTracker] = None, prompt_style: str = 'compact',
+                 token_budget: int = 400, usage: Optional[PromptUsage] = None, stream: bool = False,
+                 ensemble: Optional[List[EnsembleMember]] = None, strategy: str = 'first_valid',
+                 quorum: Optional[int] = None, model: str = "gpt-4o-mini"):
+        """
+        Args:
+            cache: 거의 같은 후보에 대한 추천 재사용 (없으면 매번 GPT 호출)
+            deadline: GPT 응답 대기 한도 (초) - 넘으면 규칙 기반 추천으로 결정
+            request_timeout: OpenAI 요청 타임아웃 상한 (초) - 요청마다 기한의 LATE_TIMEOUT_FACTOR배로 더 줄임
+            latency: 경로별 지연 시간 기록기 (기본: 새로 생성)
+            prompt_style: 'compact' (후보 표 + 고정 시스템 프롬프트) 또는 'verbose' (기존 서술형)
+            token_budget: compact 후보 표의 토큰 예산
+            usage: 호출별 토큰/시간 기록기 (기본: 새로 생성)
+            stream: 응답을 스트리밍으로 받아 결정 필드(DECISION_FIELDS)가 도착하는 즉시 반환
+                    (나머지 응답은 백그라운드에서 받아 캐시에 저장)
+            ensemble: 같은 후보를 동시에 보낼 모델/프롬프트 형식 목록 (지정하면 model/prompt_style/stream 대신 사용)
+            strategy: 앙상블 결합 방식 - 'first_valid', 'quorum', 'weighted' (ensemble.py)
+            quorum: quorum 방식의 정족수 (기본: 과반)
+        """
+        if prompt_style not in ('compact', 'verbose'):
+            raise ValueError(f"지원하지 않는 프롬프트 형식: {prompt_style}")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 앙상블 결합 방식: {strategy}")
+        for member in ensemble or []:
+            if member.prompt_style not in ('compact', 'verbose'):
+                raise ValueError(f"지원하지 않는 프롬프트 형식: {member.prompt_style} ({member.name})")
+
+        self.client = OpenAI(api_key=api_key, timeout=request_timeout)
+        self.request_timeout = request_timeout
+        self.model = model
+        self.prompt_style = prompt_style
+        self.token_budget = token_budget
+        self.stream = stream
+        self.usage = usage or PromptUsage()
+        self.cache = cache
+        self.deadline = deadline
+        self.latency = latency or LatencyTracker()
+        self.ensemble = ensemble or None
+        self.strategy = strategy
+        self.quorum = quorum
+        self.ensemble_stats = EnsembleStats() if self.ensemble else None
+
+        # GPT 호출은 별도 스레드에서 (기한을 넘긴 호출은 백그라운드에서 끝나고 캐시만 채움)
+        # 기한을 넘긴 호출은 최대 LATE_TIMEOUT_FACTOR배 기한 동안 스레드를 붙잡으므로, 기한마다 1번씩
+        # 호출해도 기다리지 않도록 멤버당 LATE_TIMEOUT_FACTOR + 1개
+        # 그래도 빈 스레드가 없으면 큐에서 기다리지 않고 바로 규칙 기반 추천 (stats['pool_full'])
+        self._max_workers = len(self.ensemble or [None]) * (LATE_TIMEOUT_FACTOR + 1)
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='gpt')
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+        self.stats = {'gpt': 0, 'cache': 0, 'fallback': 0, 'timeouts': 0, 'late_responses': 0, 'pool_full': 0}
+
+    def recommend_coin(self, candidates: List[Dict], deadline: Optional[float] = None) -> Optional[Dict]:
         """
         거래량 급증 코인 후보들 중 최적의 매수 종목 추천
 
+        GPT가 deadline초 안에 답하지 않거나 실패하면 같은 후보 지표로
+        규칙 기반 추천(fallback_ranker)을 반환합니다.
+
         Args:
             candidates: 거래량 급증 코인 리스트
+            deadline: 이번 호출의 GPT 응답 대기 한도 (초, 기본: self.deadline)
 
         Returns:
             {
@@ -25,70 +125,213 @@ class ScalpingAnalyzer:
                 "confidence": 85,
                 "reason": "추천 이유",
                 "entry_timing": "즉시" | "조정 대기",
-                "risk_level": "낮음" | "중간" | "높음"
+                "risk_level": "낮음" | "중간" | "높음",
+                "source": "gpt" | "cache" | "fallback",
+                "latency_ms": 결정까지 걸린 시간,
+                "fallback_reason": 규칙 기반으로 결정한 이유 (source가 fallback일 때)
             }
+            스트리밍 모드에서 결정 필드만 먼저 도착한 경우 reason/risk_level은 None일 수 있고
+            "streamed": True가 붙습니다.
+            앙상블이면 "ensemble": {"strategy", "responses", "members", "picks": {멤버: 코인}}가 붙습니다.
         """
-        try:
-            if not candidates:
-                return None
+        if not candidates:
+            return None
 
-            # 후보 코인 정보를 텍스트로 변환
-            prompt = self._create_recommendation_prompt(candidates)
-
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 암호화폐 단타 매매 전문가입니다.
-거래량이 급증한 코인들 중에서 단기 수익을 낼 가능성이 높은 코인을 선택해야 합니다.
+        started = time.perf_counter()
+        deadline = self.deadline if deadline is None else deadline
+
+        if self.cache is not None:
+            cached = self.cache.get(candidates)
+            if cached is not None:
+                return self._tag(cached, 'cache', started)
+
+        if not self._reserve(len(self.ensemble or [None])):
+            # 기한을 넘긴 호출들이 작업 스레드를 모두 쓰는 중 - 큐에서 기다려 봐야 기한을 넘김
+            self.stats['pool_full'] += 1
+            result = None
+            fallback_reason = f'GPT 작업 스레드 부족 ({self._max_workers}개 모두 사용 중)'
+        elif self.ensemble:
+            result, fallback_reason = self._recommend_ensemble(candidates, started, deadline)
+        else:
+            if self.stream:
+                # 결정 필드가 도착하면 작업 스레드가 먼저 채워 넣음 (응답 전체는 계속 받음)
+                decision = Future()
+                self._submit(self._recommend_gpt, candidates, started + deadline, decision)
+            else:
+                decision = self._submit(self._recommend_gpt, candidates, started + deadline)
+            try:
+                result = decision.result(timeout=deadline)
+                fallback_reason = 'GPT 추천 실패'
+            except FutureTimeoutError:
+                result = None
+                fallback_reason = f'GPT 응답 {deadline:.1f}초 초과'
+                self.stats['timeouts'] += 1
+
+        if result is not None:
+            return self._tag(result, 'gpt', started)
+
+        result = fallback_ranker.recommend(candidates)
+        result['fallback_reason'] = fallback_reason
+        return self._tag(result, 'fallback', started)
+
+    def _reserve(self, count: int) -> bool:
+        """작업 스레드 count개 예약 (빈 스레드가 모자라면 예약하지 않고 False)"""
+        with self._in_flight_lock:
+            if self._in_flight + count > self._max_workers:
+                return False
+            self._in_flight += count
+            return True
+
+    def _submit(self, fn, *args) -> Future:
+        """예약한 작업 스레드로 실행 (끝나면 예약 해제)"""
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _tag(self, result: Dict, source: str, started: float) -> Dict:
+        """결정 경로/지연 시간 기록"""
+        latency_ms = (time.perf_counter() - started) * 1000
+        result['source'] = source
+        result['latency_ms'] = latency_ms
+        self.stats[source] += 1
+        self.latency.record(source, latency_ms)
+        return result
+
+    def _recommend_ensemble(self, candidates: List[Dict], started: float,
+                            deadline: float) -> Tuple[Optional[Dict], str]:
+        """
+        멤버 동시 호출 후 self.strategy로 결합 (공동 기한까지, 결정할 수 있으면 바로 반환)
 
-반드시 다음 JSON 형식으로만 답변하세요:
+        Returns:
+            (결합한 추천, 결정하지 못한 경우 규칙 기반 대체 이유)
+        """
+        decided = []  # 결정한 코인 (결정 이후 끝난 멤버의 일치 여부를 완료 콜백에서 확인)
+
+        def on_done(member: EnsembleMember, future: Future):
+            result, latency_ms = future.result()
+            late = bool(decided)
+            agree = late and result is not None and result['selected_coin'] == decided[0]
+            self.ensemble_stats.record_member(member.name, latency_ms, result is not None, late=late, agree=agree)
+
+        futures = {}
+        for member in self.ensemble:
+            future = self._submit(self._ask_member, member, candidates, started + deadline)
+            futures[future] = member
+            future.add_done_callback(lambda f, m=member: on_done(m, f))
+
+        arrived = []
+        result = None
+        pending = set(futures)
+        while pending and result is None:
+            remaining = started + deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: self.ensemble.index(futures[f])):
+                arrived.append((futures[future], future.result()[0]))
+            result = combine(self.strategy, self.ensemble, arrived, self.quorum, final=not pending)
+
+        if result is None:
+            # 기한 초과 - 도착한 응답만으로 (quorum은 정족수를 못 채우면 결정하지 않음)
+            result = combine(self.strategy, self.ensemble, arrived, self.quorum, final=True)
+        decided.append(result['selected_coin'] if result else None)
+        if result is None:
+            if not any(r is not None for _, r in arrived):
+                if pending:
+                    self.stats['timeouts'] += 1
+                    return None, f'GPT 응답 {deadline:.1f}초 초과 (앙상블 {len(arrived)}/{len(self.ensemble)} 응답)'
+                return None, 'GPT 추천 실패 (앙상블 전원)'
+            return None, f'앙상블 정족수 미달 ({len(arrived)}/{len(self.ensemble)} 응답)'
+
+        self.ensemble_stats.record_decision(result, arrived)
+        if self.cache is not None:
+            self.cache.put(candidates, result, latency_ms=(time.perf_counter() - started) * 1000)
+        result['ensemble'] = {
+            'strategy': self.strategy,
+            'responses': sum(r is not None for _, r in arrived),
+            'members': len(self.ensemble),
+            'picks': {m.name: r['selected_coin'] if r else None for m, r in arrived}
+        }
+        return result, ''
 
-{
-    "selected_coin": "코인 심볼 (예: XRP)",
-    "confidence": 0~100 사이의 숫자 (추천 확신도),
-    "reason": "추천 이유를 한국어로 간단히 설명 (2-3문장)",
-    "entry_timing": "즉시" 또는 "조정 대기",
-    "risk_level": "낮음" 또는 "중간" 또는 "높음"
-}
+    def _ask_member(self, member: EnsembleMember, candidates: List[Dict], due: float) -> Tuple[Optional[Dict], float]:
+        """앙상블 멤버 1개 호출 (작업 스레드에서 실행) - (올바른 응답 또는 None, 걸린 시간 ms)"""
+        started = time.perf_counter()
+        result = self._recommend_gpt(candidates, due, member=member)
+        return result, (time.perf_counter() - started) * 1000
 
-분석 기준:
-1. 거래량 증가율 (높을수록 좋음)
-2. 가격 변동률 (너무 과열되지 않은 것)
-3. 거래대금 (충분한 유동성)
-4. 단기 모멘텀 지속 가능성
-5. 리스크 수준 (과도한 급등은 위험)
+    def _recommend_gpt(self, candidates: List[Dict], due: float, decision: Optional[Future] = None,
+                       member: Optional[EnsembleMember] = None) -> Optional[Dict]:
+        """
+        GPT 추천 1회 (작업 스레드에서 실행)
 
-주의사항:
-- 이미 30% 이상 급등한 코인은 주의
-- 거래대금이 너무 적은 코인은 피하기
-- 여러 후보 중 가장 안정적이면서 모멘텀 있는 것 선택"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_completion_tokens=500
-            )
-
-            # GPT 응답 파싱
-            result_text = response.choices[0].message.content.strip()
-
-            # JSON 추출
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(result_text)
+        기한을 넘겨 도착한 응답도 캐시에 저장하여 다음 스캔에서 재사용합니다.
+
+        Args:
+            decision: 스트리밍 모드의 결정 전달용 (결정 필드가 도착하면 바로, 실패하면 None을 넣음)
+            member: 앙상블 멤버 (모델/프롬프트 형식을 멤버 설정으로, 캐시 저장/지연 기록은 앙상블에서)
+        """
+        result_text = ''
+        started = time.perf_counter()
+        # 기한을 넘긴 요청도 기한의 LATE_TIMEOUT_FACTOR배 안에 끝내 작업 스레드를 돌려받음
+        # (재시도하면 그만큼 길어지므로 재시도 없이)
+        client = self.client.with_options(
+            timeout=min(self.request_timeout, LATE_TIMEOUT_FACTOR * max(due - started, 0.1)), max_retries=0)
+        model = member.model if member else self.model
+        prompt_style = member.prompt_style if member else self.prompt_style
+        try:
+            # 후보 코인 정보를 텍스트로 변환
+            if prompt_style == 'compact':
+                built = build_candidate_table(candidates, token_budget=self.token_budget)
+                system_prompt = SCALPING_SYSTEM_PROMPT
+                prompt = built.text + "\n\n위 후보들 중 단타 매매에 가장 적합한 코인 1개를 선택하고 분석해주세요."
+            else:
+                system_prompt = VERBOSE_SYSTEM_PROMPT
+                prompt = self._create_recommendation_prompt(candidates)
+
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+            if decision is None:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_completion_tokens=500
+                )
+                usage = getattr(response, 'usage', None)
+                result_text = response.choices[0].message.content.strip()
+                kind = f"ensemble/{member.name}" if member else f"recommend/{prompt_style}"
+            else:
+                parser, usage = self._stream_recommendation(client, messages, decision, started)
+                result_text = parser.text
+                kind = f"recommend/{prompt_style}/stream"
+            self.usage.record(kind, model, usage, (time.perf_counter() - started) * 1000,
+                              estimate_tokens(system_prompt) + estimate_tokens(prompt))
+
+            # JSON 추출 (마크다운 코드 블록/앞뒤 설명 무시)
+            result = extract_json(result_text)
 
             # 결과 검증
             if not self._validate_recommendation(result):
                 print("GPT 응답 형식이 올바르지 않습니다.")
                 return None
 
+            if member is not None:
+                return result
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            if self.cache is not None:
+                self.cache.put(candidates, result, latency_ms=latency_ms)
+            if time.perf_counter() > due:
+                self.stats['late_responses'] += 1
+            if decision is not None and not decision.done():
+                decision.set_result(dict(result))
+
             return result
 
         except json.JSONDecodeError as e:
@@ -98,6 +341,46 @@ class ScalpingAnalyzer:
         except Exception as e:
             print(f"GPT 분석 오류: {str(e)}")
             return None
+        finally:
+            # GPT 왕복 시간 (기한 초과 여부와 무관하게 끝난 시점 기준, 스트리밍이면 응답 전체 수신까지)
+            if member is None:
+                self.latency.record('gpt_call', (time.perf_counter() - started) * 1000)
+            if decision is not None and not decision.done():
+                decision.set_result(None)
+
+    def _stream_recommendation(self, client: OpenAI, messages: List[Dict], decision: Future,
+                               started: float) -> Tuple[StreamingJSONObject, Any]:
+        """
+        스트리밍 응답 수신 - 결정 필드가 모두 도착하고 값이 올바르면 decision에 먼저 결과를 넣음
+
+        Returns:
+            (응답 전체를 넣은 파서, 토큰 사용량)
+        """
+        parser = StreamingJSONObject()
+        usage = None
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_completion_tokens=500,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            # 사용량은 choices가 빈 마지막 조각에만 옴
+            if getattr(chunk, 'usage', None):
+                usage = chunk.usage
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+
+            parser.feed(chunk.choices[0].delta.content)
+            if not decision.done() and parser.has(*DECISION_FIELDS):
+                early = {'reason': None, 'risk_level': None, **parser.fields, 'streamed': True}
+                if self._validate_decision(early):
+                    # 결정까지 걸린 시간 (응답 전체 시간 gpt_call과 따로 기록)
+                    self.latency.record('gpt_decision', (time.perf_counter() - started) * 1000)
+                    decision.set_result(early)
+
+        return parser, usage
 
     def _create_recommendation_prompt(self, candidates: List[Dict]) -> str:
         """후보 코인 정보를 프롬프트로 변환"""
@@ -110,6 +393,16 @@ class ScalpingAnalyzer:
 
             if 'volume_change' in coin:
                 prompt += f"- 거래량 증가율: {coin['volume_change']:+.2f}%\n"
+            if coin.get('surge_zscore') is not None:
+                prompt += f"- 평소 대비 거래량 급증: z-score {coin['surge_zscore']:.1f}"
+                if coin.get('surge_percentile') is not None:
+                    prompt += f" (상위 {100 - coin['surge_percentile']:.1f}%)"
+                prompt += "\n"
+
+            windows = [(key[len('volume_change_'):], value) for key, value in coin.items()
+                       if key.startswith('volume_change_') and value is not None]
+            if windows:
+                prompt += "- 구간별 거래량 변화: " + ", ".join(f"{label} {value:+.2f}%" for label, value in windows) + "\n"
 
             if 'trade_value_24h' in coin:
                 prompt += f"- 24시간 거래대금: {coin['trade_value_24h']/100000000:,.0f}억원\n"
@@ -117,12 +410,51 @@ class ScalpingAnalyzer:
             if 'momentum_score' in coin:
                 prompt += f"- 모멘텀 스코어: {coin['momentum_score']:.2f}\n"
 
+            if coin.get('candle_return_pct') is not None:
+                prompt += f"- 최근 {coin['candle_bars']}개 {coin['candle_interval']}봉 수익률: {coin['candle_return_pct']:+.2f}%\n"
+                if coin.get('candle_volume_ratio') is not None:
+                    prompt += f"- 최근 거래량 배수 (직전 평균 대비): {coin['candle_volume_ratio']:.2f}배\n"
+
+            bar_returns = [(key[len('bar_return_'):], value) for key, value in coin.items()
+                           if key.startswith('bar_return_') and value is not None]
+            if bar_returns:
+                prompt += "- 직전 봉 대비: " + ", ".join(f"{label} {value:+.2f}%" for label, value in bar_returns) + "\n"
+
+            if coin.get('ind_rsi') is not None:
+                prompt += f"- RSI: {coin['ind_rsi']:.1f}"
+                if coin.get('ind_ema_gap_pct') is not None:
+                    prompt += f" / EMA 단기-장기 괴리: {coin['ind_ema_gap_pct']:+.2f}%"
+                if coin.get('ind_vwap_gap_pct') is not None:
+                    prompt += f" / VWAP 대비: {coin['ind_vwap_gap_pct']:+.2f}%"
+                prompt += "\n"
+                if coin.get('ind_bb_pct_b') is not None:
+                    prompt += f"- 볼린저 %B: {coin['ind_bb_pct_b']:.2f}"
+                    if coin.get('ind_atr_pct') is not None:
+                        prompt += f" / ATR: {coin['ind_atr_pct']:.2f}%"
+                    if coin.get('ind_volume_zscore') is not None:
+                        prompt += f" / 거래량 z-score: {coin['ind_volume_zscore']:+.2f}"
+                    prompt += "\n"
+
+            if 'spread_pct' in coin:
+                prompt += f"- 호가 스프레드: {coin['spread_pct']:.2f}%\n"
+                prompt += f"- 호가 잔량: 매수 {coin['bid_depth_krw']/10000:,.0f}만원 / 매도 {coin['ask_depth_krw']/10000:,.0f}만원\n"
+
             prompt += "\n"
 
         prompt += "\n위 후보들 중 단타 매매에 가장 적합한 코인 1개를 선택하고 분석해주세요."
 
         return prompt
 
+    def _validate_decision(self, result: Dict) -> bool:
+        """결정 필드 검증 (스트리밍 중 reason 도착 전에도 사용)"""
+        if not isinstance(result['confidence'], (int, float)) or not (0 <= result['confidence'] <= 100):
+            return False
+
+        if result['entry_timing'] not in ['즉시', '조정 대기']:
+            return False
+
+        return True
+
     def _validate_recommendation(self, result: Dict) -> bool:
         """GPT 응답 검증"""
         required_keys = ['selected_coin', 'confidence', 'reason', 'entry_timing', 'risk_level']
@@ -131,10 +463,7 @@ class ScalpingAnalyzer:
             if key not in result:
                 return False
 
-        if not (0 <= result['confidence'] <= 100):
-            return False
-
-        if result['entry_timing'] not in ['즉시', '조정 대기']:
+        if not self._validate_decision(result):
             return False
 
         if result['risk_level'] not in ['낮음', '중간', '높음']:
@@ -9,7 +9,13 @@ import time
 from datetime import datetime
 from dotenv import load_dotenv
 from bithumb_api import BithumbAPI
+from rate_limiter import PriorityRateLimiter
+from market_data_cache import MarketDataCache
 from volume_scanner import VolumeScanner
+from scanner_worker import ScannerWorker
+from snapshot_recorder import SnapshotRecorder
+from candle_store import CandleStore, CandleIngestor
+from indicators import IndicatorEngine
 from scalping_analyzer import ScalpingAnalyzer
 from trading_logger import TradingLogger
 from typing import Optional, Dict
@@ -20,12 +26,30 @@ class ScalpingBot:
         # 환경 변수 로드
         load_dotenv()
 
-        # API 초기화
+        # API 초기화 (스캐너/모니터링/주문이 같은 요청 한도를 공유)
+        self.rate_limiter = PriorityRateLimiter()
+        self.market_cache = MarketDataCache()  # 스캔/매수/매도가 같은 시세를 중복 조회하지 않도록 공유
         self.bithumb = BithumbAPI(
             api_key=os.getenv('BITHUMB_API_KEY'),
-            secret_key=os.getenv('BITHUMB_SECRET_KEY')
+            secret_key=os.getenv('BITHUMB_SECRET_KEY'),
+            rate_limiter=self.rate_limiter,
+            cache=self.market_cache,
+            base_url=os.getenv('BITHUMB_BASE_URL')  # 로컬 대역 서버로 벤치마크할 때 지정
         )
-        self.scanner = VolumeScanner()
+        # SNAPSHOT_DIR을 지정하면 스캔한 전체 시세를 일자별 바이너리 파일로 기록 (백테스트용)
+        recorder = SnapshotRecorder(os.getenv('SNAPSHOT_DIR')) if os.getenv('SNAPSHOT_DIR') else None
+        # INDICATOR_STATE를 지정하면 지표 워밍업 상태를 종료 시 저장하고 다음 실행에서 이어서 사용
+        self.indicator_state = os.getenv('INDICATOR_STATE')
+        if self.indicator_state and os.path.exists(self.indicator_state):
+            indicators = IndicatorEngine.load(self.indicator_state)
+        else:
+            indicators = IndicatorEngine()
+        self.scanner = VolumeScanner(api=self.bithumb, recorder=recorder, indicators=indicators)
+
+        # CANDLE_DB를 지정하면 후보 코인의 1분봉을 SQLite에 적재해 GPT 분석에 사용
+        self.candles = None
+        if os.getenv('CANDLE_DB'):
+            self.candles = CandleIngestor(self.bithumb, CandleStore(os.getenv('CANDLE_DB')), interval='1m')
         self.gpt = ScalpingAnalyzer(api_key=os.getenv('OPENAI_API_KEY'))
         self.logger = TradingLogger()
 
@@ -36,6 +60,12 @@ class ScalpingBot:
         self.scan_interval = 60   # 종목 스캔 주기 (초)
         self.monitor_interval = 5 # 포지션 모니터링 주기 (초)
 
+        # 백그라운드 스캐너 (GPT 분석/포지션 보유 중에도 계속 스캔)
+        self.scanner_worker = None
+        self._scan_version = 0
+        if os.getenv('SCANNER_WORKER', 'true').lower() == 'true':
+            self.scanner_worker = ScannerWorker(self.scanner, interval=self.scan_interval)
+
         # 포지션 정보
         self.position = None  # {'coin': 'XRP', 'entry_price': 1500, 'amount': 0.5}
 
@@ -55,8 +85,16 @@ class ScalpingBot:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 거래량 급증 코인 스캔 중...")
         print("="*80)
 
-        # 1. 모멘텀 상위 코인 조회
-        momentum_coins = self.scanner.get_top_momentum_coins(top_n=5)
+        # 1. 모멘텀 상위 코인 조회 (백그라운드 스캐너가 있으면 최신 결과 사용)
+        if self.scanner_worker:
+            result = self.scanner_worker.wait_for_result(self._scan_version, timeout=self.scan_interval)
+            if result is None:
+                print("❌ 새 스캔 결과 없음")
+                return None
+            self._scan_version = result['version']
+            momentum_coins = result['momentum_coins']
+        else:
+            momentum_coins = self.scanner.get_top_momentum_coins(top_n=5)
 
         if not momentum_coins:
             print("❌ 거래 기회 없음")
@@ -65,6 +103,16 @@ class ScalpingBot:
         # 발견된 코인 출력
         self.scanner.print_momentum_report(momentum_coins)
 
+        # 스프레드/호가 잔량 필터 (전체 호가 1회 조회)
+        momentum_coins = self.scanner.filter_by_orderbook(momentum_coins)
+        if not momentum_coins:
+            print("❌ 유동성 조건을 만족하는 종목 없음")
+            return None
+
+        # 최근 1분봉 지표 (CANDLE_DB 지정 시, 후보 코인만 새 봉 적재)
+        if self.candles:
+            momentum_coins = self.scanner.attach_candles(momentum_coins, self.candles)
+
         # 2. GPT에게 최적 종목 추천 요청
         print("\n🤖 GPT 분석 중...")
         recommendation = self.gpt.recommend_coin(momentum_coins)
@@ -241,6 +289,9 @@ class ScalpingBot:
         """메인 실행 루프"""
         print("\n자동매매 시작... (Ctrl+C로 종료)\n")
 
+        if self.scanner_worker:
+            self.scanner_worker.start()
+
         try:
             while True:
                 # 포지션이 없으면 새로운 기회 찾기
@@ -256,7 +307,7 @@ class ScalpingBot:
                         else:
                             print(f"\n다음 스캔까지 {self.scan_interval}초 대기...")
                             time.sleep(self.scan_interval)
-                    else:
+                    elif not self.scanner_worker:
                         print(f"\n다음 스캔까지 {self.scan_interval}초 대기...")
                         time.sleep(self.scan_interval)
 
@@ -281,6 +332,12 @@ class ScalpingBot:
             if self.position:
                 print(f"⚠️  {self.position['coin']} 포지션 확인 필요!")
 
+        finally:
+            if self.scanner_worker:
+                self.scanner_worker.stop()
+            if self.indicator_state:
+                self.scanner.indicators.save(self.indicator_state)
+
 
 if __name__ == "__main__":
     bot = ScalpingBot()
@@ -6,11 +6,26 @@
 
 import os
 import time
+import numpy as np
 from datetime import datetime
 from dotenv import load_dotenv
 import pybithumb
+from pybithumb.core import BithumbHttp
+from bithumb_api import BithumbAPI
+from rate_limiter import PriorityRateLimiter
+from market_data_cache import MarketDataCache
+from market_data_feed import BithumbWebSocketFeed
 from volume_scanner import VolumeScanner
+from scanner_worker import ScannerWorker
+from snapshot_recorder import SnapshotRecorder
+from candle_store import CandleStore, CandleIngestor
+from indicators import IndicatorEngine
+from bar_resampler import BarResampler
 from scalping_analyzer import ScalpingAnalyzer
+from ensemble import parse_members
+from recommendation_cache import RecommendationCache
+from prescreen_model import PrescreenModel
+from next_entry_planner import NextEntryPlanner
 from trading_logger import TradingLogger
 from typing import Optional, Dict
 
@@ -23,18 +38,98 @@ class ScalpingBotV2:
         # API 초기화
         api_key = os.getenv('BITHUMB_API_KEY')
         secret_key = os.getenv('BITHUMB_SECRET_KEY')
+        base_url = os.getenv('BITHUMB_BASE_URL')  # 로컬 대역 서버로 벤치마크할 때 지정
+
+        if base_url:
+            # pybithumb은 API 주소가 고정되어 있어 클래스 속성을 교체
+            BithumbHttp.base_url = property(lambda _: base_url.rstrip('/'))
+
         self.bithumb = pybithumb.Bithumb(api_key, secret_key)
 
-        self.scanner = VolumeScanner()
-        self.gpt = ScalpingAnalyzer(api_key=os.getenv('OPENAI_API_KEY'))
+        # 스캐너 시세 조회에 요청 한도 적용
+        self.rate_limiter = PriorityRateLimiter()
+        self.market_cache = MarketDataCache()  # 스캔 경로 간 전체 시세, 모니터링/매도 간 현재가 공유
+        # SNAPSHOT_DIR을 지정하면 스캔한 전체 시세를 일자별 바이너리 파일로 기록 (백테스트용)
+        recorder = SnapshotRecorder(os.getenv('SNAPSHOT_DIR')) if os.getenv('SNAPSHOT_DIR') else None
+        # INDICATOR_STATE를 지정하면 지표 워밍업 상태를 종료 시 저장하고 다음 실행에서 이어서 사용
+        self.indicator_state = os.getenv('INDICATOR_STATE')
+        if self.indicator_state and os.path.exists(self.indicator_state):
+            indicators = IndicatorEngine.load(self.indicator_state)
+        else:
+            indicators = IndicatorEngine()
+        self.scanner = VolumeScanner(api=BithumbAPI(api_key, secret_key, rate_limiter=self.rate_limiter,
+                                                    base_url=base_url, cache=self.market_cache),
+                                     recorder=recorder, indicators=indicators)
+
+        # CANDLE_DB를 지정하면 후보 코인의 1분봉을 SQLite에 적재해 GPT 분석에 사용
+        self.candles = None
+        if os.getenv('CANDLE_DB'):
+            self.candles = CandleIngestor(self.scanner.api, CandleStore(os.getenv('CANDLE_DB')), interval='1m')
+        # GPT 추천 캐시 - 거의 같은 후보가 이어지면 GPT_CACHE_TTL초 동안 직전 추천 재사용 (0이면 사용 안 함)
+        self.recommendation_cache = None
+        if float(os.getenv('GPT_CACHE_TTL', 30)) > 0:
+            self.recommendation_cache = RecommendationCache(ttl=float(os.getenv('GPT_CACHE_TTL', 30)),
+                                                            path=os.getenv('GPT_CACHE_FILE'))
+        # GPT 응답을 GPT_DEADLINE초까지만 기다리고, 넘으면 규칙 기반 추천으로 결정
+        # PROMPT_STYLE=compact: 후보 표(GPT_TOKEN_BUDGET 토큰 이내) + 고정 시스템 프롬프트, verbose: 기존 서술형
+        # GPT_STREAM=true: 응답을 스트리밍으로 받아 코인/진입 타이밍/확신도가 도착하면 이유를 기다리지 않고 결정
+        # GPT_ENSEMBLE을 지정하면 여러 모델/프롬프트에 동시에 묻고 GPT_ENSEMBLE_STRATEGY로 결합 (같은 GPT_DEADLINE 안에서)
+        self.gpt = ScalpingAnalyzer(api_key=os.getenv('OPENAI_API_KEY'), cache=self.recommendation_cache,
+                                    deadline=float(os.getenv('GPT_DEADLINE', 5.0)),
+                                    prompt_style=os.getenv('PROMPT_STYLE', 'compact').lower(),
+                                    token_budget=int(os.getenv('GPT_TOKEN_BUDGET', 400)),
+                                    stream=os.getenv('GPT_STREAM', 'false').lower() == 'true',
+                                    ensemble=parse_members(os.getenv('GPT_ENSEMBLE', '')),
+                                    strategy=os.getenv('GPT_ENSEMBLE_STRATEGY', 'quorum').lower(),
+                                    quorum=int(os.getenv('GPT_ENSEMBLE_QUORUM')) if os.getenv('GPT_ENSEMBLE_QUORUM') else None)
         self.logger = TradingLogger()
 
+        # PRESCREEN_MODEL을 지정하면 로컬 모델 점수가 낮은 스캔은 GPT를 호출하지 않음
+        # (학습: python prescreen_model.py fit, 비교: python prescreen_model.py report)
+        self.prescreen = PrescreenModel.load(os.getenv('PRESCREEN_MODEL')) if os.getenv('PRESCREEN_MODEL') else None
+
         # 설정값 (.env에서 로드)
         self.investment_amount = float(os.getenv('INVESTMENT_AMOUNT', 10000))
         self.profit_target = float(os.getenv('PROFIT_TARGET', 2.0))
         self.stop_loss = float(os.getenv('STOP_LOSS', -2.0))
         self.scan_interval = 10   # 종목 스캔 주기 (초) - 단타용 빠른 스캔
         self.monitor_interval = 1 # 포지션 모니터링 주기 (초) - 실시간 감시
+        # 거래량 급증 기준 구간 (초) - 비우면 직전 스캔 대비 (스캔 간격에 따라 기준이 달라짐)
+        self.surge_window = float(os.getenv('SURGE_WINDOW')) if os.getenv('SURGE_WINDOW') else None
+        # 급증 판단 방식 - rate: 고정 증가율(20%), zscore: 코인별 평소 거래량 변동 대비 z-score
+        self.scan_mode = os.getenv('SCAN_MODE', 'rate').lower()
+        self.surge_zscore = float(os.getenv('SURGE_ZSCORE', 3.0))
+
+        # 실시간 시세 (WebSocket 틱마다 익절/손절 체크, 끊기면 REST로 대체)
+        self.feed = None
+        self.feed_max_age = 3.0  # 이보다 오래된 WebSocket 가격은 사용하지 않음 (초)
+        if os.getenv('USE_WEBSOCKET', 'true').lower() == 'true':
+            self.feed = BithumbWebSocketFeed(url=os.getenv('BITHUMB_WS_URL'),
+                                             orderbook_snapshot=self.scanner.api.get_orderbook)
+
+        # 보유 코인 체결로 만드는 1초/1분봉 (모니터링 화면의 단기 추세)
+        self.trade_bars = BarResampler({1: 300, 60: 60})
+        if self.feed:
+            self.feed.add_trade_listener(self.trade_bars.on_trade)
+        self._last_log_update = 0.0
+
+        # 백그라운드 스캐너 (GPT 분석/포지션 보유 중에도 계속 스캔)
+        self.scanner_worker = None
+        self._scan_version = 0
+        if os.getenv('SCANNER_WORKER', 'true').lower() == 'true':
+            self.scanner_worker = ScannerWorker(self.scanner, interval=self.scan_interval,
+                                                window=self.surge_window, top_n=5,
+                                                mode=self.scan_mode, min_zscore=self.surge_zscore)
+
+        # 포지션 보유 중 다음 진입 추천을 미리 준비 (백그라운드 스캐너 필요, NEXT_ENTRY_MAX_AGE=0이면 사용 안 함)
+        # 매도 직후 추천이 NEXT_ENTRY_MAX_AGE초 이내이고 가격이 NEXT_ENTRY_MAX_DRIFT% 넘게 움직이지 않았으면 바로 진입
+        self.next_entry = None
+        self.next_entry_max_drift = float(os.getenv('NEXT_ENTRY_MAX_DRIFT', 1.0))
+        if self.scanner_worker and float(os.getenv('NEXT_ENTRY_MAX_AGE', 15)) > 0:
+            self.next_entry = NextEntryPlanner(self.scanner_worker, self.gpt,
+                                               candidate_filter=self.scanner.filter_by_orderbook,
+                                               prescreen=self.prescreen,
+                                               max_age=float(os.getenv('NEXT_ENTRY_MAX_AGE', 15)))
 
         # 포지션 정보
         self.position = None  # {'coin': 'XRP', 'entry_price': 1500, 'amount': 0.5}
@@ -46,27 +141,69 @@ class ScalpingBotV2:
         print(f"수익 목표: +{self.profit_target}%")
         print(f"손절 기준: {self.stop_loss}%")
         print(f"종목 스캔 주기: {self.scan_interval}초")
+        print(f"실시간 시세: {'WebSocket' if self.feed else f'REST 폴링 ({self.monitor_interval}초)'}")
+        print(f"스캔 방식: {'백그라운드' if self.scanner_worker else '매매 루프 안에서 실행'}")
+        print(f"다음 진입 준비: {f'{self.next_entry.max_age:.0f}초 이내 추천 사용' if self.next_entry else '사용 안 함'}")
+        print(f"급증 기준: {f'z-score {self.surge_zscore} 이상' if self.scan_mode == 'zscore' else '거래량 +20% 이상'}")
         print("=" * 80)
         print()
 
+    def get_current_price(self, coin: str) -> Optional[float]:
+        """현재가 조회 - WebSocket 최신가 우선, 없거나 오래되면 REST (짧은 TTL 캐시)"""
+        if self.feed:
+            price = self.feed.get_price(coin, max_age=self.feed_max_age)
+            if price:
+                return price
+
+        # pybithumb은 실패 시 응답 dict/None을 반환하므로 숫자만 캐시
+        price = self.market_cache.get(f"price/{coin}", lambda: pybithumb.get_current_price(coin),
+                                      should_cache=lambda p: isinstance(p, float))
+        return price if isinstance(price, float) else None
+
     def find_trading_opportunity(self) -> Optional[str]:
         """거래 기회 찾기 - 알트코인 거래량 폭등 종목 발견"""
         print("\n" + "="*80)
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 알트코인 거래량 폭등 종목 스캔 중...")
         print("="*80)
 
-        # 1. 알트코인 거래량 폭등 종목 우선 스캔
-        surge_coins = self.scanner.scan_altcoin_volume_surge(min_surge_rate=20.0, min_trade_value=30000000)
+        # 1. 알트코인 거래량 폭등 종목 우선 스캔 (백그라운드 스캐너가 있으면 최신 결과 사용)
+        if self.scanner_worker:
+            result = self.scanner_worker.wait_for_result(self._scan_version, timeout=self.scan_interval)
+            if result is None:
+                print("❌ 새 스캔 결과 없음")
+                return None
+            self._scan_version = result['version']
+            surge_coins = result['surge_coins']
+            events = result['events']
+        else:
+            # 폭등 종목이 있으면 모멘텀 순위는 갱신하지 않으므로 지난 스캔의 이벤트를 먼저 비움
+            self.scanner.clear_rank_events()
+            if self.scan_mode == 'zscore':
+                surge_coins = self.scanner.scan_statistical_surge(min_zscore=self.surge_zscore,
+                                                                  min_trade_value=30000000, top_n=5)
+            else:
+                surge_coins = self.scanner.scan_altcoin_volume_surge(min_surge_rate=20.0, min_trade_value=30000000,
+                                                                     window=self.surge_window, top_n=5)
+            events = None
 
         if surge_coins:
             print("\n🔥 거래량 폭등 종목 발견!")
-            self.scanner.print_altcoin_surge_report(surge_coins[:5])
+            self.scanner.print_altcoin_surge_report(surge_coins)
             # 폭등 종목을 GPT에게 분석 요청
-            momentum_coins = surge_coins[:5]
+            momentum_coins = surge_coins
+        elif self.scanner_worker:
+            momentum_coins = result['momentum_coins']
         else:
             # 폭등 종목이 없으면 모멘텀 상위 코인 조회
             momentum_coins = self.scanner.get_top_momentum_coins(top_n=5, altcoin_only=True)
 
+        # TOP5 신규 진입 종목
+        if events is None:
+            events = self.scanner.rank_events()
+        entered = [e['coin'] for e in events if e['type'] == 'entered']
+        if entered:
+            print(f"🆕 TOP5 신규 진입: {', '.join(dict.fromkeys(entered))}")
+
         if not momentum_coins:
             print("❌ 거래 기회 없음")
             return None
@@ -76,6 +213,26 @@ class ScalpingBotV2:
             print("\n📈 현재 모멘텀 상위 알트코인:")
             self.scanner.print_momentum_report(momentum_coins)
 
+        # 스프레드/호가 잔량 필터 (전체 호가 1회 조회)
+        momentum_coins = self.scanner.filter_by_orderbook(momentum_coins)
+        if not momentum_coins:
+            print("❌ 유동성 조건을 만족하는 종목 없음")
+            return None
+
+        # 최근 1분봉 지표 (CANDLE_DB 지정 시, 후보 코인만 새 봉 적재)
+        if self.candles:
+            momentum_coins = self.scanner.attach_candles(momentum_coins, self.candles)
+
+        # 사전 선별 (PRESCREEN_MODEL 지정 시) - 유망하거나 애매한 후보일 때만 GPT 호출
+        prescreen = None
+        if self.prescreen:
+            prescreen = self.prescreen.evaluate(momentum_coins)
+            if not prescreen['call_gpt']:
+                print(f"\n⏭️  사전 선별: 진입 가능성 낮음 (점수 {prescreen['score']:.2f} < "
+                      f"{prescreen['threshold']:.2f}) - GPT 호출 생략")
+                self.logger.log_scan(momentum_coins, None, prescreen=prescreen)
+                return None
+
         # 2. GPT에게 최적 종목 추천 요청
         print("\n🤖 GPT 분석 중...")
         recommendation = self.gpt.recommend_coin(momentum_coins)
@@ -91,12 +248,27 @@ class ScalpingBotV2:
         print(f"추천 코인: {recommendation['selected_coin']}")
         print(f"확신도: {recommendation['confidence']}%")
         print(f"진입 타이밍: {recommendation['entry_timing']}")
-        print(f"리스크: {recommendation['risk_level']}")
-        print(f"이유: {recommendation['reason']}")
+        print(f"리스크: {recommendation['risk_level'] or '(수신 중)'}")
+        print(f"이유: {recommendation['reason'] or '(수신 중 - 결정 필드 도착 즉시 진행)'}")
+        source = {'gpt': 'GPT', 'cache': '직전 추천 재사용', 'fallback': '규칙 기반'}[recommendation['source']]
+        print(f"결정: {source} ({recommendation['latency_ms']:.0f}ms"
+              + (", 스트리밍 - 결정 필드 도착 기준" if recommendation.get('streamed') else "") + ")"
+              + (f" - {recommendation['fallback_reason']}" if recommendation.get('fallback_reason') else ""))
+        if recommendation.get('ensemble'):
+            ensemble = recommendation['ensemble']
+            picks = ", ".join(f"{name}={coin or '실패'}" for name, coin in ensemble['picks'].items())
+            print(f"앙상블 ({ensemble['strategy']}, {ensemble['responses']}/{ensemble['members']} 응답): {picks}")
+            print(f"앙상블 통계: {self.gpt.ensemble_stats.format()}")
+        if recommendation['source'] == 'cache':
+            stats = self.recommendation_cache.get_stats()
+            print(f"(재사용률 {stats['hit_rate']:.0f}%, 절약한 GPT 대기 {stats['saved_latency_ms'] / 1000:.1f}초)")
+        print(f"지연 시간: {self.gpt.latency.format()}")
+        if recommendation['source'] == 'gpt':
+            print(f"토큰/호출: {self.gpt.usage.format()}")
         print("="*80)
 
         # 로그 기록
-        self.logger.log_scan(momentum_coins, recommendation)
+        self.logger.log_scan(momentum_coins, recommendation, prescreen=prescreen)
 
         # 4. 진입 타이밍이 "즉시"이고 확신도가 50% 이상일 때만 매수
         if recommendation['entry_timing'] == '즉시' and recommendation['confidence'] >= 50:
@@ -105,6 +277,35 @@ class ScalpingBotV2:
             print(f"\n⏸️  매수 보류 (진입 타이밍: {recommendation['entry_timing']}, 확신도: {recommendation['confidence']}%)")
             return None
 
+    def take_next_entry(self) -> Optional[str]:
+        """매도 직후 - 포지션 보유 중 미리 준비한 추천으로 바로 진입할 코인 (조건이 안 맞으면 None)"""
+        plan = self.next_entry.take()
+        if plan is None:
+            print("\n⏭️  준비된 다음 진입 추천 없음 (없거나 오래됨) - 새로 스캔")
+            return None
+
+        recommendation = plan['recommendation']
+        coin = recommendation['selected_coin']
+        print("\n" + "="*80)
+        print(f"⚡ 미리 준비한 추천: {coin} (스캔 {plan['age']:.1f}초 전, 확신도 {recommendation['confidence']}%, "
+              f"진입 타이밍 {recommendation['entry_timing']}, 결정 {recommendation['source']})")
+
+        if recommendation['entry_timing'] != '즉시' or recommendation['confidence'] < 50:
+            print("⏸️  매수 보류 - 새로 스캔")
+            return None
+
+        # 준비 이후 가격이 크게 움직였으면 추천 근거가 달라졌으므로 사용하지 않음
+        planned_price = next((c.get('price') for c in plan['candidates'] if c['coin'] == coin), None)
+        current_price = self.get_current_price(coin)
+        if planned_price and current_price:
+            drift = (current_price - planned_price) / planned_price * 100
+            if abs(drift) > self.next_entry_max_drift:
+                print(f"⏸️  준비 이후 가격 {drift:+.2f}% 변동 (기준 ±{self.next_entry_max_drift}%) - 새로 스캔")
+                return None
+
+        self.logger.log_scan(plan['candidates'], recommendation, prescreen=plan['prescreen'])
+        return coin
+
     def execute_buy(self, coin: str) -> bool:
         """매수 실행"""
         try:
@@ -112,8 +313,12 @@ class ScalpingBotV2:
             print(f"💰 {coin} 매수 시도")
             print("="*80)
 
+            # 포지션 모니터링용 실시간 시세 구독
+            if self.feed:
+                self.feed.subscribe([coin])
+
             # 현재가 조회
-            current_price = pybithumb.get_current_price(coin)
+            current_price = self.get_current_price(coin)
             if not current_price:
                 print("❌ 시세 조회 실패")
                 return False
@@ -171,7 +376,7 @@ class ScalpingBotV2:
         entry_price = self.position['entry_price']
 
         # 현재가 조회
-        current_price = pybithumb.get_current_price(coin)
+        current_price = self.get_current_price(coin)
         if not current_price:
             print("\r시세 조회 실패", end="", flush=True)
             return
@@ -180,13 +385,20 @@ class ScalpingBotV2:
         profit_rate = ((current_price - entry_price) / entry_price) * 100
         elapsed_time = (datetime.now() - self.position['entry_time']).seconds
 
-        # 로그 업데이트
-        self.logger.update_position(current_price, profit_rate)
+        # 로그 업데이트 (틱마다 호출되므로 파일 기록은 monitor_interval마다)
+        now = time.monotonic()
+        if now - self._last_log_update >= self.monitor_interval:
+            self.logger.update_position(current_price, profit_rate)
+            self._last_log_update = now
+
+        # 1분봉 기준 단기 추세 (WebSocket 체결이 있을 때만)
+        minute_return = self.trade_bars.returns([coin], 60)[0]
+        trend = f"1분: {minute_return:+.2f}% | " if not np.isnan(minute_return) else ""
 
         # 현재 상태 출력
         print(f"\r[{datetime.now().strftime('%H:%M:%S')}] "
               f"{coin} | 진입: {entry_price:,.0f} → 현재: {current_price:,.0f} | "
-              f"수익률: {profit_rate:+.2f}% | "
+              f"수익률: {profit_rate:+.2f}% | {trend}"
               f"경과: {elapsed_time}초 ({elapsed_time//60}분)", end="", flush=True)
 
         # 매도 조건 확인
@@ -215,7 +427,7 @@ class ScalpingBotV2:
             print(f"💸 {coin} 매도 시도 (사유: {reason})")
 
             # 현재가 조회
-            current_price = pybithumb.get_current_price(coin)
+            current_price = self.get_current_price(coin)
             if current_price:
                 profit_rate = ((current_price - entry_price) / entry_price) * 100
 
@@ -253,6 +465,13 @@ class ScalpingBotV2:
         """메인 실행 루프"""
         print("\n🎮 자동매매 시작... (Ctrl+C로 종료)\n")
 
+        if self.feed:
+            self.feed.start()
+        if self.scanner_worker:
+            self.scanner_worker.start()
+        if self.next_entry:
+            self.next_entry.start()
+
         try:
             while True:
                 # 포지션이 없으면 새로운 기회 찾기
@@ -264,18 +483,37 @@ class ScalpingBotV2:
                         success = self.execute_buy(coin)
 
                         if success:
+                            if self.next_entry:
+                                self.next_entry.activate(coin)
                             print(f"\n📊 포지션 모니터링 시작... (매 {self.monitor_interval}초)")
                         else:
                             print(f"\n⏰ 다음 스캔까지 {self.scan_interval}초 대기...")
                             time.sleep(self.scan_interval)
-                    else:
+                    elif not self.scanner_worker:
                         print(f"\n⏰ 다음 스캔까지 {self.scan_interval}초 대기...")
                         time.sleep(self.scan_interval)
 
                 # 포지션이 있으면 모니터링
                 else:
-                    self.monitor_position()
-                    time.sleep(self.monitor_interval)
+                    if self.feed:
+                        # 새 틱이 오면 바로 다시 체크, 틱이 없으면 monitor_interval마다 REST로 체크
+                        coin = self.position['coin']
+                        version = self.feed.version(coin)
+                        self.monitor_position()
+                        if self.position:
+                            self.feed.wait_for_update(coin, version, timeout=self.monitor_interval)
+                    else:
+                        self.monitor_position()
+                        if self.position:
+                            time.sleep(self.monitor_interval)
+
+                    # 매도 직후 미리 준비한 추천이 아직 신선하면 스캔/GPT 대기 없이 바로 진입
+                    if not self.position and self.next_entry:
+                        self.next_entry.deactivate()
+                        coin = self.take_next_entry()
+                        if coin and self.execute_buy(coin):
+                            self.next_entry.activate(coin)
+                            print(f"\n📊 포지션 모니터링 시작... (매 {self.monitor_interval}초)")
 
         except KeyboardInterrupt:
             print("\n\n" + "="*80)
@@ -298,6 +536,16 @@ class ScalpingBotV2:
             if self.position:
                 print(f"\n⚠️  {self.position['coin']} 포지션 확인 필요!")
 
+        finally:
+            if self.feed:
+                self.feed.stop()
+            if self.next_entry:
+                self.next_entry.stop()
+            if self.scanner_worker:
+                self.scanner_worker.stop()
+            if self.indicator_state:
+                self.scanner.indicators.save(self.indicator_state)
+
 
 if __name__ == "__main__":
     bot = ScalpingBotV2()
@@ -0,0 +1,217 @@
+"""
+백그라운드 스캐너
+VolumeScanner를 별도 스레드(또는 asyncio 태스크)에서 주기적으로 실행하여
+버전이 붙은 스캔 결과를 크기 제한 큐에 발행합니다.
+매매 루프는 GPT 분석/포지션 모니터링 중에도 스캔이 멈추지 않고, 최신 결과만 꺼내 씁니다.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from volume_scanner import VolumeScanner
+
+
+class ScannerWorker:
+    """
+    스캔 결과 생산자
+
+    발행 결과: {'version', 'scanned_at', 'scan_ms', 'snapshot', 'surge_coins', 'momentum_coins', 'events'}
+    큐가 가득 차면 가장 오래된 결과를 버립니다 (소비자는 항상 최신 결과를 받음).
+
+    Args:
+        scanner: 스캐너 (워커가 실행 중일 때는 다른 스레드에서 스캔하지 말 것)
+        interval: 스캔 주기 (초)
+        queue_size: 보관할 최대 결과 수
+        mode: 급증 스캔 방식 - 'rate' (고정 증가율, scan_altcoin_volume_surge)
+              또는 'zscore' (코인별 평소 변동 대비, scan_statistical_surge)
+        min_surge_rate / min_trade_value / window / top_n: scan_altcoin_volume_surge 인자
+        min_zscore / min_percentile: scan_statistical_surge 인자
+        momentum_top_n: 모멘텀 상위 코인 수
+    """
+
+    def __init__(self, scanner: VolumeScanner, interval: float = 10.0, queue_size: int = 8,
+                 min_surge_rate: float = 20.0, min_trade_value: float = 30000000,
+                 window: Optional[float] = None, top_n: Optional[int] = 5, momentum_top_n: int = 5,
+                 mode: str = 'rate', min_zscore: Optional[float] = 3.0, min_percentile: Optional[float] = None):
+        if mode not in ('rate', 'zscore'):
+            raise ValueError(f"지원하지 않는 스캔 방식: {mode}")
+
+        self.scanner = scanner
+        self.interval = interval
+        self.mode = mode
+        self.min_zscore = min_zscore
+        self.min_percentile = min_percentile
+        self.min_surge_rate = min_surge_rate
+        self.min_trade_value = min_trade_value
+        self.window = window
+        self.top_n = top_n
+        self.momentum_top_n = momentum_top_n
+
+        self._cond = threading.Condition()
+        self._queue = deque(maxlen=queue_size)
+        self._latest: Optional[Dict] = None
+        self._version = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._wakeup = threading.Event()
+
+        self.stats = {'scans': 0, 'published': 0, 'dropped': 0, 'errors': 0, 'last_scan_ms': 0.0}
+
+    # ===== 생명주기 =====
+
+    def start(self) -> 'ScannerWorker':
+        """백그라운드 스레드에서 스캔 시작"""
+        if self._running:
+            return self
+
+        self._running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """스캔 종료"""
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _thread_main(self):
+        while self._running:
+            started = time.monotonic()
+            self.scan_once()
+            # 스캔에 걸린 시간을 빼고 대기 (stop()하면 바로 깨어남)
+            self._wakeup.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    async def run_async(self):
+        """
+        asyncio 태스크로 실행 (스캔은 스레드 풀에서 실행되어 이벤트 루프를 막지 않음)
+
+        예: task = asyncio.create_task(worker.run_async())
+        """
+        self._running = True
+        while self._running:
+            started = time.monotonic()
+            await asyncio.to_thread(self.scan_once)
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    # ===== 생산 =====
+
+    def scan_once(self) -> Optional[Dict]:
+        """스캔 1회 실행 후 결과 발행 (새 시세가 없으면 발행하지 않음)"""
+        started = time.perf_counter()
+        self.stats['scans'] += 1
+
+        try:
+            snapshot = self.scanner.get_snapshot()
+            if snapshot is None or (self._latest is not None and snapshot is self._latest['snapshot']):
+                return None
+
+            if self.mode == 'zscore':
+                surge_coins = self.scanner.scan_statistical_surge(
+                    min_zscore=self.min_zscore, min_percentile=self.min_percentile,
+                    min_trade_value=self.min_trade_value, top_n=self.top_n, snapshot=snapshot
+                )
+            else:
+                surge_coins = self.scanner.scan_altcoin_volume_surge(
+                    min_surge_rate=self.min_surge_rate, min_trade_value=self.min_trade_value,
+                    window=self.window, top_n=self.top_n, snapshot=snapshot
+                )
+            momentum_coins = self.scanner.get_top_momentum_coins(
+                top_n=self.momentum_top_n, altcoin_only=True, snapshot=snapshot
+            )
+            events = self.scanner.rank_events()
+
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"백그라운드 스캔 오류: {str(e)}")
+            return None
+
+        scan_ms = (time.perf_counter() - started) * 1000
+        self.stats['last_scan_ms'] = scan_ms
+
+        with self._cond:
+            self._version += 1
+            result = {
+                'version': self._version,
+                'scanned_at': time.time(),
+                'scan_ms': scan_ms,
+                'snapshot': snapshot,
+                'surge_coins': surge_coins,
+                'momentum_coins': momentum_coins,
+                'events': events
+            }
+            if len(self._queue) == self._queue.maxlen:
+                self.stats['dropped'] += 1
+            self._queue.append(result)
+            self._latest = result
+            self.stats['published'] += 1
+            self._cond.notify_all()
+
+        return result
+
+    # ===== 소비 =====
+
+    @property
+    def version(self) -> int:
+        """마지막으로 발행한 결과 버전 (0이면 아직 없음)"""
+        return self._version
+
+    def latest(self, since: int = 0) -> Optional[Dict]:
+        """since 버전 이후의 최신 결과 (없으면 None, 대기하지 않음)"""
+        with self._cond:
+            if self._latest is not None and self._latest['version'] > since:
+                return self._latest
+            return None
+
+    def wait_for_result(self, since: int = 0, timeout: Optional[float] = None) -> Optional[Dict]:
+        """since 버전 이후 결과가 발행될 때까지 대기 (timeout이면 None)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > since, timeout)
+            return self._latest if self._version > since else None
+
+    def drain(self) -> List[Dict]:
+        """큐에 쌓인 결과를 오래된 순으로 모두 꺼냄"""
+        with self._cond:
+            results = list(self._queue)
+            self._queue.clear()
+            return results
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            return dict(self.stats, version=self._version, queued=len(self._queue))
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import os
+
+    from bithumb_api import BithumbAPI
+    from market_data_cache import MarketDataCache
+
+    api = BithumbAPI('', '', base_url=os.getenv('BITHUMB_BASE_URL'), cache=MarketDataCache())
+    worker = ScannerWorker(VolumeScanner(api=api), interval=2.0, min_surge_rate=1.0).start()
+
+    print("백그라운드 스캔 테스트 (Ctrl+C로 종료)\n")
+    version = 0
+    try:
+        while True:
+            result = worker.wait_for_result(version, timeout=10)
+            if result is None:
+                print("새 스캔 결과 없음")
+                continue
+
+            version = result['version']
+            surge = [c['coin'] for c in result['surge_coins']]
+            momentum = [c['coin'] for c in result['momentum_coins']]
+            entered = [e['coin'] for e in result['events'] if e['type'] == 'entered']
+            print(f"v{version} ({result['scan_ms']:.1f}ms) 급증 {surge} 모멘텀 {momentum} 신규 {entered}")
+
+    except KeyboardInterrupt:
+        worker.stop()
+        print(worker.get_stats())
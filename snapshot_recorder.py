@@ -0,0 +1,326 @@
+"""
+전체 시세 스냅샷 기록기
+스캐너가 본 ALL_KRW 스냅샷을 고정 길이 바이너리 레코드로 일자별 파일에 이어 붙이고,
+memmap 리더로 JSON 파싱 없이 원하는 시간 구간을 NumPy 배열로 읽습니다.
+
+디렉터리 구성:
+    symbols.json      코인 심볼 -> 번호 (추가만 됨)
+    YYYYMMDD.bin      RECORD_DTYPE 레코드 (스냅샷마다 코인 수만큼)
+    YYYYMMDD.idx      INDEX_DTYPE 레코드 (스냅샷마다 1개: 시각, 시작 레코드, 코인 수)
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from market_snapshot import TickerSnapshot
+
+
+# 코인 1개 레코드 (40바이트)
+RECORD_DTYPE = np.dtype([
+    ('ts', '<i8'),        # 스냅샷 시각 (ms)
+    ('symbol', '<u4'),    # symbols.json 번호
+    ('price', '<f8'),     # 현재가
+    ('volume', '<f8'),    # 24시간 거래량
+    ('value', '<f8'),     # 24시간 거래대금
+    ('change', '<f4')     # 24시간 변동률 (%)
+])
+
+# 스냅샷 1개 색인 (20바이트)
+INDEX_DTYPE = np.dtype([
+    ('ts', '<i8'),        # 스냅샷 시각 (ms)
+    ('start', '<i8'),     # .bin 파일 안의 첫 레코드 번호
+    ('count', '<u4')      # 레코드 수
+])
+
+
+def _day_of(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000).strftime('%Y%m%d')
+
+
+class SnapshotRecorder:
+    """
+    스냅샷 추가 기록 (append-only)
+
+    레코드는 벡터 연산으로 한 번에 만들어 파일 끝에 쓰기만 하므로
+    코인 400개 기준 스냅샷 1개 기록에 수십 µs 수준입니다.
+
+    Args:
+        root: 저장 디렉터리
+        min_interval: 이 간격(초)보다 자주 들어온 스냅샷은 건너뜀 (0이면 모두 기록)
+    """
+
+    def __init__(self, root: str = 'market_data', min_interval: float = 0.0):
+        self.root = root
+        self.min_interval = min_interval
+        os.makedirs(root, exist_ok=True)
+
+        self._symbols_path = os.path.join(root, 'symbols.json')
+        self._symbols: Dict[str, int] = {}
+        if os.path.exists(self._symbols_path):
+            with open(self._symbols_path, 'r', encoding='utf-8') as f:
+                self._symbols = json.load(f)
+
+        self._day = None
+        self._data_file = None
+        self._index_file = None
+        self._next_record = 0
+        self._last_ts = None
+
+        self._snapshot_coins = None  # 마지막으로 매핑한 스냅샷 코인 순서
+        self._snapshot_ids = None
+
+        self.records = 0
+        self.snapshots = 0
+
+    def _ids_for(self, snapshot: TickerSnapshot) -> np.ndarray:
+        """스냅샷 행 순서 -> 심볼 번호 (새 심볼이 있으면 symbols.json 갱신)"""
+        if snapshot.coin_list == self._snapshot_coins:
+            return self._snapshot_ids
+
+        added = False
+        for coin in snapshot.coin_list:
+            if coin not in self._symbols:
+                self._symbols[coin] = len(self._symbols)
+                added = True
+
+        if added:
+            tmp_path = self._symbols_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._symbols, f, ensure_ascii=False)
+            os.replace(tmp_path, self._symbols_path)
+
+        self._snapshot_coins = snapshot.coin_list
+        self._snapshot_ids = np.array([self._symbols[coin] for coin in snapshot.coin_list], dtype='<u4')
+        return self._snapshot_ids
+
+    def _open_day(self, day: str):
+        """일자별 세그먼트 파일 열기 (자정이 지나면 새 파일)"""
+        self.close()
+
+        data_path = os.path.join(self.root, f"{day}.bin")
+        index_path = os.path.join(self.root, f"{day}.idx")
+
+        # 기록 중 종료로 잘린 색인 꼬리를 먼저 잘라냄 (남기면 이후 색인이 모두 어긋남)
+        committed = 0
+        if os.path.exists(index_path):
+            size = os.path.getsize(index_path)
+            whole = (size // INDEX_DTYPE.itemsize) * INDEX_DTYPE.itemsize
+            if size > whole:
+                with open(index_path, 'r+b') as f:
+                    f.truncate(whole)
+            index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+            if len(index):
+                committed = int(index['start'][-1] + index['count'][-1])
+        # 색인에 없는 꼬리 레코드(기록 중 종료)는 잘라냄
+        if os.path.exists(data_path) and os.path.getsize(data_path) > committed * RECORD_DTYPE.itemsize:
+            with open(data_path, 'r+b') as f:
+                f.truncate(committed * RECORD_DTYPE.itemsize)
+
+        self._data_file = open(data_path, 'ab')
+        self._index_file = open(index_path, 'ab')
+        self._next_record = committed
+        self._day = day
+
+    def record(self, snapshot: TickerSnapshot, timestamp_ms: Optional[int] = None) -> bool:
+        """
+        스냅샷 1개 기록
+
+        Returns:
+            기록했으면 True (min_interval 이내로 들어와 건너뛰면 False)
+        """
+        ts = timestamp_ms or snapshot.timestamp or int(time.time() * 1000)
+        if self._last_ts is not None and ts - self._last_ts < self.min_interval * 1000:
+            return False
+
+        day = _day_of(ts)
+        if day != self._day:
+            self._open_day(day)
+
+        n = len(snapshot)
+        records = np.empty(n, dtype=RECORD_DTYPE)
+        records['ts'] = ts
+        records['symbol'] = self._ids_for(snapshot)
+        records['price'] = snapshot.price
+        records['volume'] = snapshot.volume
+        records['value'] = snapshot.value
+        records['change'] = snapshot.change
+
+        entry = np.array([(ts, self._next_record, n)], dtype=INDEX_DTYPE)
+
+        # 데이터를 먼저 디스크에 내리고 색인을 씀 (색인에 있는 레코드만 유효 - 기록 중에도 읽기 가능)
+        self._data_file.write(records.tobytes())
+        self._data_file.flush()
+        self._index_file.write(entry.tobytes())
+        self._index_file.flush()
+
+        self._next_record += n
+        self._last_ts = ts
+        self.records += n
+        self.snapshots += 1
+        return True
+
+    def flush(self):
+        if self._data_file is not None:
+            self._data_file.flush()
+            self._index_file.flush()
+
+    def close(self):
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = None
+            self._index_file = None
+            self._day = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SnapshotReader:
+    """
+    기록된 스냅샷 읽기 (memmap - 필요한 구간만 디스크에서 읽음)
+
+    Args:
+        root: SnapshotRecorder 저장 디렉터리
+    """
+
+    def __init__(self, root: str = 'market_data'):
+        self.root = root
+        with open(os.path.join(root, 'symbols.json'), 'r', encoding='utf-8') as f:
+            symbols = json.load(f)
+
+        self.symbols: List[str] = [''] * len(symbols)
+        for coin, i in symbols.items():
+            self.symbols[i] = coin
+        self.symbol_ids = symbols
+
+    def days(self) -> List[str]:
+        """기록된 날짜 목록 (YYYYMMDD)"""
+        return sorted(name[:-4] for name in os.listdir(self.root) if name.endswith('.idx'))
+
+    def _open(self, day: str) -> Tuple[np.ndarray, np.ndarray]:
+        index = np.fromfile(os.path.join(self.root, f"{day}.idx"), dtype=INDEX_DTYPE)
+        if len(index) == 0:
+            return index, np.empty(0, dtype=RECORD_DTYPE)
+
+        committed = int(index['start'][-1] + index['count'][-1])
+        data = np.memmap(os.path.join(self.root, f"{day}.bin"), dtype=RECORD_DTYPE,
+                         mode='r', shape=(committed,))
+        return index, data
+
+    def load(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> np.ndarray:
+        """
+        [start_ms, end_ms) 구간의 레코드 (RECORD_DTYPE 구조체 배열)
+
+        하루 안의 구간이면 memmap 뷰를 그대로 반환 (복사 없음)
+        """
+        parts = []
+        for day in self.days():
+            if start_ms is not None and day < _day_of(start_ms):
+                continue
+            if end_ms is not None and day > _day_of(end_ms):
+                continue
+
+            index, data = self._open(day)
+            if len(index) == 0:
+                continue
+
+            lo = 0 if start_ms is None else np.searchsorted(index['ts'], start_ms, side='left')
+            hi = len(index) if end_ms is None else np.searchsorted(index['ts'], end_ms, side='left')
+            if lo >= hi:
+                continue
+
+            first = int(index['start'][lo])
+            last = int(index['start'][hi - 1] + index['count'][hi - 1])
+            parts.append(data[first:last])
+
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def snapshots(self, start_ms: Optional[int] = None,
+                  end_ms: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """구간 안의 스냅샷을 (시각, 레코드) 순서대로 반환"""
+        records = self.load(start_ms, end_ms)
+        if len(records) == 0:
+            return
+
+        # 같은 시각 레코드는 연속으로 저장되어 있음
+        boundaries = np.flatnonzero(np.diff(records['ts'])) + 1
+        for chunk in np.split(records, boundaries):
+            yield int(chunk['ts'][0]), chunk
+
+    def pivot(self, field: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+              symbols: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        시간 x 코인 행렬 (백테스트용)
+
+        Args:
+            field: 'price', 'volume', 'value', 'change'
+            symbols: 포함할 코인 (기본: 구간에 등장한 전체 코인)
+
+        Returns:
+            (시각 배열 (T,), 코인 리스트 (S,), 값 행렬 (T, S) - 없는 값은 NaN)
+        """
+        records = self.load(start_ms, end_ms)
+        timestamps, rows = np.unique(records['ts'], return_inverse=True)
+
+        if symbols is None:
+            ids = np.unique(records['symbol'])
+        else:
+            ids = np.array([self.symbol_ids[s] for s in symbols if s in self.symbol_ids], dtype='<u4')
+
+        # 심볼 번호 -> 열 번호 (없는 심볼은 -1)
+        column_of = np.full(len(self.symbols), -1, dtype=np.intp)
+        column_of[ids] = np.arange(len(ids))
+        columns = column_of[records['symbol']]
+
+        matrix = np.full((len(timestamps), len(ids)), np.nan)
+        keep = columns >= 0
+        matrix[rows[keep], columns[keep]] = records[field][keep]
+
+        return timestamps, [self.symbols[i] for i in ids], matrix
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    root = tempfile.mkdtemp(prefix='snapshots_')
+    coins = [f"C{i}" for i in range(400)]
+    rng = np.random.default_rng(0)
+    start = int(time.time() * 1000)
+
+    recorder = SnapshotRecorder(root)
+    elapsed = []
+    for step in range(2000):
+        price = rng.uniform(1, 1000, len(coins))
+        snapshot = TickerSnapshot(coins, price, price * 10, price * 100, rng.normal(size=len(coins)),
+                                  timestamp=start + step * 1000)
+        t0 = time.perf_counter()
+        recorder.record(snapshot)
+        elapsed.append(time.perf_counter() - t0)
+    recorder.close()
+
+    size = sum(os.path.getsize(os.path.join(root, name)) for name in os.listdir(root))
+    print(f"기록: 스냅샷 2000개 x 코인 {len(coins)}개, 평균 {np.mean(elapsed) * 1e6:.1f}µs/스냅샷, "
+          f"{size / 1024 / 1024:.1f}MB")
+
+    reader = SnapshotReader(root)
+    t0 = time.perf_counter()
+    records = reader.load(start + 500_000, start + 600_000)
+    print(f"구간 조회: {len(records):,}개 레코드, {(time.perf_counter() - t0) * 1000:.2f}ms")
+
+    timestamps, symbols, prices = reader.pivot('price', start + 500_000, start + 600_000, symbols=['C0', 'C1'])
+    print(f"pivot: {prices.shape}, 첫 행 {prices[0]}")
+
+    shutil.rmtree(root)
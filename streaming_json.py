@@ -0,0 +1,188 @@
+"""
+스트리밍 JSON 파서
+GPT 응답을 조각(chunk)이 도착하는 대로 넣으면, 최상위 JSON 객체의 필드를 값이 끝나는 즉시 꺼내 줍니다.
+응답 전체를 기다리지 않고 앞쪽 필드(예: selected_coin, entry_timing, confidence)만으로 먼저 결정할 수 있습니다.
+객체 앞뒤의 마크다운 코드 블록(```json)이나 설명 문장은 무시합니다.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+_WHITESPACE = ' \t\r\n'
+_SCALAR_END = ',}]' + _WHITESPACE
+
+
+def _string_end(text: str, start: int) -> Optional[int]:
+    """text[start]의 '"'로 시작하는 문자열의 끝 다음 위치 (아직 안 끝났으면 None)"""
+    i = start + 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '"':
+            return i + 1
+        i += 1
+    return None
+
+
+def _value_end(text: str, start: int) -> Optional[int]:
+    """text[start]에서 시작하는 JSON 값의 끝 다음 위치 (아직 안 끝났으면 None)"""
+    c = text[start]
+    if c == '"':
+        return _string_end(text, start)
+
+    if c in '{[':
+        # 중첩 객체/배열 - 문자열 안의 괄호는 세지 않음
+        depth = 0
+        i = start
+        while i < len(text):
+            c = text[i]
+            if c == '"':
+                end = _string_end(text, i)
+                if end is None:
+                    return None
+                i = end
+                continue
+            if c in '{[':
+                depth += 1
+            elif c in '}]':
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return None
+
+    # 숫자/true/false/null - 뒤에 구분자가 와야 끝난 것 (다음 조각에 숫자가 이어질 수 있음)
+    i = start
+    while i < len(text) and text[i] not in _SCALAR_END:
+        i += 1
+    return i if i < len(text) else None
+
+
+class StreamingJSONObject:
+    """
+    최상위 JSON 객체 점진 파서
+
+    예:
+        parser = StreamingJSONObject()
+        for chunk in stream:
+            parser.feed(chunk)
+            if parser.has('selected_coin', 'confidence'):
+                ...
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.fields: Dict = {}
+        self.complete = False
+        self._pos: Optional[int] = None  # 다음 필드를 읽을 위치 (None이면 아직 '{' 전)
+        self._after_value = False        # 직전 필드 뒤 (다음은 ',' 또는 '}')
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        응답 조각 추가
+
+        Returns:
+            이번 조각으로 값이 완성된 필드 이름 (도착 순서)
+
+        Raises:
+            json.JSONDecodeError: 객체 형식이 잘못된 경우
+        """
+        self.text += chunk
+        if self.complete:
+            return []
+
+        if self._pos is None:
+            start = self.text.find('{')
+            if start < 0:
+                return []
+            self._pos = start + 1
+
+        completed = []
+        while not self.complete:
+            key = self._read_member()
+            if key is None:
+                break
+            if key:
+                completed.append(key)
+        return completed
+
+    def _read_member(self) -> Optional[str]:
+        """필드 1개 읽기 (완성되면 이름, 객체가 끝나면 '', 데이터가 모자라면 None)"""
+        text = self.text
+        i = self._skip(self._pos)
+        if i >= len(text):
+            return None
+        if text[i] == '}':
+            self.complete = True
+            self._pos = i + 1
+            return ''
+        if self._after_value:
+            if text[i] != ',':
+                raise json.JSONDecodeError("','가 없습니다", text, i)
+            self._pos = i + 1
+            self._after_value = False
+            return self._read_member()
+        if text[i] != '"':
+            raise json.JSONDecodeError("필드 이름이 없습니다", text, i)
+
+        key_end = _string_end(text, i)
+        if key_end is None:
+            return None
+        colon = self._skip(key_end)
+        if colon >= len(text):
+            return None
+        if text[colon] != ':':
+            raise json.JSONDecodeError("':'가 없습니다", text, colon)
+
+        value_start = self._skip(colon + 1)
+        if value_start >= len(text):
+            return None
+        value_end = _value_end(text, value_start)
+        if value_end is None:
+            return None
+
+        key = json.loads(text[i:key_end])
+        self.fields[key] = json.loads(text[value_start:value_end])
+        self._pos = value_end
+        self._after_value = True
+        return key
+
+    def _skip(self, i: int) -> int:
+        while i < len(self.text) and self.text[i] in _WHITESPACE:
+            i += 1
+        return i
+
+    def has(self, *keys: str) -> bool:
+        """주어진 필드가 모두 도착했는지"""
+        return all(key in self.fields for key in keys)
+
+    def result(self) -> Dict:
+        """완성된 객체 (아직 닫히지 않았으면 JSONDecodeError)"""
+        if not self.complete:
+            raise json.JSONDecodeError("JSON 객체가 끝나지 않았습니다", self.text, len(self.text))
+        return self.fields
+
+
+def extract_json(text: str) -> Dict:
+    """응답 전체에서 첫 JSON 객체 추출 (코드 블록/앞뒤 설명 무시)"""
+    parser = StreamingJSONObject()
+    parser.feed(text)
+    return parser.result()
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    response = ('```json\n{\n    "selected_coin": "XRP",\n    "entry_timing": "즉시",\n    "confidence": 78,\n'
+                '    "risk_level": "중간",\n    "reason": "거래량이 평소의 5배로 늘었고 {과열} 전 구간입니다. \\"주의\\""\n}\n```')
+
+    parser = StreamingJSONObject()
+    decided = None
+    for i in range(0, len(response), 7):
+        for key in parser.feed(response[i:i + 7]):
+            print(f"{i + 7:4d}자: {key} = {parser.fields[key]!r}")
+        if decided is None and parser.has('selected_coin', 'entry_timing', 'confidence'):
+            decided = i + 7
+    print(f"\n결정 필드 도착: {decided}/{len(response)}자")
+    print(f"전체 추출: {extract_json(response)}")
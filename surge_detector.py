@@ -0,0 +1,227 @@
+"""
+통계적 거래량 급증 감지
+코인마다 스냅샷 간 거래량 변화율의 평균/분산을 Welford 방식으로 누적하여,
+고정 기준(예: +20%) 대신 각 코인 자신의 평소 변동 대비 z-score/백분위로 급증을 판단합니다.
+거래가 뜸한 코인은 작은 체결에도 변화율이 크게 튀고 대형 코인은 거의 움직이지 않으므로
+코인별 기준을 따로 두어야 같은 잣대로 비교할 수 있습니다.
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from market_snapshot import TickerSnapshot
+
+
+class SurgeDetector:
+    """
+    코인별 거래량 변화율 온라인 통계 (전체 코인 벡터 연산)
+
+    스냅샷마다 직전 스냅샷 대비 24시간 거래량 변화율(%)을 관측값으로 하여
+    먼저 지금까지의 통계로 점수(z-score, 백분위)를 매긴 뒤 통계에 반영합니다
+    (현재 관측값이 자기 기준을 끌어올리지 않도록).
+
+    백분위는 scores()를 부를 때 요청한 코인만 최근 max_samples개 관측과 비교해 계산합니다.
+
+    관측 수가 max_samples에 이르면 그 뒤로는 가중치 1/max_samples로 갱신하여
+    (지수 이동 평균/분산) 오래된 장세의 영향이 줄어듭니다.
+
+    Args:
+        min_samples: 점수를 매기기 위한 최소 관측 수 (이전에는 NaN)
+        max_samples: 통계 가중치 상한이자 백분위 계산에 쓰는 최근 관측 수
+        min_std: 표준편차 하한 (%p) - 거의 거래가 없던 코인의 z-score 폭주 방지
+        initial_coins: 처음 할당할 코인 열 수 (부족하면 2배씩 늘림)
+    """
+
+    def __init__(self, min_samples: int = 30, max_samples: int = 300, min_std: float = 0.01,
+                 initial_coins: int = 512):
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.min_std = min_std
+
+        self._columns = {}   # coin -> 열 번호
+        self._prev_volume = np.full(initial_coins, np.nan)
+        self._count = np.zeros(initial_coins)
+        self._mean = np.zeros(initial_coins)
+        self._m2 = np.zeros(initial_coins)
+
+        # 최근 관측값 링버퍼 (시간 x 코인, 백분위 계산용)
+        self._recent = np.full((max_samples, initial_coins), np.nan)
+        self._head = -1
+
+        # 마지막 스냅샷 점수 (열 순서)
+        self._delta = np.full(initial_coins, np.nan)
+        self._zscore = np.full(initial_coins, np.nan)
+
+        self._snapshot_coins = None  # 마지막으로 매핑한 스냅샷 코인 순서
+        self._snapshot_columns = None
+
+        self.updates = 0
+
+    def _columns_for(self, snapshot: TickerSnapshot) -> np.ndarray:
+        """스냅샷 행 순서 -> 열 번호"""
+        if snapshot.coin_list == self._snapshot_coins:
+            return self._snapshot_columns
+
+        columns = []
+        for coin in snapshot.coin_list:
+            column = self._columns.get(coin)
+            if column is None:
+                column = len(self._columns)
+                self._columns[coin] = column
+            columns.append(column)
+
+        width = len(self._count)
+        if len(self._columns) > width:
+            width = max(len(self._columns), width * 2)
+            self._prev_volume = self._grow(self._prev_volume, width, np.nan)
+            self._count = self._grow(self._count, width, 0.0)
+            self._mean = self._grow(self._mean, width, 0.0)
+            self._m2 = self._grow(self._m2, width, 0.0)
+            self._delta = self._grow(self._delta, width, np.nan)
+            self._zscore = self._grow(self._zscore, width, np.nan)
+
+            recent = np.full((self.max_samples, width), np.nan)
+            recent[:, :self._recent.shape[1]] = self._recent
+            self._recent = recent
+
+        self._snapshot_coins = snapshot.coin_list
+        self._snapshot_columns = np.array(columns, dtype=np.intp)
+        return self._snapshot_columns
+
+    @staticmethod
+    def _grow(array: np.ndarray, width: int, fill: float) -> np.ndarray:
+        grown = np.full(width, fill)
+        grown[:len(array)] = array
+        return grown
+
+    def update(self, snapshot: TickerSnapshot):
+        """스냅샷 1개 반영 (점수 계산 후 통계 갱신)"""
+        columns = self._columns_for(snapshot)
+        volume = snapshot.volume
+
+        prev = self._prev_volume[columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = (volume - prev) / prev * 100
+        valid = (prev > 0) & np.isfinite(delta)
+        delta[~valid] = np.nan
+        self._prev_volume[columns] = volume
+
+        # 지금까지의 통계로 점수 매기기
+        count = self._count[columns]
+        mean = self._mean[columns]
+        std = np.sqrt(self._m2[columns] / np.maximum(count - 1, 1))
+        ready = valid & (count >= self.min_samples)
+
+        zscore = np.full(len(columns), np.nan)
+        zscore[ready] = (delta[ready] - mean[ready]) / np.maximum(std[ready], self.min_std)
+
+        self._delta[columns] = delta
+        self._zscore[columns] = zscore
+
+        # Welford 갱신 (관측 수는 max_samples에서 멈춤 -> 이후 지수 가중)
+        cols = columns[valid]
+        x = delta[valid]
+        n = np.minimum(self._count[cols] + 1, self.max_samples)
+        d = x - self._mean[cols]
+        self._mean[cols] += d / n
+        self._m2[cols] = self._m2[cols] * (1 - 1 / self.max_samples) ** (n >= self.max_samples) \
+            + d * (x - self._mean[cols])
+        self._count[cols] = n
+
+        self._head = (self._head + 1) % self.max_samples
+        self._recent[self._head] = np.nan
+        self._recent[self._head, columns] = delta
+        self.updates += 1
+
+    def scores(self, snapshot: TickerSnapshot, mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        마지막 반영 스냅샷의 점수 (스냅샷 행 순서)
+
+        Args:
+            mask: 백분위를 계산할 코인 (기본: 전체) - 백분위는 최근 관측 전체와 비교하므로
+                  스캔 후보만 넘기면 비용이 줄어듦
+
+        Returns:
+            {'delta': 거래량 변화율 (%), 'zscore', 'percentile': 0~100, 'samples': 관측 수}
+            관측 수가 min_samples 미만인 코인(mask 밖 코인의 percentile)은 NaN
+        """
+        columns = self._columns_for(snapshot)
+        delta = self._delta[columns]
+        zscore = self._zscore[columns]
+
+        ready = ~np.isnan(zscore)
+        if mask is not None:
+            ready &= mask
+
+        percentile = np.full(len(columns), np.nan)
+        if ready.any():
+            # 링버퍼 최신 행은 현재 관측값 자신 -> 같은 값 1개(0.5)와 관측 1개를 빼고 계산
+            history = self._recent[:, columns[ready]]
+            current = delta[ready]
+            with np.errstate(invalid='ignore'):
+                below = (history < current).sum(axis=0) + 0.5 * (history == current).sum(axis=0) - 0.5
+            observed = (~np.isnan(history)).sum(axis=0) - 1
+            percentile[ready] = below / np.maximum(observed, 1) * 100
+
+        return {
+            'delta': delta,
+            'zscore': zscore,
+            'percentile': percentile,
+            'samples': self._count[columns]
+        }
+
+    def coin_stats(self, coin: str) -> Optional[Dict[str, float]]:
+        """코인 1개의 누적 통계 (평균/표준편차 %, 관측 수)"""
+        column = self._columns.get(coin)
+        if column is None:
+            return None
+        count = self._count[column]
+        return {
+            'samples': int(count),
+            'mean': float(self._mean[column]),
+            'std': float(np.sqrt(self._m2[column] / max(count - 1, 1)))
+        }
+
+    def memory_bytes(self) -> int:
+        return sum(array.nbytes for array in (self._prev_volume, self._count, self._mean, self._m2,
+                                              self._recent, self._delta, self._zscore))
+
+    def get_stats(self) -> Dict:
+        return {
+            'coins': len(self._columns),
+            'updates': self.updates,
+            'ready': int((self._count >= self.min_samples).sum()),
+            'memory_bytes': self.memory_bytes()
+        }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    coins = [f"C{i}" for i in range(400)]
+    rng = np.random.default_rng(0)
+    detector = SurgeDetector()
+
+    # 코인마다 평소 변동 폭이 다름 (C0~C199 거래 뜸함: 변화율 표준편차 5%, 나머지 0.1%)
+    noise = np.where(np.arange(len(coins)) < 200, 5.0, 0.1)
+    volume = np.full(len(coins), 1e6)
+    elapsed = []
+    for step in range(400):
+        growth = rng.normal(0.5, noise)
+        if step == 399:
+            growth[0] = 12.0     # 뜸한 코인에겐 평범한 변동
+            growth[300] = 3.0    # 대형 코인에겐 급증
+        volume = volume * (1 + growth / 100)
+        snapshot = TickerSnapshot(coins, np.full(len(coins), 100.0), volume, volume * 100, np.zeros(len(coins)))
+        t0 = time.perf_counter()
+        detector.update(snapshot)
+        elapsed.append(time.perf_counter() - t0)
+
+    scores = detector.scores(snapshot)
+    print(f"갱신: 평균 {np.mean(elapsed[50:]) * 1e6:.0f}µs/스냅샷 "
+          f"({np.mean(elapsed[50:]) * 1e6 / len(coins):.2f}µs/코인), {detector.memory_bytes() / 1024:.0f}KB")
+    for i in (0, 300):
+        print(f"C{i}: 변화율 {scores['delta'][i]:+.2f}%  z {scores['zscore'][i]:+.1f}  "
+              f"백분위 {scores['percentile'][i]:.1f}  {detector.coin_stats(coins[i])}")
+    print(f"z >= 3: {int((scores['zscore'] >= 3).sum())}개 코인")
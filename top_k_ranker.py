@@ -0,0 +1,139 @@
+"""
+상위 K개 순위 추적
+매 스냅샷마다 전체 정렬 대신 np.argpartition으로 상위 K개만 골라 정렬하고,
+직전 순위와 비교하여 신규 진입/이탈/순위 상승 이벤트를 만듭니다.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class TopKRanker:
+    """
+    점수 배열에서 상위 K개 코인과 순위 변화 추적
+
+    Args:
+        k: 추적할 순위 수
+        name: 이벤트에 붙는 순위 이름 (예: 'surge', 'momentum')
+    """
+
+    def __init__(self, k: int = 5, name: str = ''):
+        self.k = k
+        self.name = name
+        self.ranking: List[str] = []
+        self.scores: Dict[str, float] = {}
+        self.events: List[Dict] = []
+        self.updates = 0
+
+    @staticmethod
+    def select(scores: np.ndarray, mask: Optional[np.ndarray], k: int) -> np.ndarray:
+        """
+        점수 상위 k개 행 번호 (내림차순)
+
+        O(N) 부분 선택 후 k개만 정렬 - mask가 False이거나 점수가 NaN인 행은 제외
+        """
+        valid = ~np.isnan(scores)
+        if mask is not None:
+            valid &= mask
+
+        candidates = np.flatnonzero(valid)
+        if k <= 0 or len(candidates) == 0:
+            return candidates[:0]
+
+        if len(candidates) > k:
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[part]
+
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    def update(self, coins: Sequence[str], scores: np.ndarray,
+               mask: Optional[np.ndarray] = None, k: Optional[int] = None) -> np.ndarray:
+        """
+        새 스냅샷 점수로 순위 갱신
+
+        Args:
+            coins: 스냅샷 행 순서의 코인 심볼
+            scores: 스냅샷 행 순서의 점수
+            mask: 순위 대상 코인 마스크
+            k: 이번에 반환할 개수 (기본: self.k, 이벤트는 항상 self.k 기준)
+
+        Returns:
+            상위 행 번호 (내림차순)
+        """
+        top = self.select(scores, mask, max(self.k, k or 0))
+
+        tracked = top[:self.k]
+        ranking = [coins[i] for i in tracked]
+        self.events = self._diff(ranking)
+        self.ranking = ranking
+        self.scores = {coins[i]: float(scores[i]) for i in tracked}
+        self.updates += 1
+
+        return top[:k] if k is not None else tracked
+
+    def _diff(self, ranking: List[str]) -> List[Dict]:
+        """직전 순위 대비 변화 (entered / exited / moved_up / moved_down)"""
+        previous = {coin: rank for rank, coin in enumerate(self.ranking, 1)}
+        current = {coin: rank for rank, coin in enumerate(ranking, 1)}
+
+        events = []
+        for coin, rank in current.items():
+            before = previous.get(coin)
+            if before is None:
+                kind = 'entered'
+            elif rank < before:
+                kind = 'moved_up'
+            elif rank > before:
+                kind = 'moved_down'
+            else:
+                continue
+            events.append({'ranking': self.name, 'type': kind, 'coin': coin,
+                           'rank': rank, 'previous_rank': before})
+
+        for coin, before in previous.items():
+            if coin not in current:
+                events.append({'ranking': self.name, 'type': 'exited', 'coin': coin,
+                               'rank': None, 'previous_rank': before})
+
+        return events
+
+    def entered(self) -> List[str]:
+        """이번 갱신에서 새로 상위 K에 들어온 코인"""
+        return [event['coin'] for event in self.events if event['type'] == 'entered']
+
+    def rank_of(self, coin: str) -> Optional[int]:
+        try:
+            return self.ranking.index(coin) + 1
+        except ValueError:
+            return None
+
+
+# 벤치마크
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'코인 수':>8} | {'전체 정렬':>10} | {'argpartition':>12}")
+    for n in (300, 3000, 30000):
+        coins = [f"C{i}" for i in range(n)]
+        scores = rng.normal(size=n)
+        ranker = TopKRanker(k=5)
+        rounds = 200
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            sorted(zip(coins, scores), key=lambda x: x[1], reverse=True)[:5]
+        full_ms = (time.perf_counter() - start) / rounds * 1000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scores += rng.normal(scale=0.05, size=n)
+            ranker.update(coins, scores)
+        topk_ms = (time.perf_counter() - start) / rounds * 1000
+
+        print(f"{n:>8,} | {full_ms:>8.3f}ms | {topk_ms:>10.3f}ms")
+
+    print("마지막 순위:", ranker.ranking)
+    print("마지막 이벤트:", ranker.events)
@@ -15,7 +15,8 @@ class TradingBot:
         # API 초기화
         self.bithumb = BithumbAPI(
             api_key=os.getenv('BITHUMB_API_KEY'),
-            secret_key=os.getenv('BITHUMB_SECRET_KEY')
+            secret_key=os.getenv('BITHUMB_SECRET_KEY'),
+            base_url=os.getenv('BITHUMB_BASE_URL')  # 로컬 대역 서버로 벤치마크할 때 지정
         )
         self.gpt = GPTAnalyzer(api_key=os.getenv('OPENAI_API_KEY'))
 
@@ -61,7 +62,8 @@ class TradingBot:
                     'krw_balance': krw_balance,
                     'btc_value': btc_balance * current_price
                 },
-                'current_price': current_price
+                'current_price': current_price,
+                'avg_buy_price': self.avg_buy_price
             }
         except Exception as e:
             print(f"데이터 수집 오류: {str(e)}")
@@ -168,11 +170,9 @@ class TradingBot:
                 # 3. GPT 분석 요청
                 print("\nGPT 분석 중...")
                 decision = self.gpt.analyze_market(market_data)
-
-                if not decision:
-                    print("GPT 분석 실패, 다음 주기 대기...")
-                    time.sleep(self.check_interval)
-                    continue
+                print(f"결정: {'GPT' if decision['source'] == 'gpt' else '규칙 기반'} "
+                      f"({decision['latency_ms']:.0f}ms) | {self.gpt.latency.format()}")
+                print(f"토큰/호출: {self.gpt.usage.format()}")
 
                 # 4. 매매 실행
                 self.last_decision = decision['decision']
@@ -4,13 +4,28 @@
 
 import json
 import os
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+
+def read_scan_history(path: str) -> Iterator[Dict]:
+    """스캔 이력 파일 읽기 (깨진 줄은 건너뜀)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
 
 
 class TradingLogger:
-    def __init__(self, log_file='trading_data.json'):
+    def __init__(self, log_file='trading_data.json', history_file='scan_history.jsonl'):
         self.log_file = log_file
+        # 스캔 전체 이력 (한 줄에 스캔 1개, 추가만 함 - 사전 선별 모델 학습/리포트용)
+        self.history_file = history_file
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -41,8 +56,13 @@ class TradingLogger:
         with open(self.log_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
-    def log_scan(self, top_coins: List[Dict], gpt_recommendation: Dict = None):
-        """스캔 결과 기록"""
+    def log_scan(self, top_coins: List[Dict], gpt_recommendation: Dict = None, prescreen: Dict = None):
+        """
+        스캔 결과 기록
+
+        Args:
+            prescreen: 사전 선별 결과 (PrescreenModel.evaluate, 사용하지 않으면 None)
+        """
         data = self.load_data()
 
         scan_entry = {
@@ -50,6 +70,8 @@ class TradingLogger:
             'top_coins': top_coins,
             'gpt_recommendation': gpt_recommendation
         }
+        if prescreen is not None:
+            scan_entry['prescreen'] = prescreen
 
         data['scans'].append(scan_entry)
 
@@ -58,6 +80,15 @@ class TradingLogger:
 
         self.save_data(data)
 
+        if self.history_file:
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(dict(scan_entry, ts=time.time()), ensure_ascii=False) + "\n")
+
+    def iter_scan_history(self) -> Iterator[Dict]:
+        """스캔 전체 이력 (기록 순서)"""
+        if self.history_file:
+            yield from read_scan_history(self.history_file)
+
     def log_buy(self, coin: str, price: float, amount: float, investment: float):
         """매수 기록"""
         data = self.load_data()
@@ -79,6 +110,7 @@ class TradingLogger:
 
         trade_entry = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'entry_time': (data.get('current_position') or {}).get('entry_time'),
             'coin': coin,
             'entry_price': entry_price,
             'exit_price': exit_price,
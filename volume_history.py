@@ -0,0 +1,219 @@
+"""
+코인별 거래량/가격 이력 링버퍼
+전체 시세 스냅샷을 고정 간격(resolution) 버킷으로 저장하여
+여러 구간(10초/1분/5분/15분)의 거래량·가격 변화를 코인당 O(1)로 조회합니다.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from market_snapshot import TickerSnapshot
+
+
+# 기본 조회 구간 (초)
+DEFAULT_WINDOWS = (10, 60, 300, 900)
+
+
+def window_label(seconds: float) -> str:
+    """구간 이름 (10 -> '10s', 60 -> '1m', 900 -> '15m')"""
+    seconds = int(seconds)
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60}m"
+    return f"{seconds}s"
+
+
+class VolumeHistory:
+    """
+    시간 x 코인 2차원 링버퍼 (행: 시간 버킷, 열: 코인)
+
+    스냅샷이 없던 버킷은 직전 값으로 채우므로
+    N초 전 값은 항상 (현재 행 - N / resolution) 위치에 있습니다.
+    메모리 = capacity x 코인 열 수 x 2(거래량/가격) x 8바이트로 고정됩니다.
+
+    Args:
+        windows: 조회할 구간 (초)
+        resolution: 버킷 크기 (초) - 같은 버킷 안의 스냅샷은 마지막 값으로 덮어씀
+        initial_coins: 처음 할당할 코인 열 수 (부족하면 2배씩 늘림)
+    """
+
+    def __init__(self, windows: Iterable[float] = DEFAULT_WINDOWS, resolution: float = 1.0,
+                 initial_coins: int = 512):
+        self.windows = tuple(sorted(windows))
+        self.resolution = resolution
+        self.capacity = int(math.ceil(self.windows[-1] / resolution)) + 1
+
+        self._columns = {}   # coin -> 열 번호
+        self._volume = np.full((self.capacity, initial_coins), np.nan)
+        self._price = np.full((self.capacity, initial_coins), np.nan)
+
+        self._head = -1          # 마지막으로 쓴 행
+        self._last_bucket = None
+        self._filled = 0         # 유효한 행 수 (최대 capacity)
+
+        self._snapshot_coins = None  # 마지막으로 매핑한 스냅샷 코인 순서
+        self._snapshot_columns = None
+
+    def _columns_for(self, snapshot: TickerSnapshot) -> np.ndarray:
+        """스냅샷 행 순서 -> 열 번호"""
+        if snapshot.coin_list == self._snapshot_coins:
+            return self._snapshot_columns
+
+        columns = []
+        for coin in snapshot.coin_list:
+            column = self._columns.get(coin)
+            if column is None:
+                column = len(self._columns)
+                self._columns[coin] = column
+            columns.append(column)
+
+        width = self._volume.shape[1]
+        if len(self._columns) > width:
+            width = max(len(self._columns), width * 2)
+            self._volume = self._grow(self._volume, width)
+            self._price = self._grow(self._price, width)
+
+        self._snapshot_coins = snapshot.coin_list
+        self._snapshot_columns = np.array(columns, dtype=np.intp)
+        return self._snapshot_columns
+
+    def _grow(self, array: np.ndarray, width: int) -> np.ndarray:
+        grown = np.full((self.capacity, width), np.nan)
+        grown[:, :array.shape[1]] = array
+        return grown
+
+    def record(self, snapshot: TickerSnapshot, timestamp: Optional[float] = None):
+        """
+        스냅샷 저장
+
+        Args:
+            snapshot: 전체 시세 스냅샷
+            timestamp: 스냅샷 시각 (초, 기본: 스냅샷의 서버 시각 또는 현재 시각)
+        """
+        if timestamp is None:
+            timestamp = snapshot.timestamp / 1000 if snapshot.timestamp else time.time()
+
+        bucket = int(timestamp // self.resolution)
+        columns = self._columns_for(snapshot)
+
+        if self._last_bucket is None:
+            self._head = 0
+            self._filled = 1
+
+        elif bucket > self._last_bucket:
+            # 비어 있는 버킷은 직전 값으로 채움 (최대 capacity 행)
+            steps = bucket - self._last_bucket
+            previous = self._head
+            for _ in range(min(steps, self.capacity)):
+                self._head = (self._head + 1) % self.capacity
+                self._volume[self._head] = self._volume[previous]
+                self._price[self._head] = self._price[previous]
+            self._filled = min(self._filled + steps, self.capacity)
+
+        elif bucket < self._last_bucket:
+            # 시계가 뒤로 간 스냅샷은 무시
+            return
+
+        self._volume[self._head, columns] = snapshot.volume
+        self._price[self._head, columns] = snapshot.price
+        self._last_bucket = bucket
+
+    def _row_ago(self, seconds: float) -> Optional[int]:
+        """seconds초 전 버킷의 행 번호 (이력이 부족하면 None)"""
+        steps = int(math.ceil(seconds / self.resolution))
+        if self._head < 0 or steps >= self._filled:
+            return None
+        return (self._head - steps) % self.capacity
+
+    def _change(self, array: np.ndarray, snapshot: TickerSnapshot, seconds: float) -> np.ndarray:
+        columns = self._columns_for(snapshot)
+        row = self._row_ago(seconds)
+        if row is None:
+            return np.full(len(snapshot), np.nan)
+
+        past = array[row, columns]
+        current = array[self._head, columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (current - past) / past * 100
+        change[~(past > 0)] = np.nan
+        return change
+
+    def volume_change(self, snapshot: TickerSnapshot, seconds: float) -> np.ndarray:
+        """
+        seconds초 동안의 24시간 거래량 변화율 (%)
+
+        Returns:
+            스냅샷 행 순서의 변화율 배열 (이력이 부족한 코인은 NaN)
+        """
+        return self._change(self._volume, snapshot, seconds)
+
+    def price_change(self, snapshot: TickerSnapshot, seconds: float) -> np.ndarray:
+        """seconds초 동안의 가격 변화율 (%)"""
+        return self._change(self._price, snapshot, seconds)
+
+    def coin_changes(self, coin: str) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        코인 1개의 구간별 변화율
+
+        Returns:
+            {'10s': {'volume_change': ..., 'price_change': ...}, ...}
+        """
+        column = self._columns.get(coin)
+        changes = {}
+        for seconds in self.windows:
+            row = self._row_ago(seconds)
+            entry = {'volume_change': None, 'price_change': None}
+            if column is not None and row is not None:
+                for key, array in (('volume_change', self._volume), ('price_change', self._price)):
+                    past = array[row, column]
+                    if past > 0:
+                        entry[key] = float((array[self._head, column] - past) / past * 100)
+            changes[window_label(seconds)] = entry
+        return changes
+
+    def history_seconds(self) -> float:
+        """조회 가능한 이력 길이 (초)"""
+        return max(self._filled - 1, 0) * self.resolution
+
+    def memory_bytes(self) -> int:
+        """링버퍼가 차지하는 메모리 (바이트)"""
+        return self._volume.nbytes + self._price.nbytes
+
+    def get_stats(self) -> Dict:
+        return {
+            'coins': len(self._columns),
+            'capacity': self.capacity,
+            'resolution': self.resolution,
+            'history_seconds': self.history_seconds(),
+            'memory_bytes': self.memory_bytes()
+        }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    history = VolumeHistory()
+    stats = history.get_stats()
+    print(f"구간: {[window_label(w) for w in history.windows]}")
+    print(f"버퍼: {stats['capacity']}행 x 512코인, {stats['memory_bytes'] / 1024 / 1024:.1f}MB")
+
+    coins = [f"C{i}" for i in range(400)]
+    start = 1_700_000_000.0
+
+    # 5초마다 거래량 0.1%씩 증가, 마지막 C0만 급증
+    for step in range(200):
+        volume = np.full(len(coins), 1000.0) * (1.001 ** step)
+        if step == 199:
+            volume[0] *= 1.5
+        price = np.full(len(coins), 100.0)
+        snapshot = TickerSnapshot(coins, price, volume, volume * price, np.zeros(len(coins)))
+        history.record(snapshot, timestamp=start + step * 5)
+
+    for seconds in history.windows:
+        change = history.volume_change(snapshot, seconds)
+        print(f"{window_label(seconds):>4}: C0 {change[0]:+7.2f}%  C1 {change[1]:+7.2f}%")
+
+    print(history.coin_changes('C0'))
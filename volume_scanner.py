@@ -3,15 +3,58 @@
 빗썸의 여러 코인을 스캔하여 거래량이 급증한 코인을 찾습니다.
 """
 
-import requests
 from typing import List, Dict, Optional
 import time
+import numpy as np
+from bithumb_api import BithumbAPI
+from market_snapshot import TickerSnapshot
+from orderbook_snapshot import OrderbookSnapshot
+from top_k_ranker import TopKRanker
+from volume_history import VolumeHistory, window_label
+from snapshot_recorder import SnapshotRecorder
+from candle_store import CandleIngestor
+from indicators import IndicatorEngine
+from bar_resampler import BarResampler
+from surge_detector import SurgeDetector
 
 
 class VolumeScanner:
-    def __init__(self):
-        self.base_url = "https://api.bithumb.com"
-        self.previous_volumes = {}  # 이전 거래량 저장
+    def __init__(self, api: Optional[BithumbAPI] = None, base_url: Optional[str] = None,
+                 history: Optional[VolumeHistory] = None, recorder: Optional[SnapshotRecorder] = None,
+                 indicators: Optional[IndicatorEngine] = None, bars: Optional[BarResampler] = None,
+                 detector: Optional[SurgeDetector] = None):
+        # 시세 조회는 BithumbAPI 공개 API 경로를 공유 (세션 풀/속도 제한)
+        # base_url은 api를 넘기지 않았을 때만 사용 (로컬 대역 서버 연결용)
+        self.api = api or BithumbAPI('', '', base_url=base_url)
+
+        # 구간별(10초/1분/5분/15분) 거래량·가격 이력
+        self.history = history or VolumeHistory()
+
+        # 스냅샷마다 갱신하는 기술적 지표 (EMA/RSI/VWAP/ATR/볼린저/z-score, 스캔 결과에 ind_* 필드로 추가)
+        self.indicators = indicators or IndicatorEngine()
+
+        # 스냅샷 틱으로 만드는 1초/1분/5분봉 (스캔 결과에 bar_return_*/bar_volume_* 필드로 추가)
+        self.bars = bars or BarResampler()
+
+        # 코인별 거래량 변화율 평균/분산 (scan_statistical_surge의 z-score/백분위 기준)
+        self.detector = detector or SurgeDetector()
+
+        # 스캔한 스냅샷 디스크 기록 (연구/백테스트용, 없으면 기록 안 함)
+        self.recorder = recorder
+
+        # 이전 거래량 저장 (코인별 고정 위치의 배열, 스냅샷 행 순서와 매핑)
+        self._slots = {}                     # coin -> 배열 위치
+        self._prev_volume = np.full(512, np.nan)
+        self._slot_coins = None              # 마지막으로 매핑한 스냅샷 코인 순서
+        self._slot_index = None
+
+        # 급증률/모멘텀 상위 5개 순위 (스캔마다 신규 진입/순위 상승 이벤트 생성)
+        self.surge_ranker = TopKRanker(k=5, name='surge')
+        self.momentum_ranker = TopKRanker(k=5, name='momentum')
+
+        # 마지막 시세 응답과 파싱 결과 (캐시된 같은 응답은 다시 파싱하지 않음)
+        self._last_payload = None
+        self._last_snapshot = None
 
         # 제외할 코인 (스테이블코인 + 시총 100위 안 메이저 코인들)
         self.excluded_coins = [
@@ -28,169 +71,283 @@ class VolumeScanner:
 
     def get_all_tickers(self) -> Optional[Dict]:
         """전체 코인의 현재 시세 조회"""
-        try:
-            url = f"{self.base_url}/public/ticker/ALL_KRW"
-            response = requests.get(url, timeout=10)
-            data = response.json()
+        return self.api.get_all_tickers('KRW')
 
-            if data['status'] == '0000':
-                return data['data']
-            else:
-                print(f"시세 조회 실패: {data.get('message', 'Unknown error')}")
-                return None
-        except Exception as e:
-            print(f"시세 조회 오류: {str(e)}")
+    def get_snapshot(self) -> Optional[TickerSnapshot]:
+        """전체 시세를 컬럼형 스냅샷으로 조회 (같은 응답은 한 번만 파싱)"""
+        all_data = self.get_all_tickers()
+        if not all_data:
             return None
 
+        if all_data is not self._last_payload:
+            self._last_snapshot = TickerSnapshot.from_payload(all_data)
+            self._last_payload = all_data
+            self.history.record(self._last_snapshot)
+            self.indicators.update_snapshot(self._last_snapshot)
+            self.bars.update_snapshot(self._last_snapshot)
+            self.detector.update(self._last_snapshot)
+            if self.recorder is not None:
+                try:
+                    self.recorder.record(self._last_snapshot)
+                except OSError as e:
+                    print(f"스냅샷 기록 오류: {str(e)}")
+
+        return self._last_snapshot
+
+    def _slots_for(self, snapshot: TickerSnapshot) -> np.ndarray:
+        """스냅샷 행 순서 -> 이전 거래량 배열 위치"""
+        if snapshot.coin_list == self._slot_coins:
+            return self._slot_index
+
+        slots = []
+        for coin in snapshot.coin_list:
+            slot = self._slots.get(coin)
+            if slot is None:
+                slot = len(self._slots)
+                self._slots[coin] = slot
+            slots.append(slot)
+
+        if len(self._slots) > len(self._prev_volume):
+            grown = np.full(max(len(self._slots), len(self._prev_volume) * 2), np.nan)
+            grown[:len(self._prev_volume)] = self._prev_volume
+            self._prev_volume = grown
+
+        self._slot_coins = snapshot.coin_list
+        self._slot_index = np.array(slots, dtype=np.intp)
+        return self._slot_index
+
+    def _volume_changes(self, snapshot: TickerSnapshot, mask: np.ndarray) -> np.ndarray:
+        """
+        직전 스캔 대비 거래량 변화율 (%) - mask된 코인만 이전 거래량 갱신
+
+        Returns:
+            스냅샷 행 순서의 변화율 배열 (첫 관측/이전 거래량 0이면 NaN)
+        """
+        slots = self._slots_for(snapshot)
+        prev = self._prev_volume[slots]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (snapshot.volume - prev) / prev * 100
+        change[~(prev > 0)] = np.nan
+
+        self._prev_volume[slots[mask]] = snapshot.volume[mask]
+        return change
+
+    def _surge_changes(self, snapshot: TickerSnapshot, mask: np.ndarray,
+                       window: Optional[float]) -> np.ndarray:
+        """급증 판단 기준 변화율 - window가 없으면 직전 스캔 대비, 있으면 window초 구간"""
+        since_last_scan = self._volume_changes(snapshot, mask)
+        if window is None:
+            return since_last_scan
+        return self.history.volume_change(snapshot, window)
+
+    def _window_fields(self, snapshot: TickerSnapshot, hits: np.ndarray) -> Dict[str, np.ndarray]:
+        """급증 코인의 구간별 거래량 변화율 (volume_change_10s, volume_change_1m, ...)"""
+        return {
+            f"volume_change_{window_label(seconds)}": self.history.volume_change(snapshot, seconds)[hits]
+            for seconds in self.history.windows
+        }
+
+    def _attach_windows(self, coin_info: Dict, fields: Dict[str, np.ndarray], k: int):
+        for key, values in fields.items():
+            value = values[k]
+            coin_info[key] = None if np.isnan(value) else float(value)
+
+    def _attach_stream_fields(self, coins: List[Dict]) -> List[Dict]:
+        """스캔 결과에 타임프레임 봉/지표 필드 추가 (지표는 워밍업 전 코인 제외)"""
+        if coins:
+            symbols = [c['coin'] for c in coins]
+            for coin_info, bar_fields, indicator_fields in zip(coins, self.bars.summary(symbols),
+                                                               self.indicators.fields_for(symbols)):
+                coin_info.update(bar_fields)
+                coin_info.update(indicator_fields)
+        return coins
+
     def calculate_volume_change(self, coin: str, current_volume: float) -> Optional[float]:
-        """거래량 변화율 계산"""
-        if coin not in self.previous_volumes:
-            self.previous_volumes[coin] = current_volume
+        """거래량 변화율 계산 (코인 1개)"""
+        slot = self._slots.get(coin)
+        if slot is None or np.isnan(self._prev_volume[slot]):
+            if slot is None:
+                slot = len(self._slots)
+                self._slots[coin] = slot
+                self._slot_coins = None
+                if slot >= len(self._prev_volume):
+                    grown = np.full(len(self._prev_volume) * 2 + 1, np.nan)
+                    grown[:len(self._prev_volume)] = self._prev_volume
+                    self._prev_volume = grown
+            self._prev_volume[slot] = current_volume
             return None
 
-        prev_volume = self.previous_volumes[coin]
+        prev_volume = self._prev_volume[slot]
         if prev_volume == 0:
             return None
 
         change_rate = ((current_volume - prev_volume) / prev_volume) * 100
-        self.previous_volumes[coin] = current_volume
+        self._prev_volume[slot] = current_volume
 
-        return change_rate
+        return float(change_rate)
 
-    def scan_altcoin_volume_surge(self, min_surge_rate: float = 20.0, min_trade_value: float = 30000000) -> List[Dict]:
+    def _altcoin_mask(self, snapshot: TickerSnapshot) -> np.ndarray:
+        """제외 목록에 없는 코인 마스크"""
+        return ~snapshot.mask_in(self.excluded_coins)
+
+    def scan_altcoin_volume_surge(self, min_surge_rate: float = 20.0, min_trade_value: float = 30000000,
+                                  window: Optional[float] = None, top_n: Optional[int] = None,
+                                  snapshot: Optional[TickerSnapshot] = None) -> List[Dict]:
         """
         잡알트코인 거래량 급증 스캔 (스테이블코인, 시총100위 제외)
 
         Args:
             min_surge_rate: 최소 거래량 증가율 (%)
             min_trade_value: 최소 거래대금 (원)
+            window: 거래량 증가율 기준 구간 (초, 기본: 직전 스캔 대비)
+            top_n: 상위 N개만 반환 (기본: 급증 코인 전체)
+            snapshot: 이미 조회한 스냅샷 (기본: 새로 조회)
 
         Returns:
-            급증한 잡알트코인 리스트
+            급증한 잡알트코인 리스트 (순위 변화는 rank_events())
         """
         try:
-            all_data = self.get_all_tickers()
-            if not all_data:
+            if snapshot is None:
+                snapshot = self.get_snapshot()
+            if snapshot is None:
                 return []
 
+            # 제외 목록 + 최소 거래대금 + 최소 거래량(100) 필터
+            with np.errstate(invalid='ignore'):
+                mask = self._altcoin_mask(snapshot) & (snapshot.value >= min_trade_value) & (snapshot.volume >= 100)
+
+            # 거래량 변화율 계산 (초기 실행/이력 부족 시에는 NaN이라 제외됨)
+            volume_change = self._surge_changes(snapshot, mask, window)
+
+            with np.errstate(invalid='ignore'):
+                surge_mask = mask & (volume_change >= min_surge_rate)
+
+            # 거래량 증가율 순 상위 N개 (N이 없으면 급증 코인 전체 정렬)
+            k = top_n if top_n is not None else int(surge_mask.sum())
+            hits = self.surge_ranker.update(snapshot.coin_list, volume_change, surge_mask, k=k)
+            windows = self._window_fields(snapshot, hits)
+
             surge_coins = []
+            for k, i in enumerate(hits):
+                coin_info = snapshot.row(i)
+                coin_info['volume_change'] = float(volume_change[i])
+                self._attach_windows(coin_info, windows, k)
+                surge_coins.append(coin_info)
 
-            # 전체 코인에서 제외 목록만 빼기
-            scan_coins = [coin for coin in all_data.keys() if coin not in self.excluded_coins and coin != 'date']
+            return self._attach_stream_fields(surge_coins)
 
-            for coin in scan_coins:
-                if coin not in all_data:
-                    continue
+        except Exception as e:
+            print(f"거래량 스캔 오류: {str(e)}")
+            return []
 
-                coin_data = all_data[coin]
+    def scan_statistical_surge(self, min_zscore: float = 3.0, min_percentile: Optional[float] = None,
+                               min_trade_value: float = 30000000, top_n: Optional[int] = None,
+                               snapshot: Optional[TickerSnapshot] = None) -> List[Dict]:
+        """
+        잡알트코인 통계적 거래량 급증 스캔 (스테이블코인, 시총100위 제외)
 
-                try:
-                    volume_24h = float(coin_data.get('units_traded_24H', 0))
-                    price = float(coin_data.get('closing_price', 0))
-                    price_change = float(coin_data.get('fluctate_rate_24H', 0))
-                    trade_value_24h = float(coin_data.get('acc_trade_value_24H', 0))
+        고정 증가율 대신 코인마다 평소 스냅샷 간 거래량 변화율 분포와 비교합니다.
+        관측이 SurgeDetector.min_samples개 미만인 코인은 제외됩니다.
 
-                    # 최소 거래대금 필터
-                    if trade_value_24h < min_trade_value:
-                        continue
+        Args:
+            min_zscore: 최소 z-score (None이면 z-score 조건 없음)
+            min_percentile: 최소 백분위 (0~100, None이면 백분위 조건 없음)
+            min_trade_value: 최소 거래대금 (원)
+            top_n: z-score 상위 N개만 반환 (기본: 급증 코인 전체)
+            snapshot: 이미 조회한 스냅샷 (기본: 새로 조회)
 
-                    # 최소 거래량 필터
-                    if volume_24h < 100:
-                        continue
+        Returns:
+            급증한 잡알트코인 리스트 (volume_change: 직전 스냅샷 대비 변화율, surge_zscore, surge_percentile)
+        """
+        try:
+            if snapshot is None:
+                snapshot = self.get_snapshot()
+            if snapshot is None:
+                return []
 
-                    # 거래량 변화율 계산
-                    volume_change = self.calculate_volume_change(coin, volume_24h)
+            with np.errstate(invalid='ignore'):
+                mask = self._altcoin_mask(snapshot) & (snapshot.value >= min_trade_value) & (snapshot.volume >= 100)
 
-                    # 초기 실행 시에는 건너뛰기
-                    if volume_change is None:
-                        continue
+            # 직전 스캔 대비 거래량은 다른 스캔 방식과 같이 계속 갱신
+            self._volume_changes(snapshot, mask)
 
-                    # 거래량이 급증한 경우
-                    if volume_change >= min_surge_rate:
-                        surge_coins.append({
-                            'coin': coin,
-                            'price': price,
-                            'volume_24h': volume_24h,
-                            'volume_change': volume_change,
-                            'price_change_24h': price_change,
-                            'trade_value_24h': trade_value_24h
-                        })
+            # 거래량이 늘어난 코인만 (z-score가 높아도 감소는 급증이 아님)
+            scores = self.detector.scores(snapshot, mask=mask)
+            zscore = scores['zscore']
+            percentile = scores['percentile']
+            with np.errstate(invalid='ignore'):
+                surge_mask = mask & (scores['delta'] > 0) & ~np.isnan(zscore)
+                if min_zscore is not None:
+                    surge_mask &= zscore >= min_zscore
+                if min_percentile is not None:
+                    surge_mask &= percentile >= min_percentile
 
-                except (ValueError, TypeError):
-                    continue
+            k = top_n if top_n is not None else int(surge_mask.sum())
+            hits = self.surge_ranker.update(snapshot.coin_list, zscore, surge_mask, k=k)
+            windows = self._window_fields(snapshot, hits)
 
-            # 거래량 증가율 순으로 정렬
-            surge_coins.sort(key=lambda x: x['volume_change'], reverse=True)
+            surge_coins = []
+            for k, i in enumerate(hits):
+                coin_info = snapshot.row(i)
+                coin_info['volume_change'] = float(scores['delta'][i])
+                coin_info['surge_zscore'] = float(zscore[i])
+                coin_info['surge_percentile'] = float(percentile[i])
+                self._attach_windows(coin_info, windows, k)
+                surge_coins.append(coin_info)
 
-            return surge_coins
+            return self._attach_stream_fields(surge_coins)
 
         except Exception as e:
-            print(f"거래량 스캔 오류: {str(e)}")
+            print(f"통계적 거래량 스캔 오류: {str(e)}")
             return []
 
-    def scan_volume_surge(self, min_surge_rate: float = 20.0) -> List[Dict]:
+    def scan_volume_surge(self, min_surge_rate: float = 20.0, window: Optional[float] = None,
+                          top_n: Optional[int] = None) -> List[Dict]:
         """
         거래량 급증 코인 스캔
 
         Args:
             min_surge_rate: 최소 거래량 증가율 (기본 20%)
+            window: 거래량 증가율 기준 구간 (초, 기본: 직전 스캔 대비)
+            top_n: 상위 N개만 반환 (기본: 급증 코인 전체)
 
         Returns:
             급증한 코인 리스트 [{coin, price, volume, surge_rate, price_change}, ...]
         """
         try:
-            all_data = self.get_all_tickers()
-            if not all_data:
+            snapshot = self.get_snapshot()
+            if snapshot is None:
                 return []
 
-            surge_coins = []
-
-            for coin in self.coins:
-                if coin not in all_data:
-                    continue
+            # 최소 거래량 필터 (24시간 거래량이 100 이하면 제외)
+            with np.errstate(invalid='ignore'):
+                mask = snapshot.mask_in(self.coins) & (snapshot.volume >= 100)
 
-                coin_data = all_data[coin]
+            volume_change = self._surge_changes(snapshot, mask, window)
 
-                # 거래량 (24시간)
-                try:
-                    volume_24h = float(coin_data.get('units_traded_24H', 0))
-                    price = float(coin_data.get('closing_price', 0))
-                    price_change = float(coin_data.get('fluctate_rate_24H', 0))
+            with np.errstate(invalid='ignore'):
+                surge_mask = mask & (volume_change >= min_surge_rate)
+            k = top_n if top_n is not None else int(surge_mask.sum())
+            hits = TopKRanker.select(volume_change, surge_mask, k)
+            windows = self._window_fields(snapshot, hits)
 
-                    # 최소 거래량 필터 (너무 작은 코인 제외)
-                    if volume_24h < 100:  # 24시간 거래량이 100 이하면 제외
-                        continue
-
-                    # 거래량 변화율 계산
-                    volume_change = self.calculate_volume_change(coin, volume_24h)
-
-                    # 초기 실행 시에는 건너뛰기
-                    if volume_change is None:
-                        continue
-
-                    # 거래량이 급증한 경우
-                    if volume_change >= min_surge_rate:
-                        surge_coins.append({
-                            'coin': coin,
-                            'price': price,
-                            'volume_24h': volume_24h,
-                            'volume_change': volume_change,
-                            'price_change_24h': price_change
-                        })
-
-                except (ValueError, TypeError) as e:
-                    continue
-
-            # 거래량 증가율 순으로 정렬
-            surge_coins.sort(key=lambda x: x['volume_change'], reverse=True)
+            surge_coins = []
+            for k, i in enumerate(hits):
+                coin_info = snapshot.row(i)
+                coin_info['volume_change'] = float(volume_change[i])
+                del coin_info['trade_value_24h']
+                self._attach_windows(coin_info, windows, k)
+                surge_coins.append(coin_info)
 
-            return surge_coins
+            return self._attach_stream_fields(surge_coins)
 
         except Exception as e:
             print(f"거래량 스캔 오류: {str(e)}")
             return []
 
-    def get_top_momentum_coins(self, top_n: int = 5, altcoin_only: bool = False) -> List[Dict]:
+    def get_top_momentum_coins(self, top_n: int = 5, altcoin_only: bool = False,
+                               snapshot: Optional[TickerSnapshot] = None) -> List[Dict]:
         """
         모멘텀 상위 코인 조회
         거래량 증가 + 가격 상승을 종합 평가
@@ -198,64 +355,138 @@ class VolumeScanner:
         Args:
             top_n: 상위 N개 코인
             altcoin_only: True이면 잡알트만 (스테이블코인, 시총100위 제외)
+            snapshot: 이미 조회한 스냅샷 (기본: 새로 조회)
 
         Returns:
             상위 N개 코인 정보
         """
         try:
-            all_data = self.get_all_tickers()
-            if not all_data:
+            if snapshot is None:
+                snapshot = self.get_snapshot()
+            if snapshot is None:
                 return []
 
-            momentum_coins = []
-
-            # 스캔할 코인 리스트 결정
+            # 스캔할 코인 결정
             if altcoin_only or not self.coins:
-                # 전체 코인에서 제외 목록만 빼기
-                scan_coins = [coin for coin in all_data.keys() if coin not in self.excluded_coins and coin != 'date']
+                mask = self._altcoin_mask(snapshot)
             else:
-                scan_coins = self.coins
+                mask = snapshot.mask_in(self.coins)
 
-            for coin in scan_coins:
-                if coin not in all_data:
-                    continue
+            # 최소 거래대금 필터 (1억원 이상)
+            with np.errstate(invalid='ignore'):
+                mask &= (snapshot.value >= 100000000) & ~np.isnan(snapshot.price) & ~np.isnan(snapshot.change)
 
-                coin_data = all_data[coin]
+            # 모멘텀 스코어 계산
+            # 거래대금(가중치 0.4) + 가격변동률(가중치 0.6)
+            momentum_score = (snapshot.value / 1000000000) * 0.4 + snapshot.change * 0.6
 
-                try:
-                    volume_24h = float(coin_data.get('units_traded_24H', 0))
-                    price = float(coin_data.get('closing_price', 0))
-                    price_change = float(coin_data.get('fluctate_rate_24H', 0))
-                    acc_trade_value = float(coin_data.get('acc_trade_value_24H', 0))
+            # 상위 N개만 부분 선택 후 정렬
+            top = self.momentum_ranker.update(snapshot.coin_list, momentum_score, mask, k=top_n)
 
-                    # 최소 거래대금 필터 (1억원 이상)
-                    if acc_trade_value < 100000000:
-                        continue
+            momentum_coins = []
+            for i in top:
+                coin_info = snapshot.row(i)
+                coin_info['momentum_score'] = float(momentum_score[i])
+                momentum_coins.append(coin_info)
 
-                    # 모멘텀 스코어 계산
-                    # 거래대금(가중치 0.4) + 가격변동률(가중치 0.6)
-                    momentum_score = (acc_trade_value / 1000000000) * 0.4 + price_change * 0.6
+            return self._attach_stream_fields(momentum_coins)
 
-                    momentum_coins.append({
-                        'coin': coin,
-                        'price': price,
-                        'volume_24h': volume_24h,
-                        'price_change_24h': price_change,
-                        'trade_value_24h': acc_trade_value,
-                        'momentum_score': momentum_score
-                    })
+        except Exception as e:
+            print(f"모멘텀 조회 오류: {str(e)}")
+            return []
 
-                except (ValueError, TypeError):
-                    continue
+    def rank_events(self) -> List[Dict]:
+        """
+        마지막 스캔의 상위 5위 순위 변화
 
-            # 모멘텀 스코어 순으로 정렬
-            momentum_coins.sort(key=lambda x: x['momentum_score'], reverse=True)
+        Returns:
+            [{'ranking': 'surge'|'momentum', 'type': 'entered'|'exited'|'moved_up'|'moved_down',
+              'coin', 'rank', 'previous_rank'}, ...]
+        """
+        return self.surge_ranker.events + self.momentum_ranker.events
 
-            return momentum_coins[:top_n]
+    def clear_rank_events(self):
+        """순위 변화 비우기 (스캔 시작 시 - 이번 스캔에서 갱신하지 않은 순위의 지난 이벤트가 남지 않도록)"""
+        self.surge_ranker.events = []
+        self.momentum_ranker.events = []
 
-        except Exception as e:
-            print(f"모멘텀 조회 오류: {str(e)}")
-            return []
+    def filter_by_orderbook(self, candidates: List[Dict], max_spread_pct: float = 0.5,
+                            min_depth_krw: float = 3000000, depth: int = 5) -> List[Dict]:
+        """
+        전체 호가 스냅샷 1회 조회로 후보 코인의 스프레드/유동성 필터링
+
+        Args:
+            candidates: 스캔 결과 코인 리스트
+            max_spread_pct: 최대 매수/매도 호가 차이 (%)
+            min_depth_krw: depth단계 호가 잔량 최소 금액 (매수/매도 각각, 원)
+            depth: 합산할 호가 단계 수
+
+        Returns:
+            조건을 만족하는 후보 (spread_pct, bid_depth_krw, ask_depth_krw 필드 추가)
+            호가 조회에 실패하면 후보를 그대로 반환
+        """
+        if not candidates:
+            return candidates
+
+        data = self.api.get_all_orderbooks('KRW', count=depth)
+        if not data:
+            return candidates
+
+        snapshot = OrderbookSnapshot.from_payload(data, depth=depth)
+        mask = snapshot.liquidity_mask(max_spread_pct, min_depth_krw)
+
+        filtered = []
+        for coin_info in candidates:
+            i = snapshot.index.get(coin_info['coin'])
+            if i is None or not mask[i]:
+                continue
+
+            filtered.append(dict(coin_info, **snapshot.liquidity(coin_info['coin'])))
+
+        return filtered
+
+    def attach_candles(self, candidates: List[Dict], ingestor: CandleIngestor, n: int = 30,
+                       recent: int = 5) -> List[Dict]:
+        """
+        후보 코인 캔들 갱신 후 최근 봉 지표 추가
+
+        Args:
+            candidates: 스캔 결과 코인 리스트
+            ingestor: 캔들 적재기 (후보 코인만 새 봉을 받아옴)
+            n: 읽을 봉 수
+            recent: 거래량 배수 계산에 쓸 최근 봉 수
+
+        Returns:
+            candle_return_pct (n봉 수익률), candle_volume_ratio (최근 recent봉 평균 / 이전 평균 거래량),
+            candle_bars (실제 읽은 봉 수), candle_interval 필드가 추가된 후보
+        """
+        if not candidates:
+            return candidates
+
+        coins = [coin_info['coin'] for coin_info in candidates]
+        ingestor.sync_many(coins)
+        bars = ingestor.load_bars(coins, n=n)
+
+        close = bars['close']
+        volume = bars['volume']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first_close = close[np.arange(len(close)), np.argmax(~np.isnan(close), axis=1)]
+            returns = (close[:, -1] / first_close - 1) * 100
+            volume_ratio = np.nanmean(volume[:, -recent:], axis=1) / np.nanmean(volume[:, :-recent], axis=1)
+        counts = (~np.isnan(close)).sum(axis=1)
+
+        # load_bars는 중복 코인을 한 번만 돌려주므로 코인 이름으로 행을 찾음
+        rows = {coin: i for i, coin in enumerate(bars['coins'])}
+        enriched = []
+        for coin_info in candidates:
+            i = rows[coin_info['coin']]
+            coin_info = dict(coin_info, candle_bars=int(counts[i]), candle_interval=ingestor.interval)
+            if counts[i] > recent:
+                coin_info['candle_return_pct'] = float(returns[i])
+                coin_info['candle_volume_ratio'] = float(volume_ratio[i]) if np.isfinite(volume_ratio[i]) else None
+            enriched.append(coin_info)
+
+        return enriched
 
     def print_altcoin_surge_report(self, surge_coins: List[Dict]):
         """잡알트 거래량 급증 리포트 출력"""